@@ -0,0 +1,158 @@
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from . import corpus as corpus_module
+from .runner import asgi_client, http_client, run_level, service_info, wait_ready
+
+
+RESULTS_VERSION = 1
+
+
+def _levels(value: str) -> List[int]:
+  try:
+    levels = [int(part) for part in value.split(",") if part.strip()]
+  except ValueError as exc:
+    raise argparse.ArgumentTypeError("expected comma-separated integers, e.g. 1,8,32") from exc
+  if not levels or any(level < 1 for level in levels):
+    raise argparse.ArgumentTypeError("concurrency levels must be positive")
+  return levels
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+  corpus = (
+    corpus_module.load(args.corpus) if args.corpus else corpus_module.generate(args.size, args.seed)
+  )
+  if args.save_corpus:
+    corpus_module.save(corpus, args.save_corpus)
+
+  client_context = (
+    http_client(args.url, max(args.concurrency))
+    if args.url
+    else asgi_client(disable_cache=args.no_cache)
+  )
+  runs: List[Dict[str, Any]] = []
+  started_at = datetime.now(timezone.utc).isoformat()
+  async with client_context as client:
+    await wait_ready(client, args.ready_timeout)
+    service = await service_info(client)
+    offset = 0
+    for concurrency in args.concurrency:
+      if args.warmup:
+        await run_level(client, corpus, concurrency, args.warmup, args.batch_size, True, offset)
+        offset += args.warmup
+      result = await run_level(
+        client, corpus, concurrency, args.messages, args.batch_size, not args.repeat, offset
+      )
+      offset += args.messages
+      runs.append(result)
+      latency = result["latencyMs"] or {}
+      sys.stderr.write(
+        f"concurrency={concurrency:<4} {result['requestsPerSecond']:>9.1f} req/s "
+        f"p50={latency.get('p50Ms', 0):.2f}ms p95={latency.get('p95Ms', 0):.2f}ms "
+        f"p99={latency.get('p99Ms', 0):.2f}ms errors={sum(result['errors'].values())}\n"
+      )
+
+  return {
+    "version": RESULTS_VERSION,
+    "label": args.label or _label(service),
+    "startedAt": started_at,
+    "target": args.url or "asgi",
+    "endpoint": "batch" if args.batch_size > 1 else "intent",
+    "uniqueMessages": not args.repeat,
+    "service": service,
+    "corpus": corpus_module.summary(corpus, str(args.corpus) if args.corpus else None, args.seed),
+    "runs": runs,
+  }
+
+
+def _label(service: Dict[str, Any]) -> str:
+  return (
+    f"{service.get('model')}/{service.get('pipelineProfile')}/{service.get('scorer')}"
+    f"/w{service.get('serverWorkers')}x{service.get('executorWorkers')}"
+  )
+
+
+def _compare(paths: Sequence[Path]) -> str:
+  # One row per result file and concurrency level; deltas are against the
+  # first file at the same concurrency.
+  reports = [json.loads(path.read_text(encoding="utf-8")) for path in paths]
+  baseline = {run["concurrency"]: run for run in reports[0]["runs"]}
+  lines = [
+    f"{'label':<44} {'conc':>5} {'msg/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  vs first"
+  ]
+  for report in reports:
+    for run in report["runs"]:
+      latency = run["latencyMs"] or {}
+      line = (
+        f"{report['label'][:44]:<44} {run['concurrency']:>5} {run['messagesPerSecond']:>10.1f} "
+        f"{latency.get('p50Ms', 0):>9.2f} {latency.get('p95Ms', 0):>9.2f} "
+        f"{latency.get('p99Ms', 0):>9.2f}"
+      )
+      base = baseline.get(run["concurrency"])
+      if report is not reports[0] and base is not None and base["latencyMs"]:
+        line += (
+          f"  {_delta(run['messagesPerSecond'], base['messagesPerSecond'])} msg/s, "
+          f"{_delta(latency.get('p99Ms', 0), base['latencyMs']['p99Ms'])} p99"
+        )
+      lines.append(line)
+  return "\n".join(lines)
+
+
+def _delta(value: float, base: float) -> str:
+  if not base:
+    return "n/a"
+  return f"{(value - base) / base * 100:+.1f}%"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+  parser = argparse.ArgumentParser(
+    prog="python -m benchmarks", description="Latency and throughput benchmarks for nlp-service"
+  )
+  commands = parser.add_subparsers(dest="command", required=True)
+
+  run = commands.add_parser("run", help="replay a corpus and record latency and throughput")
+  run.add_argument(
+    "--url", help="running server to benchmark, e.g. http://localhost:3006 (default: in-process)"
+  )
+  run.add_argument("--concurrency", type=_levels, default=[1, 8, 32], help="e.g. 1,8,32")
+  run.add_argument("--messages", type=int, default=2000, help="messages per concurrency level")
+  run.add_argument("--warmup", type=int, default=200, help="unrecorded messages before each level")
+  run.add_argument("--batch-size", type=int, default=1, help="send /intent:batch requests of this size")
+  run.add_argument("--corpus", type=Path, help="JSONL corpus, one IntentRequest per line")
+  run.add_argument("--size", type=int, default=500, help="generated corpus size")
+  run.add_argument("--seed", type=int, default=7, help="generated corpus seed")
+  run.add_argument("--save-corpus", type=Path, help="write the corpus used to this JSONL file")
+  run.add_argument(
+    "--repeat",
+    action="store_true",
+    help="replay messages verbatim so repeats can hit the service's result cache",
+  )
+  run.add_argument(
+    "--no-cache", action="store_true", help="in-process only: disable the service's result cache"
+  )
+  run.add_argument("--ready-timeout", type=float, default=120.0)
+  run.add_argument("--label", help="name for this run in comparisons")
+  run.add_argument("--output", type=Path, help="write results JSON to this file")
+
+  compare = commands.add_parser("compare", help="tabulate result files against the first one")
+  compare.add_argument("results", type=Path, nargs="+")
+
+  args = parser.parse_args(argv)
+  if args.command == "compare":
+    sys.stdout.write(_compare(args.results) + "\n")
+    return
+
+  results = asyncio.run(_run(args))
+  rendered = json.dumps(results, indent=2)
+  if args.output:
+    args.output.write_text(rendered + "\n", encoding="utf-8")
+  sys.stdout.write(rendered + "\n")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,154 @@
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# Messages in the shape users actually send: short commands, commands with
+# sizes and durations (which take the spaCy path), typos, paraphrases with no
+# keyword at all, and small talk that should fall back to chat.
+MESSAGES: Dict[str, List[str]] = {
+  "graphics": [
+    "draw a logo for my bakery",
+    "design a poster with a blue color scheme",
+    "make the logo 512x512 and export as png",
+    "add a new layer with a circle shape",
+    "sketch an illustration of a fox on the canvas",
+    "change the background colour to teal",
+    "draw a logo 200 px wide",
+    "desgin a banner for the summer sale",
+  ],
+  "web_designer": [
+    "build a responsive landing page",
+    "add a navbar and a hero section to the website",
+    "create a portfolio site for a photographer",
+    "make the landing page hero 1200 px tall",
+    "set up a pricing section with three tiers",
+    "put a contact form on my homepage",
+    "make the websiet responsive on mobile",
+  ],
+  "ide": [
+    "fix the bug in my python script",
+    "write a function that parses csv files",
+    "compile and execute the code",
+    "why does this loop never terminate",
+    "refactor this class into smaller functions",
+    "add unit tests for the parser function",
+    "the script crashes after 30 seconds",
+  ],
+  "cad": [
+    "make a 3d model of a chair",
+    "extrude the mesh by 10 mm",
+    "render the model from the front",
+    "add a cylinder primitive to the scene",
+    "design a bracket for a 3d printer",
+    "increase the mesh resolution",
+  ],
+  "video": [
+    "cut the clip at the two minute mark",
+    "add a fade transition between the clips",
+    "export video in 1080p at 30 fps",
+    "trim the intro of my vlog",
+    "put background music on the timeline",
+    "render video with subtitles, 5 minutes long",
+  ],
+  "chat": [
+    "hello there",
+    "thanks, that looks great",
+    "what can you do?",
+    "can you help me with something",
+    "never mind",
+    "ok",
+  ],
+}
+
+TOOLS = ("graphics", "web_designer", "ide", "cad", "video")
+ARTIFACT_NAMES: Dict[str, List[str]] = {
+  "graphics": ["logo.svg", "poster.png", "banner.psd"],
+  "web_designer": ["landing-page", "portfolio", "pricing.html"],
+  "ide": ["parser.py", "main.ts", "utils.go"],
+  "cad": ["chair.stl", "bracket.step"],
+  "video": ["vlog.mp4", "intro.mov"],
+}
+
+
+def generate(count: int, seed: int = 7) -> List[Dict[str, Any]]:
+  # Deterministic for a given seed, so runs before and after a change replay
+  # the same traffic. Roughly half the requests carry history, a third an
+  # active tool and a quarter artifacts, similar to the gateway's traffic.
+  rng = random.Random(seed)
+  intents = list(MESSAGES)
+  weights = [3, 2, 2, 1, 1, 2]
+  corpus: List[Dict[str, Any]] = []
+  for index in range(count):
+    intent = rng.choices(intents, weights)[0]
+    request: Dict[str, Any] = {"id": str(index), "message": rng.choice(MESSAGES[intent])}
+
+    if rng.random() < 0.5:
+      topic = intent if intent != "chat" and rng.random() < 0.7 else rng.choice(TOOLS)
+      request["history"] = [
+        {"role": "user", "message": rng.choice(MESSAGES[topic]), "intent": topic}
+        for _ in range(rng.randint(1, 6))
+      ]
+    if rng.random() < 0.33:
+      request["activeTool"] = intent if intent in TOOLS else rng.choice(TOOLS)
+    if rng.random() < 0.25:
+      tool = rng.choice(TOOLS)
+      request["artifacts"] = [
+        {"id": f"artifact-{rng.randint(1, 9999)}", "tool": tool, "name": name}
+        for name in rng.sample(ARTIFACT_NAMES[tool], rng.randint(1, len(ARTIFACT_NAMES[tool])))
+      ]
+    corpus.append(request)
+  return corpus
+
+
+def load(path: Path) -> List[Dict[str, Any]]:
+  # Same format as `python -m src.bulk` input: one IntentRequest per line.
+  corpus: List[Dict[str, Any]] = []
+  with path.open(encoding="utf-8") as handle:
+    for line in handle:
+      if line.strip():
+        corpus.append(json.loads(line))
+  if not corpus:
+    raise SystemExit(f"corpus {path} is empty")
+  return corpus
+
+
+def save(corpus: Sequence[Dict[str, Any]], path: Path) -> None:
+  with path.open("w", encoding="utf-8") as handle:
+    for request in corpus:
+      handle.write(json.dumps(request, separators=(",", ":")) + "\n")
+
+
+def _tag(index: int) -> str:
+  # A word no keyword, lexicon term or typo correction can match: no digits
+  # (those force the spaCy path) and a first letter no vocabulary word uses.
+  letters = "q"
+  while True:
+    index, remainder = divmod(index, 26)
+    letters += chr(ord("a") + remainder)
+    if not index:
+      return letters
+
+
+def payloads(
+  corpus: Sequence[Dict[str, Any]], total: int, unique: bool, offset: int = 0
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+  # Cycles through the corpus. With unique set, a tag word is appended to each
+  # message so nlp-service's result cache cannot answer repeats.
+  for index in range(offset, offset + total):
+    request = {key: value for key, value in corpus[index % len(corpus)].items() if key != "id"}
+    if unique:
+      request["message"] = f"{request['message']} {_tag(index)}"
+    yield index, request
+
+
+def summary(corpus: Sequence[Dict[str, Any]], source: Optional[str], seed: int) -> Dict[str, Any]:
+  return {
+    "source": source or "generated",
+    "seed": None if source else seed,
+    "requests": len(corpus),
+    "withHistory": sum(1 for request in corpus if request.get("history")),
+    "withArtifacts": sum(1 for request in corpus if request.get("artifacts")),
+    "withActiveTool": sum(1 for request in corpus if request.get("activeTool")),
+  }
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+from . import corpus as corpus_module
+
+
+INTENT_PATH = "/api/v1/nlp/intent"
+BATCH_PATH = "/api/v1/nlp/intent:batch"
+STATS_PATH = "/api/v1/nlp/stats"
+READY_PATH = "/ready"
+
+
+def _percentile(ordered: List[float], quantile: float) -> float:
+  index = min(len(ordered) - 1, int(round(quantile * (len(ordered) - 1))))
+  return round(ordered[index], 3)
+
+
+def distribution(samples: Sequence[float]) -> Optional[Dict[str, float]]:
+  if not samples:
+    return None
+  ordered = sorted(samples)
+  return {
+    "count": len(ordered),
+    "meanMs": round(sum(ordered) / len(ordered), 3),
+    "p50Ms": _percentile(ordered, 0.50),
+    "p95Ms": _percentile(ordered, 0.95),
+    "p99Ms": _percentile(ordered, 0.99),
+    "maxMs": round(ordered[-1], 3),
+  }
+
+
+@asynccontextmanager
+async def asgi_client(disable_cache: bool) -> AsyncIterator[httpx.AsyncClient]:
+  # The app reads its settings at import, so NLP_* variables (model, profile,
+  # executor workers, ...) must be set before this runs. Startup and shutdown
+  # hooks run as they would under uvicorn, including warmup.
+  if disable_cache:
+    os.environ["NLP_CACHE_ENABLED"] = "false"
+  from src.main import app
+
+  async with app.router.lifespan_context(app):
+    transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+    async with httpx.AsyncClient(
+      transport=transport, base_url="http://nlp-service", timeout=60.0
+    ) as client:
+      yield client
+
+
+@asynccontextmanager
+async def http_client(url: str, connections: int) -> AsyncIterator[httpx.AsyncClient]:
+  limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+  async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60.0) as client:
+    yield client
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float) -> None:
+  deadline = time.monotonic() + timeout
+  while True:
+    try:
+      response = await client.get(READY_PATH)
+      if response.status_code == 200:
+        return
+    except httpx.TransportError:
+      pass
+    if time.monotonic() >= deadline:
+      raise SystemExit(f"nlp-service was not ready after {timeout:.0f}s")
+    await asyncio.sleep(0.25)
+
+
+async def service_info(client: httpx.AsyncClient) -> Dict[str, Any]:
+  # Under the prefork server this reaches one worker, which reports the
+  # settings shared by all of them.
+  response = await client.get(STATS_PATH)
+  response.raise_for_status()
+  stats = response.json()
+  executor = stats.get("executor") or {}
+  return {
+    "model": stats.get("model"),
+    "pipelineProfile": stats.get("pipelineProfile"),
+    "scorer": stats.get("scorer"),
+    "serverWorkers": stats.get("serverWorkers"),
+    "executor": executor.get("kind"),
+    "executorWorkers": executor.get("workers"),
+    "vocabularyVersion": (stats.get("vocabulary") or {}).get("version"),
+  }
+
+
+def _requests(
+  payloads: Iterator[Tuple[int, Dict[str, Any]]], batch_size: int
+) -> Iterator[Tuple[str, Dict[str, Any], int]]:
+  if batch_size <= 1:
+    for _, payload in payloads:
+      yield INTENT_PATH, payload, 1
+    return
+  batch: List[Dict[str, Any]] = []
+  for _, payload in payloads:
+    batch.append(payload)
+    if len(batch) >= batch_size:
+      yield BATCH_PATH, {"items": batch}, len(batch)
+      batch = []
+  if batch:
+    yield BATCH_PATH, {"items": batch}, len(batch)
+
+
+async def run_level(
+  client: httpx.AsyncClient,
+  corpus: Sequence[Dict[str, Any]],
+  concurrency: int,
+  messages: int,
+  batch_size: int = 1,
+  unique: bool = True,
+  offset: int = 0,
+) -> Dict[str, Any]:
+  # A closed loop: `concurrency` callers each send their next request as soon
+  # as the previous one returns, so throughput is what the service sustains at
+  # that many requests in flight.
+  requests = _requests(corpus_module.payloads(corpus, messages, unique, offset), batch_size)
+  latencies: List[float] = []
+  processing: List[float] = []
+  errors: Counter = Counter()
+  paths: Counter = Counter()
+  reused = 0
+  classified = 0
+
+  async def caller() -> None:
+    nonlocal reused, classified
+    for path, body, count in requests:
+      started = time.perf_counter()
+      try:
+        response = await client.post(path, json=body)
+      except httpx.HTTPError as exc:
+        errors[type(exc).__name__] += count
+        continue
+      elapsed_ms = (time.perf_counter() - started) * 1000
+      if response.status_code != 200:
+        errors[str(response.status_code)] += count
+        continue
+      latencies.append(elapsed_ms)
+      data = response.json()["data"]
+      for item in data if isinstance(data, list) else [data]:
+        metadata = item.get("metadata") or {}
+        processing.append(metadata.get("processingTimeMs", 0.0))
+        paths[metadata.get("path", "unknown")] += 1
+        if metadata.get("cacheHit") or metadata.get("sharedResult"):
+          reused += 1
+        classified += 1
+
+  started = time.perf_counter()
+  await asyncio.gather(*(caller() for _ in range(max(1, concurrency))))
+  elapsed = time.perf_counter() - started
+
+  return {
+    "concurrency": concurrency,
+    "batchSize": batch_size,
+    "requests": len(latencies),
+    "messages": classified,
+    "errors": dict(errors),
+    "elapsedSeconds": round(elapsed, 3),
+    "requestsPerSecond": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    "messagesPerSecond": round(classified / elapsed, 1) if elapsed else 0.0,
+    "latencyMs": distribution(latencies),
+    "serverProcessingMs": distribution(processing),
+    "paths": dict(paths.most_common()),
+    "reusedRatio": round(reused / classified, 4) if classified else 0.0,
+  }
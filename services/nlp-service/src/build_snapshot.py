@@ -0,0 +1,46 @@
+import argparse
+import logging
+import time
+from pathlib import Path
+
+from .config import settings
+from .services.intent_classifier import DEFAULT_VOCABULARY, IntentClassifier
+from .services.vocabulary import load_vocabulary
+
+
+logger = logging.getLogger("aio-nlp-service.snapshot")
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(
+    description="Write the configured pipeline and compiled matchers to a snapshot directory"
+  )
+  parser.add_argument("output", type=Path, help="directory to write (replaced if it exists)")
+  parser.add_argument(
+    "--vocabulary",
+    default=settings.vocabulary_path,
+    help="vocabulary file to compile in (defaults to NLP_VOCABULARY_PATH, else built-ins)",
+  )
+  args = parser.parse_args()
+
+  logging.basicConfig(level=logging.INFO)
+  started = time.perf_counter()
+  # A snapshot of the blank fallback pipeline would still be labelled with
+  # NLP_MODEL, so a model that is not installed fails the build instead.
+  classifier = IntentClassifier(strict=True)
+  if args.vocabulary:
+    classifier.use_vocabulary(load_vocabulary(args.vocabulary, DEFAULT_VOCABULARY))
+  manifest = classifier.save_snapshot(str(args.output))
+  logger.info(
+    "Wrote snapshot of %s (%s profile, pipeline %s, vocabulary %s) to %s in %.2fs",
+    manifest["model"],
+    manifest["pipelineProfile"],
+    manifest["pipeline"],
+    manifest["vocabularyVersion"],
+    args.output,
+    time.perf_counter() - started,
+  )
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,304 @@
+import argparse
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
+
+from .config import settings
+from .models import IntentRequest
+from .services.context_manager import ContextManager, ContextSnapshot
+from .services.intent_classifier import DEFAULT_VOCABULARY, IntentClassifier
+from .services.vocabulary import load_vocabulary
+
+
+logger = logging.getLogger("aio-nlp-service.bulk")
+
+Record = Tuple[int, Optional[str], IntentRequest]
+
+# Built once in the parent and inherited by forked workers copy-on-write.
+_classifier: Optional[IntentClassifier] = None
+
+
+def _classify_chunk(
+  messages: Sequence[str], contexts: Sequence[ContextSnapshot]
+) -> Tuple[List[Dict[str, Any]], float]:
+  if _classifier is None:
+    raise RuntimeError("bulk worker has no classifier")
+  started = time.perf_counter()
+  results = _classifier.classify_batch(messages, contexts)
+  return [result.dict(by_alias=True) for result in results], time.perf_counter() - started
+
+
+def read_records(path: Path, input_format: str) -> Iterator[Record]:
+  with path.open(encoding="utf-8", newline="") as handle:
+    if input_format == "csv":
+      for line_number, row in enumerate(csv.DictReader(handle), start=2):
+        yield from _parse_record(line_number, {key: value for key, value in row.items() if value})
+      return
+
+    for line_number, line in enumerate(handle, start=1):
+      if not line.strip():
+        continue
+      try:
+        raw = json.loads(line)
+      except ValueError as exc:
+        logger.warning("Skipping line %s: %s", line_number, exc)
+        continue
+      if not isinstance(raw, dict):
+        logger.warning("Skipping line %s: expected a JSON object", line_number)
+        continue
+      yield from _parse_record(line_number, raw)
+
+
+def _parse_record(line_number: int, raw: Dict[str, Any]) -> Iterator[Record]:
+  record_id = raw.pop("id", None)
+  try:
+    request = IntentRequest.parse_obj(raw)
+  except ValidationError as exc:
+    logger.warning("Skipping line %s: %s", line_number, exc)
+    return
+  if not request.message.strip():
+    logger.warning("Skipping line %s: message is required", line_number)
+    return
+  yield line_number, None if record_id is None else str(record_id), request
+
+
+class ResultWriter:
+  # Parquet output is written one row group per chunk, so memory is bounded by
+  # the chunk size rather than the size of the input.
+  def __init__(self, path: Path, output_format: str) -> None:
+    self.path = path
+    self.output_format = output_format
+    self._handle = path.open("w", encoding="utf-8") if output_format == "jsonl" else None
+    self._rows: List[Dict[str, Any]] = []
+    self._parquet: Any = None
+    if output_format == "parquet":
+      try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+      except ImportError as exc:
+        raise RuntimeError("writing Parquet output requires the 'pyarrow' package") from exc
+      schema = pa.schema(
+        [
+          ("line", pa.int64()),
+          ("id", pa.string()),
+          ("message", pa.string()),
+          ("intent", pa.string()),
+          ("confidence", pa.float64()),
+          ("fallback", pa.bool_()),
+          ("service", pa.string()),
+          ("endpoint", pa.string()),
+          ("keywords", pa.list_(pa.string())),
+          ("entities", pa.string()),
+          ("processingTimeMs", pa.float64()),
+        ]
+      )
+      self._to_table = partial(pa.Table.from_pylist, schema=schema)
+      self._parquet = pq.ParquetWriter(path, schema)
+
+  def write(self, line_number: int, record_id: Optional[str], message: str, data: Dict[str, Any]) -> None:
+    if self._handle is not None:
+      row = {"line": line_number, "id": record_id, "message": message, "data": data}
+      self._handle.write(json.dumps(row, separators=(",", ":")) + "\n")
+      return
+    self._rows.append(
+      {
+        "line": line_number,
+        "id": record_id,
+        "message": message,
+        "intent": data["intent"],
+        "confidence": data["confidence"],
+        "fallback": data["fallback"],
+        "service": data["route"]["service"],
+        "endpoint": data["route"]["endpoint"],
+        "keywords": data["keywords"],
+        "entities": json.dumps(data["entities"]),
+        "processingTimeMs": data["metadata"].get("processingTimeMs"),
+      }
+    )
+
+  def flush(self) -> None:
+    if self._parquet is not None and self._rows:
+      self._parquet.write_table(self._to_table(self._rows))
+      self._rows = []
+
+  def close(self) -> None:
+    if self._handle is not None:
+      self._handle.close()
+      return
+    self.flush()
+    self._parquet.close()
+
+
+def _chunks(records: Iterator[Record], size: int) -> Iterator[List[Record]]:
+  chunk: List[Record] = []
+  for record in records:
+    chunk.append(record)
+    if len(chunk) >= size:
+      yield chunk
+      chunk = []
+  if chunk:
+    yield chunk
+
+
+def run(
+  input_path: Path,
+  output_path: Path,
+  input_format: str,
+  output_format: str,
+  workers: int,
+  chunk_size: int,
+  threshold: Optional[float],
+  vocabulary_path: str = "",
+) -> Dict[str, Any]:
+  global _classifier
+
+  load_started = time.perf_counter()
+  _classifier = IntentClassifier()
+  if vocabulary_path:
+    _classifier.use_vocabulary(load_vocabulary(vocabulary_path, DEFAULT_VOCABULARY))
+  if threshold is not None:
+    _classifier.threshold = threshold
+  load_seconds = time.perf_counter() - load_started
+
+  context_manager = ContextManager(max_history=settings.max_history)
+  writer = ResultWriter(output_path, output_format)
+  stages = {"read": 0.0, "classify": 0.0, "workerClassify": 0.0, "write": 0.0}
+  intents: Counter = Counter()
+  fallbacks = 0
+  total = 0
+  started = time.perf_counter()
+
+  def prepared_chunks() -> Iterator[Tuple[List[Record], List[str], List[ContextSnapshot]]]:
+    chunks = _chunks(read_records(input_path, input_format), chunk_size)
+    while True:
+      read_started = time.perf_counter()
+      chunk = next(chunks, None)
+      if chunk is None:
+        stages["read"] += time.perf_counter() - read_started
+        return
+      messages = [request.message for _, _, request in chunk]
+      contexts = [context_manager.summarize(request) for _, _, request in chunk]
+      stages["read"] += time.perf_counter() - read_started
+      yield chunk, messages, contexts
+
+  def emit(chunk: List[Record], results: List[Dict[str, Any]], worker_seconds: float) -> None:
+    nonlocal fallbacks, total
+    stages["workerClassify"] += worker_seconds
+    write_started = time.perf_counter()
+    for (line_number, record_id, request), data in zip(chunk, results):
+      writer.write(line_number, record_id, request.message, data)
+      intents[data["intent"]] += 1
+      fallbacks += 1 if data["fallback"] else 0
+    writer.flush()
+    total += len(chunk)
+    stages["write"] += time.perf_counter() - write_started
+
+  try:
+    if workers <= 1:
+      for chunk, messages, contexts in prepared_chunks():
+        classify_started = time.perf_counter()
+        results, worker_seconds = _classify_chunk(messages, contexts)
+        stages["classify"] += time.perf_counter() - classify_started
+        emit(chunk, results, worker_seconds)
+    else:
+      context = multiprocessing.get_context("fork")
+      with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        # Keep a couple of chunks per worker queued so results are written in
+        # input order while memory stays bounded.
+        in_flight: Deque[Tuple[List[Record], "Future[Tuple[List[Dict[str, Any]], float]]"]] = deque()
+
+        def drain(limit: int) -> None:
+          while len(in_flight) > limit:
+            done_chunk, future = in_flight.popleft()
+            wait_started = time.perf_counter()
+            results, worker_seconds = future.result()
+            stages["classify"] += time.perf_counter() - wait_started
+            emit(done_chunk, results, worker_seconds)
+
+        for chunk, messages, contexts in prepared_chunks():
+          in_flight.append((chunk, pool.submit(_classify_chunk, messages, contexts)))
+          drain(workers * 2)
+        drain(0)
+  finally:
+    write_started = time.perf_counter()
+    writer.close()
+    stages["write"] += time.perf_counter() - write_started
+
+  elapsed = time.perf_counter() - started
+  return {
+    "input": str(input_path),
+    "output": str(output_path),
+    "messages": total,
+    "workers": workers,
+    "chunkSize": chunk_size,
+    "pipelineProfile": _classifier.pipeline_profile,
+    "scorer": _classifier.scorer_name,
+    "threshold": _classifier.threshold,
+    "vocabularyVersion": _classifier.vocabulary_version,
+    "modelLoadSeconds": round(load_seconds, 3),
+    "elapsedSeconds": round(elapsed, 3),
+    "messagesPerSecond": round(total / elapsed, 1) if elapsed else 0.0,
+    "stageSeconds": {stage: round(seconds, 3) for stage, seconds in stages.items()},
+    "fallbackRate": round(fallbacks / total, 4) if total else 0.0,
+    "intents": dict(intents.most_common()),
+  }
+
+
+def _detect_format(path: Path, explicit: Optional[str], choices: Sequence[str]) -> str:
+  if explicit:
+    return explicit
+  suffix = path.suffix.lower().lstrip(".")
+  if suffix == "ndjson":
+    suffix = "jsonl"
+  if suffix not in choices:
+    raise SystemExit(f"cannot infer format of {path}; pass one of {', '.join(choices)}")
+  return suffix
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+  parser = argparse.ArgumentParser(description="Classify chat logs offline with IntentClassifier")
+  parser.add_argument("input", type=Path, help="JSONL (IntentRequest per line) or CSV chat log")
+  parser.add_argument("output", type=Path, help="JSONL or Parquet file to write")
+  parser.add_argument("--input-format", choices=["jsonl", "csv"])
+  parser.add_argument("--output-format", choices=["jsonl", "parquet"])
+  parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+  parser.add_argument("--chunk-size", type=int, default=512, help="messages per nlp.pipe call")
+  parser.add_argument("--threshold", type=float, help="override NLP_CONFIDENCE_THRESHOLD")
+  parser.add_argument(
+    "--vocabulary",
+    default=settings.vocabulary_path,
+    help="vocabulary file to classify with (defaults to NLP_VOCABULARY_PATH, else built-ins)",
+  )
+  parser.add_argument("--report", type=Path, help="also write the throughput report to this file")
+  args = parser.parse_args(argv)
+
+  logging.basicConfig(level=logging.INFO)
+  report = run(
+    input_path=args.input,
+    output_path=args.output,
+    input_format=_detect_format(args.input, args.input_format, ["jsonl", "csv"]),
+    output_format=_detect_format(args.output, args.output_format, ["jsonl", "parquet"]),
+    workers=max(1, args.workers),
+    chunk_size=max(1, args.chunk_size),
+    threshold=args.threshold,
+    vocabulary_path=args.vocabulary,
+  )
+  rendered = json.dumps(report, indent=2)
+  if args.report:
+    args.report.write_text(rendered + "\n", encoding="utf-8")
+  sys.stdout.write(rendered + "\n")
+
+
+if __name__ == "__main__":
+  main()
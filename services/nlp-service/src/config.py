@@ -2,13 +2,69 @@ import os
 from dataclasses import dataclass
 
 
+def _flag(name: str, default: str) -> bool:
+  return os.getenv(name, default).strip().lower() in {"1", "true", "yes", "on"}
+
+
 @dataclass(frozen=True)
 class Settings:
   port: int = int(os.getenv("PORT", "3006"))
+  workers: int = int(os.getenv("NLP_WORKERS", "1"))
   confidence_threshold: float = float(os.getenv("NLP_CONFIDENCE_THRESHOLD", "0.7"))
   max_history: int = int(os.getenv("NLP_MAX_HISTORY", "10"))
+  # none, memory or redis. memory is per process, so NLP_WORKERS > 1 needs redis.
+  session_store: str = os.getenv("NLP_SESSION_STORE", "memory")
+  session_ttl_seconds: float = float(os.getenv("NLP_SESSION_TTL_SECONDS", "1800"))
+  session_max_entries: int = int(os.getenv("NLP_SESSION_MAX_ENTRIES", "10000"))
+  redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
   suggestion_limit: int = int(os.getenv("NLP_SUGGESTION_LIMIT", "3"))
   model_name: str = os.getenv("NLP_MODEL", "en_core_web_sm")
+  pipeline_profile: str = os.getenv("NLP_PIPELINE_PROFILE", "minimal")
+  snapshot_path: str = os.getenv("NLP_SNAPSHOT_PATH", "")
+  warmup_enabled: bool = _flag("NLP_WARMUP_ENABLED", "true")
+  intent_scorer: str = os.getenv("NLP_INTENT_SCORER", "keyword")
+  linear_model_path: str = os.getenv("NLP_LINEAR_MODEL_PATH", "models/intent_linear.npz")
+  semantic_examples_path: str = os.getenv("NLP_SEMANTIC_EXAMPLES_PATH", "")
+  semantic_similarity_floor: float = float(os.getenv("NLP_SEMANTIC_SIMILARITY_FLOOR", "0.35"))
+  vocabulary_path: str = os.getenv("NLP_VOCABULARY_PATH", "")
+  vocabulary_poll_seconds: float = float(os.getenv("NLP_VOCABULARY_POLL_SECONDS", "5"))
+  admin_token: str = os.getenv("NLP_ADMIN_TOKEN", "")
+  fast_response_enabled: bool = _flag("NLP_FAST_RESPONSE_ENABLED", "true")
+  typo_tolerance_enabled: bool = _flag("NLP_TYPO_TOLERANCE_ENABLED", "true")
+  typo_min_length: int = int(os.getenv("NLP_TYPO_MIN_LENGTH", "5"))
+  fast_path_enabled: bool = _flag("NLP_FAST_PATH_ENABLED", "true")
+  fast_path_margin: float = float(os.getenv("NLP_FAST_PATH_MARGIN", "0.1"))
+  deadline_reserve_ms: float = float(os.getenv("NLP_DEADLINE_RESERVE_MS", "1"))
+  batch_size: int = int(os.getenv("NLP_BATCH_SIZE", "64"))
+  batch_n_process: int = int(os.getenv("NLP_BATCH_N_PROCESS", "1"))
+  max_batch_items: int = int(os.getenv("NLP_MAX_BATCH_ITEMS", "256"))
+  stream_chunk_size: int = int(os.getenv("NLP_STREAM_CHUNK_SIZE", "128"))
+  stream_max_line_bytes: int = int(os.getenv("NLP_STREAM_MAX_LINE_BYTES", "65536"))
+  # Off by default: in-process benchmarks show no gain at concurrency 8-32.
+  # With the window at 0 a request is sent as soon as a worker is idle and only
+  # requests arriving while all workers are busy are batched together; a window
+  # above 0 holds each request up to that long for others to join it.
+  micro_batch_enabled: bool = _flag("NLP_MICRO_BATCH_ENABLED", "false")
+  micro_batch_max_size: int = int(os.getenv("NLP_MICRO_BATCH_MAX_SIZE", "32"))
+  micro_batch_window_ms: float = float(os.getenv("NLP_MICRO_BATCH_WINDOW_MS", "0"))
+  cache_enabled: bool = _flag("NLP_CACHE_ENABLED", "true")
+  cache_max_entries: int = int(os.getenv("NLP_CACHE_MAX_ENTRIES", "10000"))
+  cache_ttl_seconds: float = float(os.getenv("NLP_CACHE_TTL_SECONDS", "300"))
+  singleflight_enabled: bool = _flag("NLP_SINGLEFLIGHT_ENABLED", "true")
+  executor_kind: str = os.getenv("NLP_EXECUTOR", "thread")
+  executor_workers: int = int(os.getenv("NLP_EXECUTOR_WORKERS", "2"))
+  max_in_flight: int = int(os.getenv("NLP_MAX_IN_FLIGHT", "512"))
+  retry_after_seconds: int = int(os.getenv("NLP_RETRY_AFTER_SECONDS", "1"))
+
+  def __post_init__(self) -> None:
+    # A batch or stream chunk reserves an executor slot per item in one go;
+    # one larger than NLP_MAX_IN_FLIGHT could never be admitted.
+    for name, value in (
+      ("NLP_MAX_BATCH_ITEMS", self.max_batch_items),
+      ("NLP_STREAM_CHUNK_SIZE", self.stream_chunk_size),
+    ):
+      if value > self.max_in_flight:
+        raise ValueError(f"{name}={value} exceeds NLP_MAX_IN_FLIGHT={self.max_in_flight}")
 
 
 settings = Settings()
@@ -1,14 +1,41 @@
+import asyncio
+import hmac
 import logging
-from typing import Dict
+from typing import Any, Dict, Optional, Union
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 import uvicorn
 
 from .config import settings
-from .models import HealthResponse, IntentRequest, IntentResponse
+from .models import (
+  HealthResponse,
+  IntentBatchRequest,
+  IntentBatchResponse,
+  IntentRequest,
+  IntentResponse,
+  ModelSwapRequest,
+)
 from .services.context_manager import ContextManager
-from .services.intent_classifier import IntentClassifier
+from .services.fast_response import (
+  TimedORJSONResponse,
+  intent_batch_payload,
+  intent_response_payload,
+)
+from .services.inference_executor import InferenceExecutor, InferenceOverloadedError
+from .services.intent_cache import IntentCache
+from .services.intent_classifier import DEFAULT_VOCABULARY, WARMUP_MESSAGES, IntentClassifier
+from .services.intent_service import IntentService
+from .services.latency_budget import DEADLINE_HEADER, request_deadline
+from .services.micro_batcher import MicroBatcher
+from .services.model_swap import ModelSwapInProgressError, ModelSwapper
+from .services.msgpack_wire import MsgpackResponse, MsgpackRoute, wants_msgpack
+from .services.ndjson_stream import NdjsonClassifier, NdjsonStreamingResponse
+from .services.session_store import create_session_store
+from .services.singleflight import SingleFlight
+from .services import stage_metrics
+from .services.vocabulary import VocabularyReloader
 
 
 logging.basicConfig(level=logging.INFO)
@@ -19,6 +46,8 @@ app = FastAPI(
   version="1.0.0",
   description="Intent classification and routing service for AIO tools",
 )
+# Lets any JSON body endpoint also accept Content-Type: application/msgpack.
+app.router.route_class = MsgpackRoute
 
 app.add_middleware(
   CORSMiddleware,
@@ -27,9 +56,126 @@ app.add_middleware(
   allow_methods=["*"],
   allow_headers=["*"],
 )
+app.add_middleware(
+  stage_metrics.RequestTimer,
+  paths=("/api/v1/nlp/intent", "/api/v1/nlp/intent:batch"),
+)
 
 classifier = IntentClassifier()
-context_manager = ContextManager(max_history=settings.max_history)
+context_manager = ContextManager(
+  max_history=settings.max_history,
+  store=create_session_store(
+    settings.session_store,
+    redis_url=settings.redis_url,
+    max_sessions=settings.session_max_entries,
+    ttl_seconds=settings.session_ttl_seconds,
+    workers=settings.workers,
+  ),
+)
+inference_executor = InferenceExecutor(
+  classifier,
+  kind=settings.executor_kind,
+  workers=settings.executor_workers,
+  max_in_flight=settings.max_in_flight,
+  retry_after_seconds=settings.retry_after_seconds,
+)
+intent_service = IntentService(
+  inference_executor,
+  micro_batcher=MicroBatcher(
+    inference_executor,
+    max_size=settings.micro_batch_max_size,
+    window_ms=settings.micro_batch_window_ms,
+  )
+  if settings.micro_batch_enabled
+  else None,
+  cache=IntentCache(
+    max_entries=settings.cache_max_entries,
+    ttl_seconds=settings.cache_ttl_seconds,
+  )
+  if settings.cache_enabled
+  else None,
+  singleflight=SingleFlight() if settings.singleflight_enabled else None,
+)
+ndjson_classifier = NdjsonClassifier(
+  context_manager,
+  intent_service,
+  chunk_size=settings.stream_chunk_size,
+  max_line_bytes=settings.stream_max_line_bytes,
+)
+
+
+def _classifier_changed(_: Any) -> None:
+  intent_service.invalidate()
+  inference_executor.recycle()
+
+
+vocabulary_reloader = (
+  VocabularyReloader(
+    settings.vocabulary_path,
+    defaults=DEFAULT_VOCABULARY,
+    apply=classifier.use_vocabulary,
+    on_applied=_classifier_changed,
+    poll_seconds=settings.vocabulary_poll_seconds,
+  )
+  if settings.vocabulary_path
+  else None
+)
+if vocabulary_reloader is not None:
+  # Loaded before serving (and before the prefork server forks) so every
+  # worker starts on the configured vocabulary; later edits are polled.
+  vocabulary_reloader.load()
+model_swapper = ModelSwapper(classifier, on_swapped=_classifier_changed)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+  if not settings.admin_token:
+    raise HTTPException(status_code=403, detail="admin operations are disabled")
+  # Compared as bytes: compare_digest rejects str with non-ASCII characters.
+  if x_admin_token is None or not hmac.compare_digest(
+    x_admin_token.encode(), settings.admin_token.encode()
+  ):
+    raise HTTPException(status_code=401, detail="invalid admin token")
+
+
+async def _warm_up() -> None:
+  try:
+    await inference_executor.warm_up(WARMUP_MESSAGES)
+  except Exception:
+    logger.exception("Warmup failed, not reporting ready")
+    return
+  logger.info("Warmed up in %sms, ready for traffic", inference_executor.warmup_ms)
+
+
+@app.on_event("startup")
+async def startup() -> None:
+  if vocabulary_reloader is not None:
+    vocabulary_reloader.start()
+  # Runs in the background so /health answers while the pipeline warms;
+  # /ready only reports ready once it has finished.
+  if settings.warmup_enabled:
+    app.state.warmup = asyncio.get_running_loop().create_task(_warm_up())
+  else:
+    inference_executor.ready = True
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+  await model_swapper.stop()
+  if vocabulary_reloader is not None:
+    await vocabulary_reloader.stop()
+  inference_executor.shutdown()
+  if context_manager.store is not None:
+    await context_manager.store.close()
+
+
+@app.exception_handler(InferenceOverloadedError)
+async def overloaded_handler(request: Request, exc: InferenceOverloadedError) -> JSONResponse:
+  logger.debug("Shedding %s %s: inference queue is full", request.method, request.url.path)
+  return JSONResponse(
+    status_code=503,
+    content={"detail": str(exc)},
+    headers={"Retry-After": str(exc.retry_after_seconds)},
+  )
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -40,26 +186,135 @@ async def health() -> HealthResponse:
     version=app.version or "1.0.0",
     confidence_threshold=settings.confidence_threshold,
     suggestion_limit=settings.suggestion_limit,
+    vocabulary_version=classifier.vocabulary_version,
+  )
+
+
+@app.get("/ready")
+async def ready() -> JSONResponse:
+  return JSONResponse(
+    status_code=200 if inference_executor.ready else 503,
+    content={
+      "status": "ready" if inference_executor.ready else "warming",
+      "model": classifier.model_name,
+      "vocabularyVersion": classifier.vocabulary_version,
+      "warmupMs": inference_executor.warmup_ms,
+    },
   )
 
 
+@app.get("/api/v1/nlp/stats")
+async def stats() -> Dict[str, Any]:
+  return {
+    "model": classifier.model_name,
+    "pipelineProfile": classifier.pipeline_profile,
+    "scorer": classifier.scorer_name,
+    "serverWorkers": settings.workers,
+    "pipeline": classifier.nlp.pipe_names,
+    "snapshot": classifier.snapshot_manifest,
+    "latencyMs": inference_executor.latency.summary(),
+    "vocabulary": vocabulary_reloader.stats()
+    if vocabulary_reloader is not None
+    else {"version": classifier.vocabulary_version},
+    **intent_service.stats(),
+    "sessions": context_manager.store.stats() if context_manager.store is not None else None,
+  }
+
+
+@app.get("/metrics")
+async def metrics() -> Response:
+  content, media_type = stage_metrics.render()
+  return Response(content=content, media_type=media_type)
+
+
+@app.get("/api/v1/nlp/admin/model", dependencies=[Depends(require_admin)])
+async def model_swap_status() -> Dict[str, Any]:
+  return model_swapper.stats()
+
+
+@app.post("/api/v1/nlp/admin/model", status_code=202, dependencies=[Depends(require_admin)])
+async def swap_model(payload: ModelSwapRequest) -> Dict[str, Any]:
+  if not payload.model.strip():
+    raise HTTPException(status_code=400, detail="model is required")
+  try:
+    model_swapper.start(payload.model.strip())
+  except ModelSwapInProgressError as exc:
+    raise HTTPException(status_code=409, detail=str(exc)) from exc
+  return model_swapper.stats()
+
+
+def _request_deadline(request: Request, payload: IntentRequest) -> Optional[float]:
+  try:
+    return request_deadline(
+      request.headers.get(DEADLINE_HEADER), payload.metadata, settings.deadline_reserve_ms
+    )
+  except ValueError as exc:
+    raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
 @app.post("/api/v1/nlp/intent", response_model=IntentResponse)
-async def classify_intent(payload: IntentRequest) -> IntentResponse:
+async def classify_intent(
+  payload: IntentRequest, request: Request
+) -> Union[IntentResponse, Response]:
   if not payload.message.strip():
     raise HTTPException(status_code=400, detail="message is required")
 
-  context_snapshot = context_manager.summarize(payload)
-  result = classifier.classify(payload.message, context_snapshot)
+  deadline = _request_deadline(request, payload)
+  context_snapshot, session_state = await context_manager.resolve(payload)
+  context_snapshot.deadline = deadline
+  result = await intent_service.classify(payload.message, context_snapshot)
+  await context_manager.record(payload, session_state, result.intent)
+  if wants_msgpack(request):
+    return MsgpackResponse(intent_response_payload(result))
+  if settings.fast_response_enabled:
+    return TimedORJSONResponse(intent_response_payload(result))
   return IntentResponse(success=True, data=result)
 
 
+@app.post("/api/v1/nlp/intent:batch", response_model=IntentBatchResponse)
+async def classify_intent_batch(
+  payload: IntentBatchRequest, request: Request
+) -> Union[IntentBatchResponse, Response]:
+  if not payload.items:
+    raise HTTPException(status_code=400, detail="items is required")
+  if len(payload.items) > settings.max_batch_items:
+    raise HTTPException(
+      status_code=413,
+      detail=f"batch exceeds {settings.max_batch_items} items",
+    )
+  for index, item in enumerate(payload.items):
+    if not item.message.strip():
+      raise HTTPException(status_code=400, detail=f"items[{index}].message is required")
+
+  deadlines = [_request_deadline(request, item) for item in payload.items]
+  messages = [item.message for item in payload.items]
+  snapshots = [context_manager.summarize(item) for item in payload.items]
+  for snapshot, deadline in zip(snapshots, deadlines):
+    snapshot.deadline = deadline
+  results = await intent_service.classify_many(messages, snapshots)
+  if wants_msgpack(request):
+    return MsgpackResponse(intent_batch_payload(results))
+  if settings.fast_response_enabled:
+    return TimedORJSONResponse(intent_batch_payload(results))
+  return IntentBatchResponse(success=True, data=results)
+
+
+@app.post("/api/v1/nlp/intent:stream")
+async def classify_intent_stream(request: Request) -> NdjsonStreamingResponse:
+  return NdjsonStreamingResponse(ndjson_classifier.stream(request.stream()))
+
+
 def main() -> None:
-  uvicorn.run(
-    "src.main:app",
-    host="0.0.0.0",
-    port=settings.port,
-    reload=False,
-  )
+  if settings.workers > 1:
+    from .server import serve
+
+    serve(app, host="0.0.0.0", port=settings.port, workers=settings.workers)
+    return
+
+  # The app object rather than "src.main:app": under `python -m src.main` this
+  # module is __main__, and an import string would load it a second time and
+  # build a second classifier.
+  uvicorn.run(app, host="0.0.0.0", port=settings.port)
 
 
 if __name__ == "__main__":
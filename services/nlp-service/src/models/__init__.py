@@ -33,6 +33,9 @@ class RouteInfo(BaseModel):
   service: str
   endpoint: str
 
+  class Config:
+    frozen = True
+
 
 class FallbackInfo(BaseModel):
   active: bool = False
@@ -60,9 +63,23 @@ class IntentResponse(BaseModel):
   data: IntentData
 
 
+class IntentBatchRequest(BaseModel):
+  items: List[IntentRequest]
+
+
+class IntentBatchResponse(BaseModel):
+  success: bool = True
+  data: List[IntentData]
+
+
+class ModelSwapRequest(BaseModel):
+  model: str
+
+
 class HealthResponse(BaseModel):
   status: str
   service: str
   version: str
   confidence_threshold: float
   suggestion_limit: int
+  vocabulary_version: Optional[str] = None
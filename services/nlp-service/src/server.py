@@ -0,0 +1,86 @@
+import gc
+import logging
+import os
+import signal
+import socket
+from typing import Dict
+
+import uvicorn
+from fastapi import FastAPI
+from prometheus_client import multiprocess
+
+
+logger = logging.getLogger("aio-nlp-service.server")
+
+
+def _bind(host: str, port: int) -> socket.socket:
+  sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+  sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+  sock.bind((host, port))
+  sock.listen(2048)
+  sock.set_inheritable(True)
+  return sock
+
+
+def _run_worker(app: FastAPI, sock: socket.socket) -> None:
+  signal.signal(signal.SIGTERM, signal.SIG_DFL)
+  signal.signal(signal.SIGINT, signal.SIG_DFL)
+  gc.enable()
+  config = uvicorn.Config(app, log_level="info")
+  uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(app: FastAPI, host: str, port: int, workers: int) -> None:
+  # The app (and its spaCy pipeline) is already loaded. Freezing moves it out
+  # of the collector's reach so forked workers never write to - and copy - it.
+  gc.collect()
+  gc.freeze()
+
+  sock = _bind(host, port)
+  children: Dict[int, int] = {}
+  stopping = False
+
+  def spawn(slot: int) -> None:
+    pid = os.fork()
+    if pid == 0:
+      exit_code = 0
+      try:
+        _run_worker(app, sock)
+      except BaseException:
+        logger.exception("NLP worker %s crashed", slot)
+        exit_code = 1
+      finally:
+        os._exit(exit_code)
+    children[pid] = slot
+    logger.info("Started NLP worker %s (pid %s)", slot, pid)
+
+  def stop(signum: int, _frame: object) -> None:
+    nonlocal stopping
+    stopping = True
+    for pid in list(children):
+      try:
+        os.kill(pid, signal.SIGTERM)
+      except ProcessLookupError:
+        pass
+
+  signal.signal(signal.SIGTERM, stop)
+  signal.signal(signal.SIGINT, stop)
+
+  logger.info("Serving on %s:%s with %s forked workers", host, port, workers)
+  for slot in range(workers):
+    spawn(slot)
+
+  while children:
+    try:
+      pid, status = os.wait()
+    except ChildProcessError:
+      break
+    slot = children.pop(pid, None)
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+      multiprocess.mark_process_dead(pid)
+    if slot is None or stopping:
+      continue
+    logger.warning("NLP worker %s (pid %s) exited with status %s, respawning", slot, pid, status)
+    spawn(slot)
+
+  sock.close()
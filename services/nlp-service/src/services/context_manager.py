@@ -1,8 +1,12 @@
 from collections import Counter, deque
 from dataclasses import dataclass, field
-from typing import Deque, Dict, List, Optional
+from typing import Deque, Dict, List, Optional, Tuple
 
-from ..models import IntentRequest
+from ..models import ArtifactReference, IntentRequest
+from .session_store import SessionState, SessionStore, merge_artifacts
+
+
+ARTIFACT_LIMIT = 5
 
 
 @dataclass
@@ -11,11 +15,14 @@ class ContextSnapshot:
   intent_counts: Dict[str, int] = field(default_factory=dict)
   active_tool: Optional[str] = None
   artifacts: List[Dict[str, str]] = field(default_factory=list)
+  # time.monotonic() by which the caller needs an answer; see latency_budget.
+  deadline: Optional[float] = None
 
 
 class ContextManager:
-  def __init__(self, max_history: int) -> None:
+  def __init__(self, max_history: int, store: Optional[SessionStore] = None) -> None:
     self.max_history = max_history
+    self.store = store
 
   def summarize(self, payload: IntentRequest) -> ContextSnapshot:
     snapshot = ContextSnapshot()
@@ -29,12 +36,58 @@ class ContextManager:
     if payload.active_tool:
       snapshot.active_tool = payload.active_tool
     if payload.artifacts:
-      snapshot.artifacts = [
-        {
-          "id": artifact.id,
-          "tool": artifact.tool or "unknown",
-          "name": artifact.name or "",
-        }
-        for artifact in payload.artifacts[-5:]
-      ]
+      snapshot.artifacts = self._artifact_summaries(payload.artifacts)
     return snapshot
+
+  async def resolve(self, payload: IntentRequest) -> Tuple[ContextSnapshot, Optional[SessionState]]:
+    # Clients that still send their history get the stateless behaviour and
+    # reset the stored session; everyone else only sends the new message.
+    if self.store is None or not payload.session_id or payload.history is not None:
+      return self.summarize(payload), None
+
+    state = await self.store.get(payload.session_id)
+    if state is None:
+      return self.summarize(payload), None
+
+    artifacts = list(state.artifacts)
+    if payload.artifacts:
+      artifacts = merge_artifacts(
+        artifacts, self._artifact_summaries(payload.artifacts), ARTIFACT_LIMIT
+      )
+    snapshot = ContextSnapshot(
+      recent_messages=deque(message for message, _ in state.turns),
+      intent_counts=dict(state.intent_counts),
+      active_tool=payload.active_tool or state.active_tool,
+      artifacts=artifacts,
+    )
+    return snapshot, state
+
+  async def record(
+    self, payload: IntentRequest, state: Optional[SessionState], intent: str
+  ) -> None:
+    if self.store is None or not payload.session_id:
+      return
+
+    if state is None:
+      state = SessionState()
+      for turn in (payload.history or [])[-self.max_history :]:
+        state.append_turn(turn.message, turn.intent, self.max_history)
+
+    state.append_turn(payload.message, intent, self.max_history)
+    if payload.active_tool:
+      state.active_tool = payload.active_tool
+    if payload.artifacts:
+      state.artifacts = merge_artifacts(
+        state.artifacts, self._artifact_summaries(payload.artifacts), ARTIFACT_LIMIT
+      )
+    await self.store.put(payload.session_id, state)
+
+  def _artifact_summaries(self, artifacts: List[ArtifactReference]) -> List[Dict[str, str]]:
+    return [
+      {
+        "id": artifact.id,
+        "tool": artifact.tool or "unknown",
+        "name": artifact.name or "",
+      }
+      for artifact in artifacts[-ARTIFACT_LIMIT:]
+    ]
@@ -1,10 +1,14 @@
 import re
-from typing import Dict, List
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Tuple
 
-from spacy.matcher import Matcher
+from spacy.matcher import Matcher, PhraseMatcher
 from spacy.language import Language
 from spacy.tokens import Doc
 
+from .typo_index import TypoIndex
+from .vocabulary import keyword_forms
+
 
 COLOR_TERMS = [
   "red",
@@ -22,45 +26,114 @@ COLOR_TERMS = [
 
 FORMAT_TERMS = ["png", "jpg", "jpeg", "svg", "webp", "mp4", "mov", "avi", "webm"]
 TOOL_TERMS = ["graphics", "canvas", "logo", "website", "code", "model", "video", "timeline"]
+SIZE_UNITS = ["px", "pixels"]
+TIME_UNITS = ["minutes", "seconds", "fps"]
 DIMENSION_PATTERN = re.compile(r"(\d{2,5})\s*[x×]\s*(\d{2,5})")
 
+ENTITY_LEXICONS: Dict[str, List[str]] = {
+  "color": COLOR_TERMS,
+  "format": FORMAT_TERMS,
+  "toolHint": TOOL_TERMS,
+}
+
+
+@dataclass
+class TermMatches:
+  intent_hits: Dict[str, List[str]] = field(default_factory=dict)
+  entities: Dict[str, str] = field(default_factory=dict)
+  corrections: Dict[str, str] = field(default_factory=dict)
+
 
 class EntityExtractor:
-  def __init__(self, nlp: Language) -> None:
+  def __init__(
+    self,
+    nlp: Language,
+    intent_keywords: Mapping[str, List[str]],
+    entity_lexicons: Mapping[str, List[str]] = ENTITY_LEXICONS,
+    typo_index: Optional[TypoIndex] = None,
+  ) -> None:
     self.nlp = nlp
-    self.matcher = Matcher(self.nlp.vocab)
-    color_patterns = [[{"LOWER": term}] for term in COLOR_TERMS]
-    format_patterns = [[{"LOWER": term}] for term in FORMAT_TERMS]
-    tool_patterns = [[{"LOWER": term}] for term in TOOL_TERMS]
-    self.matcher.add("COLOR", color_patterns)
-    self.matcher.add("FORMAT", format_patterns)
-    self.matcher.add("TOOL", tool_patterns)
+    self.typo_index = typo_index
+    strings = self.nlp.vocab.strings
+
+    # Every intent keyword and entity term lives in one PhraseMatcher, so a
+    # single trie walk over the Doc finds all of them regardless of how many
+    # terms are registered. Inflected keyword forms share their keyword's label.
+    self.phrase_matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+    self._intent_terms: Dict[int, Tuple[str, str]] = {}
+    for intent, keywords in intent_keywords.items():
+      for keyword in keywords:
+        label = f"INTENT|{intent}|{keyword}"
+        self._intent_terms[strings.add(label)] = (intent, keyword)
+        self.phrase_matcher.add(
+          label, [self.nlp.make_doc(form) for form in keyword_forms(keyword)]
+        )
+
+    self._entity_labels: Dict[int, str] = {}
+    for entity, terms in entity_lexicons.items():
+      if not terms:
+        continue
+      label = f"ENTITY|{entity}"
+      self._entity_labels[strings.add(label)] = entity
+      self.phrase_matcher.add(label, [self.nlp.make_doc(term) for term in terms])
+
+    self.unit_matcher = Matcher(self.nlp.vocab)
+    self._size_label = strings.add("SIZE")
+    self.unit_matcher.add("SIZE", [[{"LIKE_NUM": True}, {"LOWER": {"IN": SIZE_UNITS}}]])
+    self.unit_matcher.add("TIME", [[{"IS_DIGIT": True}, {"LOWER": {"IN": TIME_UNITS}}]])
 
   def extract(self, doc: Doc) -> Dict[str, str]:
-    entities: Dict[str, str] = {}
-    matches = self.matcher(doc)
-
-    for match_id, start, end in matches:
-      label = self.nlp.vocab.strings[match_id]
-      token_text = doc[start:end].text.lower()
-      if label == "COLOR":
-        entities.setdefault("color", token_text)
-      elif label == "FORMAT":
-        entities.setdefault("format", token_text)
-      elif label == "TOOL":
-        entities.setdefault("toolHint", token_text)
-
-    text = doc.text.lower()
-    dimension_match = DIMENSION_PATTERN.search(text)
+    return self.analyze(doc).entities
+
+  def analyze(self, doc: Doc) -> TermMatches:
+    result = TermMatches()
+    entities = result.entities
+    intent_hits = result.intent_hits
+
+    match_doc = self._corrected_doc(doc, result.corrections)
+    for match_id, start, end in sorted(
+      self.phrase_matcher(match_doc), key=lambda m: (m[1], m[2])
+    ):
+      intent_term = self._intent_terms.get(match_id)
+      if intent_term is not None:
+        intent, keyword = intent_term
+        hits = intent_hits.setdefault(intent, [])
+        if keyword not in hits:
+          hits.append(keyword)
+        continue
+      entity = self._entity_labels.get(match_id)
+      if entity is not None:
+        # The value is what the user wrote; a corrected term only decides
+        # which entity the span is.
+        entities.setdefault(entity, doc[start:end].text.lower())
+
+    dimension_match = DIMENSION_PATTERN.search(doc.text.lower())
     if dimension_match:
       width, height = dimension_match.groups()
       entities["dimensions"] = f"{width}x{height}"
 
-    for token in doc:
-      next_token = doc[token.i + 1] if token.i + 1 < len(doc) else None
-      if token.like_num and next_token and next_token.lower_ in {"px", "pixels"}:
-        entities["sizePx"] = f"{token.text}{next_token.text}"
-      if token.text.isdigit() and next_token and next_token.lower_ in {"minutes", "seconds", "fps"}:
-        entities["timeHint"] = f"{token.text} {next_token.text}"
+    for match_id, start, end in self.unit_matcher(doc):
+      value, unit = doc[start], doc[end - 1]
+      if match_id == self._size_label:
+        entities["sizePx"] = f"{value.text}{unit.text}"
+      else:
+        entities["timeHint"] = f"{value.text} {unit.text}"
+
+    return result
 
-    return entities
+  def _corrected_doc(self, doc: Doc, corrections: Dict[str, str]) -> Doc:
+    # Typos are replaced token for token in a lexical-only copy of the Doc, so
+    # phrase matches line up with the original token offsets.
+    if self.typo_index is None:
+      return doc
+    lowered = [token.lower_ for token in doc]
+    fixes = self.typo_index.correct_words(lowered)
+    if not fixes:
+      return doc
+    for position, corrected in fixes.items():
+      corrections[lowered[position]] = corrected
+    return Doc(
+      doc.vocab,
+      words=[fixes.get(position, token.text) for position, token in enumerate(doc)],
+      spaces=[bool(token.whitespace_) for token in doc],
+    )
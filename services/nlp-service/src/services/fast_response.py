@@ -0,0 +1,42 @@
+import time
+from typing import Any, Dict, Sequence
+
+from fastapi.responses import ORJSONResponse
+
+from ..models import IntentData
+from . import stage_metrics
+
+
+def intent_payload(result: IntentData) -> Dict[str, Any]:
+  # The wire shape of IntentData.dict(by_alias=True), assembled directly from
+  # the field values. Route and fallback models are flat, so their __dict__ is
+  # already the JSON object and nothing is walked or copied recursively.
+  fallback_info = result.fallback_info
+  return {
+    "intent": result.intent,
+    "confidence": result.confidence,
+    "keywords": result.keywords,
+    "entities": result.entities,
+    "fallback": result.fallback,
+    "fallbackInfo": fallback_info.__dict__ if fallback_info is not None else None,
+    "route": result.route.__dict__,
+    "metadata": result.metadata,
+  }
+
+
+def intent_response_payload(result: IntentData) -> Dict[str, Any]:
+  return {"success": True, "data": intent_payload(result)}
+
+
+def intent_batch_payload(results: Sequence[IntentData]) -> Dict[str, Any]:
+  return {"success": True, "data": [intent_payload(result) for result in results]}
+
+
+class TimedORJSONResponse(ORJSONResponse):
+  # Returned from handlers as a Response, so FastAPI neither re-validates the
+  # content against response_model nor runs jsonable_encoder over it.
+  def render(self, content: Any) -> bytes:
+    started = time.perf_counter()
+    body = super().render(content)
+    stage_metrics.observe_stage("serialize", time.perf_counter() - started)
+    return body
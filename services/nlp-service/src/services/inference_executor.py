@@ -0,0 +1,183 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from ..models import IntentData
+from .context_manager import ContextSnapshot
+from .intent_classifier import IntentClassifier
+from .latency_tracker import LatencyTracker
+from . import stage_metrics
+
+
+EXECUTOR_KINDS = ("thread", "process")
+
+# Process workers are forked after the parent has built its classifier, so they
+# reuse the already-loaded model through this reference instead of reloading it.
+_shared_classifier: Optional[IntentClassifier] = None
+
+
+def _classify_batch_in_worker(
+  messages: Sequence[str], contexts: Sequence[ContextSnapshot], try_fast_path: bool
+) -> List[IntentData]:
+  if _shared_classifier is None:
+    raise RuntimeError("inference worker has no classifier")
+  return _shared_classifier.classify_batch(messages, contexts, try_fast_path)
+
+
+def _warm_up_in_worker(messages: Sequence[str]) -> None:
+  if _shared_classifier is None:
+    raise RuntimeError("inference worker has no classifier")
+  _shared_classifier.warm_up(_shared_classifier.state, messages)
+
+
+class InferenceOverloadedError(Exception):
+  def __init__(self, retry_after_seconds: int) -> None:
+    super().__init__("inference queue is full")
+    self.retry_after_seconds = retry_after_seconds
+
+
+class InferenceExecutor:
+  def __init__(
+    self,
+    classifier: IntentClassifier,
+    kind: str = "thread",
+    workers: int = 2,
+    max_in_flight: int = 512,
+    retry_after_seconds: int = 1,
+  ) -> None:
+    if kind not in EXECUTOR_KINDS:
+      raise ValueError(f"unknown executor kind '{kind}', expected one of {EXECUTOR_KINDS}")
+
+    global _shared_classifier
+    _shared_classifier = classifier
+
+    self.classifier = classifier
+    self.kind = kind
+    self.workers = max(1, workers)
+    self.max_in_flight = max(1, max_in_flight)
+    self.retry_after_seconds = retry_after_seconds
+    self.in_flight = 0
+    self.rejected = 0
+    self.latency = LatencyTracker()
+    self.ready = False
+    self.warmup_ms: Optional[float] = None
+    self._executor: Optional[Executor] = None
+
+  def _get_executor(self) -> Executor:
+    # Created lazily so no pool exists yet when src/server.py forks workers.
+    if self._executor is None:
+      if self.kind == "process":
+        self._executor = ProcessPoolExecutor(
+          max_workers=self.workers,
+          mp_context=multiprocessing.get_context("fork"),
+        )
+      else:
+        self._executor = ThreadPoolExecutor(
+          max_workers=self.workers, thread_name_prefix="nlp-inference"
+        )
+    return self._executor
+
+  @asynccontextmanager
+  async def slot(self, count: int = 1) -> AsyncIterator[None]:
+    if self.in_flight + count > self.max_in_flight:
+      self.rejected += count
+      raise InferenceOverloadedError(self.retry_after_seconds)
+    self.in_flight += count
+    try:
+      yield
+    finally:
+      self.in_flight -= count
+
+  def fast_path(self, message: str, context: ContextSnapshot) -> Optional[IntentData]:
+    # Runs in the calling thread. The parent's classifier is the current one
+    # even for process workers, which only hold a copy.
+    result = self.classifier.fast_path(message, context)
+    if result is not None:
+      self._record([result])
+    return result
+
+  async def classify(
+    self, message: str, context: ContextSnapshot, try_fast_path: bool = True
+  ) -> IntentData:
+    results = await self.classify_batch([message], [context], try_fast_path)
+    return results[0]
+
+  async def classify_batch(
+    self,
+    messages: Sequence[str],
+    contexts: Sequence[ContextSnapshot],
+    try_fast_path: bool = True,
+  ) -> List[IntentData]:
+    loop = asyncio.get_running_loop()
+    if self.kind == "process":
+      results = await loop.run_in_executor(
+        self._get_executor(),
+        _classify_batch_in_worker,
+        list(messages),
+        list(contexts),
+        try_fast_path,
+      )
+    else:
+      results = await loop.run_in_executor(
+        self._get_executor(), self.classifier.classify_batch, messages, contexts, try_fast_path
+      )
+    self._record(results)
+    return results
+
+  def _record(self, results: Sequence[IntentData]) -> None:
+    self.latency.record_many(
+      self.classifier.pipeline_profile,
+      (result.metadata.get("processingTimeMs", 0.0) for result in results),
+    )
+    # Observed here rather than in the classifier so process workers, which
+    # have no way to report into this process's registry, are counted too.
+    stage_metrics.observe(results)
+
+  async def warm_up(self, messages: Sequence[str]) -> None:
+    # One warmup per worker, submitted together so every pool thread or
+    # process is started and has run the pipeline before traffic arrives.
+    # Not recorded in latency stats or metrics.
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    executor = self._get_executor()
+    if self.kind == "process":
+      calls = [
+        loop.run_in_executor(executor, _warm_up_in_worker, list(messages))
+        for _ in range(self.workers)
+      ]
+    else:
+      state = self.classifier.state
+      calls = [
+        loop.run_in_executor(executor, self.classifier.warm_up, state, messages)
+        for _ in range(self.workers)
+      ]
+    await asyncio.gather(*calls)
+    self.warmup_ms = round((time.perf_counter() - started) * 1000, 3)
+    self.ready = True
+
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "kind": self.kind,
+      "ready": self.ready,
+      "warmupMs": self.warmup_ms,
+      "workers": self.workers,
+      "inFlight": self.in_flight,
+      "maxInFlight": self.max_in_flight,
+      "rejected": self.rejected,
+    }
+
+  def recycle(self) -> None:
+    # Forked workers hold a copy of the classifier from when they were started.
+    # Dropping the pool lets queued work finish there while the next call forks
+    # fresh workers that see the parent's current state.
+    if self.kind == "process" and self._executor is not None:
+      self._executor.shutdown(wait=False)
+      self._executor = None
+
+  def shutdown(self) -> None:
+    if self._executor is not None:
+      self._executor.shutdown(wait=False, cancel_futures=True)
+      self._executor = None
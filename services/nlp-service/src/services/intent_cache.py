@@ -0,0 +1,86 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from ..models import IntentData
+from .context_manager import ContextSnapshot
+
+
+CacheKey = Tuple[str, Hashable]
+
+
+def reuse_result(result: IntentData, context: ContextSnapshot, started: float, marker: str) -> IntentData:
+  # Only metadata differs between reuses; the rest of the result is never
+  # mutated after classification, so a shallow copy can share it.
+  metadata = {
+    key: value
+    for key, value in result.metadata.items()
+    if key not in ("stagesMs", "skippedStages")
+  }
+  metadata["processingTimeMs"] = round((time.perf_counter() - started) * 1000, 3)
+  metadata["appliedArtifacts"] = len(context.artifacts)
+  if context.deadline is not None:
+    metadata["skippedStages"] = list(result.metadata.get("skippedStages", ()))
+  metadata[marker] = True
+  return result.copy(update={"metadata": metadata})
+
+
+class IntentCache:
+  def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+    self.max_entries = max(1, max_entries)
+    self.ttl_seconds = ttl_seconds
+    self._entries: "OrderedDict[CacheKey, Tuple[float, IntentData]]" = OrderedDict()
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self.expirations = 0
+
+  @staticmethod
+  def key(message: str, context: ContextSnapshot) -> CacheKey:
+    # Only the context features read by _context_bonus take part in the key.
+    fingerprint = (
+      tuple(sorted(context.intent_counts.items())),
+      context.active_tool,
+      tuple(sorted({item.get("tool") or "" for item in context.artifacts})),
+    )
+    return " ".join(message.lower().split()), fingerprint
+
+  def get(self, key: CacheKey, context: ContextSnapshot, started: float) -> Optional[IntentData]:
+    entry = self._entries.get(key)
+    if entry is None:
+      self.misses += 1
+      return None
+
+    expires_at, cached = entry
+    if expires_at <= time.monotonic():
+      del self._entries[key]
+      self.expirations += 1
+      self.misses += 1
+      return None
+
+    self._entries.move_to_end(key)
+    self.hits += 1
+    return reuse_result(cached, context, started, "cacheHit")
+
+  def put(self, key: CacheKey, value: IntentData) -> None:
+    self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+    self._entries.move_to_end(key)
+    while len(self._entries) > self.max_entries:
+      self._entries.popitem(last=False)
+      self.evictions += 1
+
+  def clear(self) -> None:
+    self._entries.clear()
+
+  def stats(self) -> Dict[str, Any]:
+    lookups = self.hits + self.misses
+    return {
+      "size": len(self._entries),
+      "maxEntries": self.max_entries,
+      "ttlSeconds": self.ttl_seconds,
+      "hits": self.hits,
+      "misses": self.misses,
+      "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+      "evictions": self.evictions,
+      "expirations": self.expirations,
+    }
@@ -1,13 +1,24 @@
+import threading
 import time
-from typing import Any, Dict, List, Tuple
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import spacy
 from spacy.language import Language
+from spacy.tokens import Doc
 
 from ..config import settings
 from ..models import FallbackInfo, IntentData, RouteInfo
 from .context_manager import ContextSnapshot
-from .entity_extractor import EntityExtractor
+from .entity_extractor import ENTITY_LEXICONS, SIZE_UNITS, TIME_UNITS, EntityExtractor
+from .keyword_automaton import KeywordAutomaton, has_joined_words, split_words
+from .latency_budget import StageCosts
+from .linear_scorer import LinearIntentScorer
+from .pipeline_snapshot import read_snapshot, write_snapshot
+from .semantic_router import INTENT_EXAMPLES, SemanticRouter, load_examples
+from .typo_index import TypoIndex
+from .vocabulary import Vocabulary, keyword_forms
 
 
 SERVICE_ROUTES: Dict[str, RouteInfo] = {
@@ -29,57 +40,530 @@ INTENT_KEYWORDS: Dict[str, List[str]] = {
 }
 
 
+# Components each profile leaves out of the loaded pipeline. Intent ranking and
+# entity extraction only rely on the tokenizer and lexical attributes (LOWER,
+# like_num), so the minimal profile skips tagging, parsing and NER entirely.
+PIPELINE_PROFILES: Dict[str, List[str]] = {
+  "full": [],
+  "minimal": [
+    "tok2vec",
+    "tagger",
+    "morphologizer",
+    "parser",
+    "senter",
+    "attribute_ruler",
+    "lemmatizer",
+    "ner",
+  ],
+}
+
+
+# Automaton labels for lexicon entities and for unit words that need the
+# spaCy unit matcher (e.g. "ten pixels").
+ENTITY_LABEL_PREFIX = "entity:"
+UNIT_LABEL = "unit"
+
+Ranking = List[Tuple[str, float, List[str]]]
+
+INTENT_SCORERS = ("keyword", "linear", "semantic")
+
+DEFAULT_VOCABULARY = Vocabulary(
+  version="builtin",
+  intent_keywords=INTENT_KEYWORDS,
+  service_routes=SERVICE_ROUTES,
+  entity_lexicons=ENTITY_LEXICONS,
+)
+
+
+# Run through a freshly loaded pipeline before it takes traffic, so first
+# requests do not pay for lazy allocations and cold caches.
+WARMUP_MESSAGES: List[str] = [
+  example for examples in INTENT_EXAMPLES.values() for example in examples
+]
+
+Scorer = Union[LinearIntentScorer, SemanticRouter]
+
+
+# Everything a request needs from the model and vocabulary. Requests read the
+# classifier's state once and use it throughout, so vocabulary reloads and model
+# swaps only build a new state and assign it while in-flight work finishes on
+# the old one.
+@dataclass(frozen=True)
+class ClassifierState:
+  model_name: str
+  nlp: Language
+  scorer: Optional[Scorer]
+  vocabulary: Vocabulary
+  entity_extractor: EntityExtractor
+  keyword_automaton: KeywordAutomaton
+  keyword_order: Dict[str, Dict[str, int]]
+  typo_index: Optional[TypoIndex]
+
+
 class IntentClassifier:
-  def __init__(self) -> None:
-    self.nlp: Language = self._load_model(settings.model_name)
-    self.entity_extractor = EntityExtractor(self.nlp)
+  # With strict set, a model that fails to load is an error instead of a
+  # fallback to a blank pipeline.
+  def __init__(self, strict: bool = False) -> None:
+    if settings.pipeline_profile not in PIPELINE_PROFILES:
+      raise ValueError(
+        f"unknown pipeline profile '{settings.pipeline_profile}', "
+        f"expected one of {sorted(PIPELINE_PROFILES)}"
+      )
+    if settings.intent_scorer not in INTENT_SCORERS:
+      raise ValueError(
+        f"unknown intent scorer '{settings.intent_scorer}', expected one of {INTENT_SCORERS}"
+      )
+    self.pipeline_profile = settings.pipeline_profile
+    self.scorer_name = settings.intent_scorer
     self.threshold = settings.confidence_threshold
     self.suggestion_limit = settings.suggestion_limit
+    self.fast_path_enabled = settings.fast_path_enabled
+    self.fast_path_margin = settings.fast_path_margin
+    self.typo_tolerance_enabled = settings.typo_tolerance_enabled
+    self.typo_min_length = settings.typo_min_length
+    self.stage_costs = StageCosts()
+    self._swap_lock = threading.Lock()
+    self.snapshot_manifest: Optional[Dict[str, Any]] = None
+    if settings.snapshot_path:
+      self.state = self._load_snapshot(settings.snapshot_path)
+    else:
+      nlp = self._load_model(settings.model_name, self.pipeline_profile, strict=strict)
+      self.state = self._compile(
+        settings.model_name, nlp, self._load_scorer(self.scorer_name, nlp), DEFAULT_VOCABULARY
+      )
+
+  def _load_snapshot(self, path: str) -> ClassifierState:
+    snapshot = read_snapshot(path, DEFAULT_VOCABULARY)
+    profile = snapshot.manifest.get("pipelineProfile")
+    if profile != self.pipeline_profile:
+      raise ValueError(
+        f"snapshot {path} was built for pipeline profile '{profile}', "
+        f"not '{self.pipeline_profile}'"
+      )
+    self.snapshot_manifest = snapshot.manifest
+    return self._compile(
+      snapshot.manifest.get("model", settings.model_name),
+      snapshot.nlp,
+      self._load_scorer(self.scorer_name, snapshot.nlp),
+      snapshot.vocabulary,
+      automaton=snapshot.automaton,
+    )
+
+  def save_snapshot(self, path: str) -> Dict[str, Any]:
+    state = self.state
+    return write_snapshot(
+      path,
+      model_name=state.model_name,
+      pipeline_profile=self.pipeline_profile,
+      nlp=state.nlp,
+      vocabulary=state.vocabulary,
+      automaton=state.keyword_automaton,
+    )
+
+  def _load_scorer(self, name: str, nlp: Language) -> Optional[Scorer]:
+    if name == "linear":
+      return LinearIntentScorer.load(settings.linear_model_path)
+    if name == "semantic":
+      examples = (
+        load_examples(settings.semantic_examples_path)
+        if settings.semantic_examples_path
+        else INTENT_EXAMPLES
+      )
+      return SemanticRouter(nlp, examples, similarity_floor=settings.semantic_similarity_floor)
+    return None
+
+  @property
+  def nlp(self) -> Language:
+    return self.state.nlp
+
+  @property
+  def model_name(self) -> str:
+    return self.state.model_name
+
+  @property
+  def vocabulary_version(self) -> str:
+    return self.state.vocabulary.version
+
+  def _compile(
+    self,
+    model_name: str,
+    nlp: Language,
+    scorer: Optional[Scorer],
+    vocabulary: Vocabulary,
+    automaton: Optional[KeywordAutomaton] = None,
+  ) -> ClassifierState:
+    typo_index = self._build_typo_index(vocabulary) if self.typo_tolerance_enabled else None
+    return ClassifierState(
+      model_name=model_name,
+      nlp=nlp,
+      scorer=scorer,
+      vocabulary=vocabulary,
+      entity_extractor=EntityExtractor(
+        nlp, vocabulary.intent_keywords, vocabulary.entity_lexicons, typo_index
+      ),
+      keyword_automaton=automaton or self._build_automaton(vocabulary),
+      keyword_order={
+        intent: {keyword: index for index, keyword in enumerate(keywords)}
+        for intent, keywords in vocabulary.intent_keywords.items()
+      },
+      typo_index=typo_index,
+    )
+
+  def _build_typo_index(self, vocabulary: Vocabulary) -> TypoIndex:
+    terms = [
+      *(keyword for keywords in vocabulary.intent_keywords.values() for keyword in keywords),
+      *(term for terms in vocabulary.entity_lexicons.values() for term in terms),
+    ]
+    return TypoIndex(
+      (word for term in terms for word in split_words(term)), min_length=self.typo_min_length
+    )
+
+  def use_vocabulary(self, vocabulary: Vocabulary) -> bool:
+    state = self.state
+    if vocabulary == state.vocabulary:
+      return False
+    compiled = self._compile(state.model_name, state.nlp, state.scorer, vocabulary)
+    with self._swap_lock:
+      current = self.state
+      if current.nlp is not state.nlp:
+        # A model swap landed while compiling; rebuild against the new model.
+        compiled = self._compile(current.model_name, current.nlp, current.scorer, vocabulary)
+      self.state = compiled
+    return True
+
+  def prepare_model(self, model_name: str) -> ClassifierState:
+    # Loads a model next to the active one without publishing it. Unlike
+    # startup, a model that fails to load is an error rather than a blank
+    # pipeline.
+    nlp = self._load_model(model_name, self.pipeline_profile, strict=True)
+    state = self.state
+    scorer = (
+      self._load_scorer(self.scorer_name, nlp) if self.scorer_name == "semantic" else state.scorer
+    )
+    return self._compile(model_name, nlp, scorer, state.vocabulary)
+
+  def warm_up(
+    self, state: ClassifierState, messages: Sequence[str] = WARMUP_MESSAGES
+  ) -> None:
+    # Also seeds the stage cost estimates deadlines are checked against.
+    if not messages:
+      return
+    started = time.perf_counter()
+    docs = list(state.nlp.pipe(messages, batch_size=settings.batch_size))
+    pipeline_seconds = time.perf_counter() - started
+    for doc in docs:
+      state.entity_extractor.analyze(doc)
+    entities_seconds = time.perf_counter() - started - pipeline_seconds
+    costs = {"pipeline": pipeline_seconds, "entities": entities_seconds}
+    if self._score_docs(state, docs) is not None:
+      costs["score"] = time.perf_counter() - started - pipeline_seconds - entities_seconds
+    self.stage_costs.observe({stage: seconds / len(docs) for stage, seconds in costs.items()})
 
-  def _load_model(self, model_name: str) -> Language:
+  def use_state(self, state: ClassifierState) -> ClassifierState:
+    with self._swap_lock:
+      previous = self.state
+      if previous.vocabulary is not state.vocabulary:
+        state = self._compile(state.model_name, state.nlp, state.scorer, previous.vocabulary)
+      self.state = state
+    return previous
+
+  def _build_automaton(self, vocabulary: Vocabulary) -> KeywordAutomaton:
+    automaton = KeywordAutomaton()
+    for intent, keywords in vocabulary.intent_keywords.items():
+      for keyword in keywords:
+        for form in keyword_forms(keyword):
+          automaton.add(form, intent, keyword)
+    for entity, terms in vocabulary.entity_lexicons.items():
+      for term in terms:
+        automaton.add(term, f"{ENTITY_LABEL_PREFIX}{entity}")
+    for term in [*SIZE_UNITS, *TIME_UNITS]:
+      automaton.add(term, UNIT_LABEL)
+    return automaton.build()
+
+  def _load_model(self, model_name: str, profile: str, strict: bool = False) -> Language:
     try:
-      return spacy.load(model_name)  # type: ignore[arg-type]
+      return spacy.load(model_name, exclude=PIPELINE_PROFILES[profile])  # type: ignore[arg-type]
     except Exception:
+      if strict:
+        raise
       return spacy.blank("en")
 
   def classify(self, message: str, context: ContextSnapshot) -> IntentData:
     started = time.perf_counter()
-    doc = self.nlp(message)
-    lowered = doc.text.lower()
-    ranking = self._rank_intents(lowered)
-    best_intent, score, keywords = ranking[0] if ranking else ("chat", 0.0, [])
+    state = self.state
+    stages: Dict[str, float] = {}
+    fast_result = self._fast_path(state, message, context, started, stages)
+    if fast_result is not None:
+      return fast_result
+
+    stage_started = time.perf_counter()
+    doc = state.nlp(message)
+    stages["pipeline"] = time.perf_counter() - stage_started
+    skipped: List[str] = []
+    row = None
+    if state.scorer is not None:
+      if self.stage_costs.fits("score", context.deadline):
+        stage_started = time.perf_counter()
+        row = state.scorer.score_docs([doc])[0]
+        stages["score"] = time.perf_counter() - stage_started
+      else:
+        skipped.append("score")
+    return self._classify_doc(state, doc, context, started, stages, row, skipped)
+
+  def fast_path(self, message: str, context: ContextSnapshot) -> Optional[IntentData]:
+    # Cheap enough to run on the event loop, so the service can answer these
+    # without a trip through the executor.
+    return self._fast_path(self.state, message, context, time.perf_counter(), {})
+
+  def classify_batch(
+    self,
+    messages: Sequence[str],
+    contexts: Sequence[ContextSnapshot],
+    try_fast_path: bool = True,
+  ) -> List[IntentData]:
+    if len(messages) != len(contexts):
+      raise ValueError("messages and contexts must have the same length")
+
+    state = self.state
+    results: List[Optional[IntentData]] = []
+    pending: List[int] = []
+    fast_path_stages: Dict[int, Dict[str, float]] = {}
+    for index, (message, context) in enumerate(zip(messages, contexts)):
+      stages: Dict[str, float] = {}
+      result = (
+        self._fast_path(state, message, context, time.perf_counter(), stages)
+        if try_fast_path
+        else None
+      )
+      results.append(result)
+      if result is None:
+        pending.append(index)
+        fast_path_stages[index] = stages
+
+    if pending:
+      batch_started = time.perf_counter()
+      docs = list(
+        state.nlp.pipe(
+          [messages[index] for index in pending],
+          batch_size=settings.batch_size,
+          n_process=settings.batch_n_process,
+        )
+      )
+      pipeline_seconds = time.perf_counter() - batch_started
+      # Items whose deadline no longer leaves room for the scorer are left out
+      # of the scoring call and ranked on keyword hits.
+      scored = (
+        [
+          position
+          for position, index in enumerate(pending)
+          if self.stage_costs.fits("score", contexts[index].deadline)
+        ]
+        if state.scorer is not None
+        else []
+      )
+      rows: Dict[int, np.ndarray] = {}
+      score_seconds = 0.0
+      if scored:
+        stage_started = time.perf_counter()
+        scores = self._score_docs(state, [docs[position] for position in scored])
+        score_seconds = (time.perf_counter() - stage_started) / len(scored)
+        if scores is not None:
+          rows = dict(zip(scored, scores))
+      # Pipeline and scoring run once for the whole batch; each result is
+      # charged an equal share of that time plus its own post-processing.
+      for position, (index, doc) in enumerate(zip(pending, docs)):
+        stages = fast_path_stages[index]
+        stages["pipeline"] = pipeline_seconds / len(docs)
+        skipped: List[str] = []
+        row = rows.get(position)
+        if row is not None:
+          stages["score"] = score_seconds
+        elif state.scorer is not None:
+          skipped.append("score")
+        started = time.perf_counter() - sum(stages.values())
+        results[index] = self._classify_doc(
+          state, doc, contexts[index], started, stages, row, skipped
+        )
+
+    return [result for result in results if result is not None]
+
+  def _score_docs(self, state: ClassifierState, docs: Sequence[Doc]) -> Optional[np.ndarray]:
+    if state.scorer is not None:
+      return state.scorer.score_docs(docs)
+    return None
+
+  def _fast_path(
+    self,
+    state: ClassifierState,
+    message: str,
+    context: ContextSnapshot,
+    started: float,
+    stages: Dict[str, float],
+  ) -> Optional[IntentData]:
+    # Dimensions, sizes and time hints need digits or unit words and go through
+    # the spaCy path; lexicon entities are exact terms the automaton already
+    # finds, so everything else can be answered without building a Doc.
+    # Messages whose words spaCy would tokenize differently go there too.
+    if (
+      not self.fast_path_enabled
+      or self.scorer_name != "keyword"
+      or any(char.isdigit() for char in message)
+      or has_joined_words(message)
+    ):
+      return None
+
+    stage_started = time.perf_counter()
+    words = split_words(message)
+    corrections: Dict[str, str] = {}
+    if state.typo_index is not None:
+      fixes = state.typo_index.correct_words(words)
+      for position, corrected in fixes.items():
+        corrections[words[position]] = corrected
+        words[position] = corrected
+
+    intent_hits: Dict[str, List[str]] = {}
+    entities: Dict[str, str] = {}
+    for label, term in state.keyword_automaton.search_words(words):
+      if label == UNIT_LABEL:
+        stages["fast_path"] = time.perf_counter() - stage_started
+        return None
+      if label.startswith(ENTITY_LABEL_PREFIX):
+        # Entities report the words the user typed, not their corrections.
+        if corrections:
+          originals = {corrected: original for original, corrected in corrections.items()}
+          term = " ".join(originals.get(word, word) for word in split_words(term))
+        entities.setdefault(label[len(ENTITY_LABEL_PREFIX) :], term)
+        continue
+      hits = intent_hits.setdefault(label, [])
+      if term not in hits:
+        hits.append(term)
+
+    ranking = self._rank_intents(state, intent_hits)
+    stages["fast_path"] = time.perf_counter() - stage_started
+    top_score = ranking[0][1]
+    runner_up = ranking[1][1] if len(ranking) > 1 else 0.0
+    if top_score <= 0 or top_score - runner_up < self.fast_path_margin:
+      return None
+    return self._build_result(
+      state, ranking, entities, context, started, stages, path="fast", corrections=corrections
+    )
 
-    entities = self.entity_extractor.extract(doc)
+  def _classify_doc(
+    self,
+    state: ClassifierState,
+    doc: Doc,
+    context: ContextSnapshot,
+    started: float,
+    stages: Dict[str, float],
+    scores: Optional[np.ndarray] = None,
+    skipped: Optional[List[str]] = None,
+  ) -> IntentData:
+    skipped = [] if skipped is None else skipped
+    if self.stage_costs.fits("entities", context.deadline):
+      stage_started = time.perf_counter()
+      matches = state.entity_extractor.analyze(doc)
+      stages["entities"] = time.perf_counter() - stage_started
+      intent_hits, entities, corrections = (
+        matches.intent_hits,
+        matches.entities,
+        matches.corrections,
+      )
+    else:
+      skipped.append("entities")
+      intent_hits, entities, corrections = {}, {}, {}
+
+    stage_started = time.perf_counter()
+    if "entities" in skipped:
+      # Exact keyword hits from the automaton cost a fraction of the spaCy
+      # matchers, so even a degraded answer is still ranked on keywords.
+      for label, term in state.keyword_automaton.search_words(split_words(doc.text)):
+        if label == UNIT_LABEL or label.startswith(ENTITY_LABEL_PREFIX):
+          continue
+        hits = intent_hits.setdefault(label, [])
+        if term not in hits:
+          hits.append(term)
+    if scores is not None and state.scorer is not None:
+      if self.scorer_name == "semantic":
+        # Paraphrases lift an intent through similarity; explicit keyword
+        # hits keep at least the score they would have had on their own.
+        keyword_scores = self._keyword_scores(state, state.scorer.intents, intent_hits)
+        scores = np.maximum(scores, keyword_scores)
+      ranking = self._rank_scores(state, state.scorer.intents, scores, intent_hits)
+    else:
+      ranking = self._rank_intents(state, intent_hits)
+    stages["rank"] = time.perf_counter() - stage_started
+    return self._build_result(
+      state,
+      ranking,
+      entities,
+      context,
+      started,
+      stages,
+      path="full",
+      corrections=corrections,
+      skipped=skipped,
+    )
+
+  def _build_result(
+    self,
+    state: ClassifierState,
+    ranking: Ranking,
+    entities: Dict[str, str],
+    context: ContextSnapshot,
+    started: float,
+    stages: Dict[str, float],
+    path: str,
+    corrections: Optional[Dict[str, str]] = None,
+    skipped: Optional[List[str]] = None,
+  ) -> IntentData:
+    best_intent, score, keywords = ranking[0] if ranking else ("chat", 0.0, [])
     entity_bonus = min(0.25, 0.05 * len(entities))
-    context_bonus = self._context_bonus(best_intent, context)
+    skipped = [] if skipped is None else skipped
+    if self.stage_costs.fits("context", context.deadline):
+      stage_started = time.perf_counter()
+      context_bonus = self._context_bonus(best_intent, context)
+      stages["context"] = time.perf_counter() - stage_started
+    else:
+      skipped.append("context")
+      context_bonus = 0.0
+
+    stage_started = time.perf_counter()
     initial = 0.25 + (score * 0.6)
     confidence = float(min(1.0, initial + entity_bonus + context_bonus))
     fallback = confidence < self.threshold
 
     if fallback:
-      fallback_info = FallbackInfo(
+      fallback_info = FallbackInfo.construct(
         active=True,
         reason="LOW_CONFIDENCE",
         threshold=self.threshold,
         suggestions=[intent for intent, _, _ in ranking[: self.suggestion_limit]],
       )
-      route = self._route_for_intent("chat")
+      route = self._route_for_intent(state, "chat")
       intent = "chat"
     else:
       fallback_info = None
-      route = self._route_for_intent(best_intent)
+      route = self._route_for_intent(state, best_intent)
       intent = best_intent
 
-    duration_ms = round((time.perf_counter() - started) * 1000, 3)
-
     metadata: Dict[str, Any] = {
-      "processingTimeMs": duration_ms,
+      "processingTimeMs": 0.0,
       "entityBonus": round(entity_bonus, 3),
       "contextBonus": round(context_bonus, 3),
       "appliedArtifacts": len(context.artifacts),
+      "pipelineProfile": self.pipeline_profile,
+      "path": path,
+      "scorer": self.scorer_name,
+      "vocabularyVersion": state.vocabulary.version,
     }
+    if corrections:
+      metadata["corrections"] = corrections
+    if context.deadline is not None:
+      metadata["skippedStages"] = skipped
 
-    return IntentData(
+    # Everything here was produced by the classifier with the right types, so
+    # the models are assembled without re-running pydantic validation.
+    result = IntentData.construct(
       intent=intent,
       confidence=confidence,
       keywords=keywords,
@@ -89,11 +573,22 @@ class IntentClassifier:
       route=route,
       metadata=metadata,
     )
+    finished = time.perf_counter()
+    stages["build"] = finished - stage_started
+    self.stage_costs.observe(stages)
+    result.metadata["processingTimeMs"] = round((finished - started) * 1000, 3)
+    result.metadata["stagesMs"] = {
+      stage: round(seconds * 1000, 4) for stage, seconds in stages.items()
+    }
+    return result
 
-  def _rank_intents(self, text: str) -> List[Tuple[str, float, List[str]]]:
-    ranking: List[Tuple[str, float, List[str]]] = []
-    for intent, keywords in INTENT_KEYWORDS.items():
-      matches = [kw for kw in keywords if kw in text]
+  def _rank_intents(
+    self, state: ClassifierState, intent_hits: Dict[str, List[str]]
+  ) -> Ranking:
+    ranking: Ranking = []
+    for intent, keywords in state.vocabulary.intent_keywords.items():
+      hits = intent_hits.get(intent)
+      matches = sorted(hits, key=state.keyword_order[intent].__getitem__) if hits else []
       score = len(matches) / len(keywords) if keywords else 0
       ranking.append((intent, score, matches))
     ranking.sort(key=lambda entry: entry[1], reverse=True)
@@ -101,6 +596,39 @@ class IntentClassifier:
       ranking.append(("chat", 0.0, []))
     return ranking
 
+  def _keyword_scores(
+    self,
+    state: ClassifierState,
+    intents: Sequence[str],
+    intent_hits: Dict[str, List[str]],
+  ) -> np.ndarray:
+    intent_keywords = state.vocabulary.intent_keywords
+    return np.array(
+      [
+        len(intent_hits.get(intent, [])) / len(intent_keywords[intent])
+        if intent_keywords.get(intent)
+        else 0.0
+        for intent in intents
+      ],
+      dtype=np.float32,
+    )
+
+  def _rank_scores(
+    self,
+    state: ClassifierState,
+    intents: Sequence[str],
+    scores: np.ndarray,
+    intent_hits: Dict[str, List[str]],
+  ) -> Ranking:
+    ranking: Ranking = []
+    for intent, score in zip(intents, scores.tolist()):
+      hits = intent_hits.get(intent)
+      order = state.keyword_order.get(intent, {})
+      matches = sorted(hits, key=order.__getitem__) if hits else []
+      ranking.append((intent, score, matches))
+    ranking.sort(key=lambda entry: entry[1], reverse=True)
+    return ranking
+
   def _context_bonus(self, intent: str, context: ContextSnapshot) -> float:
     bonus = 0.0
     if intent in context.intent_counts:
@@ -111,6 +639,8 @@ class IntentClassifier:
       bonus += 0.05
     return bonus
 
-  def _route_for_intent(self, intent: str) -> RouteInfo:
-    base_route = SERVICE_ROUTES.get(intent, SERVICE_ROUTES["chat"])
-    return RouteInfo(service=base_route.service, endpoint=base_route.endpoint)
+  def _route_for_intent(self, state: ClassifierState, intent: str) -> RouteInfo:
+    # RouteInfo is frozen, so the vocabulary's instances are shared by every
+    # result instead of being copied per request.
+    routes = state.vocabulary.service_routes
+    return routes.get(intent, routes["chat"])
@@ -0,0 +1,107 @@
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..models import IntentData
+from .context_manager import ContextSnapshot
+from .inference_executor import InferenceExecutor
+from .intent_cache import CacheKey, IntentCache, reuse_result
+from .micro_batcher import MicroBatcher
+from .singleflight import SingleFlight
+
+
+def _degraded(result: IntentData) -> bool:
+  # Answers that skipped stages to meet a deadline are not cached; a later
+  # caller with more time should get the full classification.
+  return bool(result.metadata.get("skippedStages"))
+
+
+class IntentService:
+  def __init__(
+    self,
+    executor: InferenceExecutor,
+    micro_batcher: Optional[MicroBatcher] = None,
+    cache: Optional[IntentCache] = None,
+    singleflight: Optional[SingleFlight[IntentData]] = None,
+  ) -> None:
+    self.executor = executor
+    self.micro_batcher = micro_batcher
+    self.cache = cache
+    self.singleflight = singleflight
+    self.generation = 0
+
+  async def classify(self, message: str, context: ContextSnapshot) -> IntentData:
+    started = time.perf_counter()
+    cache_key = IntentCache.key(message, context)
+    if self.cache is not None:
+      cached = self.cache.get(cache_key, context, started)
+      if cached is not None:
+        return cached
+
+    if self.singleflight is None:
+      return await self._run(message, context, cache_key)
+
+    # Callers with a deadline may get a degraded answer, so they only share
+    # in-flight work with each other.
+    result, shared = await self.singleflight.do(
+      (cache_key, context.deadline is not None), lambda: self._run(message, context, cache_key)
+    )
+    return reuse_result(result, context, started, "sharedResult") if shared else result
+
+  async def _run(self, message: str, context: ContextSnapshot, cache_key: CacheKey) -> IntentData:
+    generation = self.generation
+    # Keyword-only answers take microseconds; don't queue them behind the
+    # executor or the micro-batcher.
+    result = self.executor.fast_path(message, context)
+    if result is None:
+      async with self.executor.slot():
+        if self.micro_batcher is not None:
+          result = await self.micro_batcher.submit(message, context)
+        else:
+          result = await self.executor.classify(message, context, try_fast_path=False)
+    if self.cache is not None and generation == self.generation and not _degraded(result):
+      self.cache.put(cache_key, result)
+    return result
+
+  async def classify_many(
+    self,
+    messages: Sequence[str],
+    contexts: Sequence[ContextSnapshot],
+    use_cache: bool = True,
+  ) -> List[IntentData]:
+    started = time.perf_counter()
+    cache = self.cache if use_cache else None
+    results: List[Optional[IntentData]] = [None] * len(messages)
+    missing: List[int] = []
+    for index, (message, context) in enumerate(zip(messages, contexts)):
+      if cache is not None:
+        results[index] = cache.get(IntentCache.key(message, context), context, started)
+      if results[index] is None:
+        missing.append(index)
+
+    if missing:
+      generation = self.generation
+      async with self.executor.slot(len(missing)):
+        classified = await self.executor.classify_batch(
+          [messages[index] for index in missing],
+          [contexts[index] for index in missing],
+        )
+      for index, result in zip(missing, classified):
+        results[index] = result
+        if cache is not None and generation == self.generation and not _degraded(result):
+          cache.put(IntentCache.key(messages[index], contexts[index]), result)
+
+    return [result for result in results if result is not None]
+
+  def invalidate(self) -> None:
+    # Requests that were already running when the classifier changed must not
+    # repopulate the cache with answers from the old model or vocabulary.
+    self.generation += 1
+    if self.cache is not None:
+      self.cache.clear()
+
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "executor": self.executor.stats(),
+      "cache": self.cache.stats() if self.cache is not None else None,
+      "singleflight": self.singleflight.stats() if self.singleflight is not None else None,
+    }
@@ -0,0 +1,102 @@
+import re
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+
+WORD_PATTERN = re.compile(r"[^\W_]+")
+# Words joined by an underscore or by punctuation other than an apostrophe.
+# split_words separates them, but spaCy keeps "draw_logo" and "logo.png" as one
+# token and puts "landing-page" around a "-" token, so phrases would match
+# differently on the two paths.
+JOINED_WORDS_PATTERN = re.compile(r"_|[^\W_][^\w\s'’]+[^\W_]")
+
+# (label, term) pairs emitted for every phrase that matches.
+Payload = Tuple[str, str]
+
+
+def split_words(text: str) -> List[str]:
+  return WORD_PATTERN.findall(text.lower())
+
+
+def has_joined_words(text: str) -> bool:
+  return JOINED_WORDS_PATTERN.search(text) is not None
+
+
+# Aho-Corasick over words rather than characters: phrases match on whole-word
+# boundaries and one left-to-right walk reports every registered phrase.
+class KeywordAutomaton:
+  def __init__(self) -> None:
+    self._goto: List[Dict[str, int]] = [{}]
+    self._fail: List[int] = [0]
+    self._output: List[List[Payload]] = [[]]
+    self._built = False
+
+  def add(self, phrase: str, label: str, term: Optional[str] = None) -> None:
+    # `term` is reported for matches instead of the phrase itself, so several
+    # spellings can stand for one keyword.
+    words = split_words(phrase)
+    if not words:
+      return
+    state = 0
+    for word in words:
+      next_state = self._goto[state].get(word)
+      if next_state is None:
+        next_state = len(self._goto)
+        self._goto[state][word] = next_state
+        self._goto.append({})
+        self._fail.append(0)
+        self._output.append([])
+      state = next_state
+    self._output[state].append((label, term or phrase))
+    self._built = False
+
+  def build(self) -> "KeywordAutomaton":
+    queue: Deque[int] = deque()
+    for state in self._goto[0].values():
+      self._fail[state] = 0
+      queue.append(state)
+
+    while queue:
+      state = queue.popleft()
+      for word, next_state in self._goto[state].items():
+        queue.append(next_state)
+        fallback = self._fail[state]
+        while fallback and word not in self._goto[fallback]:
+          fallback = self._fail[fallback]
+        target = self._goto[fallback].get(word, 0)
+        self._fail[next_state] = target if target != next_state else 0
+        self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    self._built = True
+    return self
+
+  def search(self, text: str) -> List[Payload]:
+    return self.search_words(split_words(text))
+
+  def search_words(self, words: Iterable[str]) -> List[Payload]:
+    if not self._built:
+      self.build()
+    goto, fail, output = self._goto, self._fail, self._output
+    found: List[Payload] = []
+    state = 0
+    for word in words:
+      while state and word not in goto[state]:
+        state = fail[state]
+      state = goto[state].get(word, 0)
+      if output[state]:
+        found.extend(output[state])
+    return found
+
+  def to_dict(self) -> Dict[str, Any]:
+    if not self._built:
+      self.build()
+    return {"goto": self._goto, "fail": self._fail, "output": self._output}
+
+  @classmethod
+  def from_dict(cls, data: Dict[str, Any]) -> "KeywordAutomaton":
+    automaton = cls()
+    automaton._goto = [dict(edges) for edges in data["goto"]]
+    automaton._fail = list(data["fail"])
+    automaton._output = [[(label, phrase) for label, phrase in payloads] for payloads in data["output"]]
+    automaton._built = True
+    return automaton
@@ -0,0 +1,68 @@
+import time
+from typing import Any, Dict, Mapping, Optional
+
+
+DEADLINE_HEADER = "x-request-deadline-ms"
+DEADLINE_METADATA_KEY = "deadlineMs"
+
+# Stages the classifier may drop to meet a deadline. Without "score" the
+# linear or semantic scorer is skipped and ranking uses keyword hits only;
+# without "entities" keyword hits come from the automaton instead of the spaCy
+# matchers and no entities are reported.
+OPTIONAL_STAGES = ("score", "entities", "context")
+
+
+def parse_budget_ms(value: Any) -> Optional[float]:
+  if value is None or value == "":
+    return None
+  if isinstance(value, bool):
+    raise ValueError("deadline must be a number of milliseconds")
+  try:
+    budget = float(value)
+  except (TypeError, ValueError) as exc:
+    raise ValueError("deadline must be a number of milliseconds") from exc
+  if budget != budget or budget in (float("inf"), float("-inf")):
+    raise ValueError("deadline must be a finite number of milliseconds")
+  return budget
+
+
+def request_deadline(
+  header: Optional[str], metadata: Optional[Mapping[str, Any]], reserve_ms: float = 0.0
+) -> Optional[float]:
+  # Deadlines are relative budgets on the wire and absolute time.monotonic()
+  # values internally, so time spent queueing counts against them. The header
+  # wins over the body; the reserve is held back for serialization and transport.
+  budget = parse_budget_ms(header)
+  if budget is None and metadata:
+    budget = parse_budget_ms(metadata.get(DEADLINE_METADATA_KEY))
+  if budget is None:
+    return None
+  return time.monotonic() + (budget - reserve_ms) / 1000
+
+
+class StageCosts:
+  # Exponentially weighted per-stage durations, used to predict whether an
+  # optional stage still fits in the time left before a deadline.
+  def __init__(self, alpha: float = 0.1) -> None:
+    self.alpha = alpha
+    self._seconds: Dict[str, float] = {}
+
+  def observe(self, stages: Mapping[str, float]) -> None:
+    for stage, seconds in stages.items():
+      previous = self._seconds.get(stage)
+      self._seconds[stage] = (
+        seconds if previous is None else previous + self.alpha * (seconds - previous)
+      )
+
+  def estimate(self, stage: str) -> float:
+    return self._seconds.get(stage, 0.0)
+
+  def fits(self, stage: str, deadline: Optional[float]) -> bool:
+    # Building the result is never skipped, so its cost is kept in reserve.
+    if deadline is None:
+      return True
+    remaining = deadline - time.monotonic()
+    return remaining >= self.estimate(stage) + self.estimate("build")
+
+  def summary(self) -> Dict[str, float]:
+    return {stage: round(seconds * 1000, 4) for stage, seconds in sorted(self._seconds.items())}
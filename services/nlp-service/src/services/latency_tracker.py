@@ -0,0 +1,40 @@
+from collections import deque
+from typing import Deque, Dict, Iterable, List
+
+
+class LatencyTracker:
+  def __init__(self, window: int = 2048) -> None:
+    self.window = window
+    self._samples: Dict[str, Deque[float]] = {}
+    self._counts: Dict[str, int] = {}
+
+  def record(self, key: str, duration_ms: float) -> None:
+    samples = self._samples.get(key)
+    if samples is None:
+      samples = self._samples.setdefault(key, deque(maxlen=self.window))
+    samples.append(duration_ms)
+    self._counts[key] = self._counts.get(key, 0) + 1
+
+  def record_many(self, key: str, durations_ms: Iterable[float]) -> None:
+    for duration_ms in durations_ms:
+      self.record(key, duration_ms)
+
+  def summary(self) -> Dict[str, Dict[str, float]]:
+    report: Dict[str, Dict[str, float]] = {}
+    for key, samples in list(self._samples.items()):
+      ordered = sorted(samples)
+      if not ordered:
+        continue
+      report[key] = {
+        "count": self._counts.get(key, 0),
+        "meanMs": round(sum(ordered) / len(ordered), 3),
+        "p50Ms": self._percentile(ordered, 0.50),
+        "p95Ms": self._percentile(ordered, 0.95),
+        "p99Ms": self._percentile(ordered, 0.99),
+      }
+    return report
+
+  @staticmethod
+  def _percentile(ordered: List[float], quantile: float) -> float:
+    index = min(len(ordered) - 1, int(round(quantile * (len(ordered) - 1))))
+    return round(ordered[index], 3)
@@ -0,0 +1,72 @@
+from pathlib import Path
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from spacy.tokens import Doc
+
+
+class LinearIntentScorer:
+  def __init__(
+    self,
+    intents: Sequence[str],
+    weights: np.ndarray,
+    bias: np.ndarray,
+    n_features: int,
+    ngram_range: Tuple[int, int] = (1, 2),
+  ) -> None:
+    if weights.shape != (n_features, len(intents)):
+      raise ValueError(
+        f"weight matrix shape {weights.shape} does not match "
+        f"({n_features}, {len(intents)})"
+      )
+    self.intents: List[str] = list(intents)
+    self.weights = np.ascontiguousarray(weights, dtype=np.float32)
+    self.bias = np.ascontiguousarray(bias, dtype=np.float32)
+    self.n_features = n_features
+    self.ngram_range = ngram_range
+    self.vectorizer = build_vectorizer(n_features, ngram_range)
+
+  @classmethod
+  def load(cls, path: Union[str, Path]) -> "LinearIntentScorer":
+    with np.load(path, allow_pickle=False) as data:
+      return cls(
+        intents=[str(intent) for intent in data["intents"]],
+        weights=data["weights"],
+        bias=data["bias"],
+        n_features=int(data["n_features"]),
+        ngram_range=(int(data["ngram_range"][0]), int(data["ngram_range"][1])),
+      )
+
+  def save(self, path: Union[str, Path]) -> None:
+    np.savez_compressed(
+      path,
+      intents=np.array(self.intents),
+      weights=self.weights,
+      bias=self.bias,
+      n_features=np.array(self.n_features),
+      ngram_range=np.array(self.ngram_range),
+    )
+
+  def score_texts(self, texts: Sequence[str]) -> np.ndarray:
+    # One sparse (n x features) by dense (features x intents) product scores
+    # every intent for the whole batch.
+    features = self.vectorizer.transform(texts)
+    logits = np.asarray(features @ self.weights) + self.bias
+    logits -= logits.max(axis=1, keepdims=True)
+    np.exp(logits, out=logits)
+    logits /= logits.sum(axis=1, keepdims=True)
+    return logits
+
+  def score_docs(self, docs: Sequence[Doc]) -> np.ndarray:
+    return self.score_texts([doc.text for doc in docs])
+
+
+def build_vectorizer(n_features: int, ngram_range: Tuple[int, int]) -> HashingVectorizer:
+  return HashingVectorizer(
+    n_features=n_features,
+    ngram_range=ngram_range,
+    alternate_sign=False,
+    norm="l2",
+    lowercase=True,
+  )
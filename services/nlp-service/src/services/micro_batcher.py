@@ -0,0 +1,80 @@
+import asyncio
+from typing import List, Optional, Set, Tuple
+
+from ..models import IntentData
+from .context_manager import ContextSnapshot
+from .inference_executor import InferenceExecutor
+
+
+PendingItem = Tuple[str, ContextSnapshot, "asyncio.Future[IntentData]"]
+
+
+class MicroBatcher:
+  # By default requests never wait for a batch to fill: while the executor has
+  # an idle worker a request is sent on its own straight away. Only when every
+  # worker is already running a batch do new requests queue up, and they all
+  # go out together as soon as one of those batches finishes.
+  #
+  # A window_ms above zero opts back into a fixed batching window: a request
+  # that finds an idle worker waits up to that long for others to join it. This
+  # adds the full window to every request on a quiet service, so it only pays
+  # off where nlp.pipe batching gains more than the wait costs.
+  def __init__(self, executor: InferenceExecutor, max_size: int, window_ms: float = 0) -> None:
+    self.executor = executor
+    self.max_size = max(1, max_size)
+    self.window_seconds = max(0.0, window_ms) / 1000
+    self._pending: List[PendingItem] = []
+    self._tasks: Set["asyncio.Task[None]"] = set()
+    self._timer: Optional[asyncio.TimerHandle] = None
+
+  async def submit(self, message: str, context: ContextSnapshot) -> IntentData:
+    loop = asyncio.get_running_loop()
+    future: "asyncio.Future[IntentData]" = loop.create_future()
+    self._pending.append((message, context, future))
+    if len(self._pending) >= self.max_size:
+      self._flush()
+    elif len(self._tasks) < self.executor.workers:
+      if not self.window_seconds:
+        self._flush()
+      elif self._timer is None:
+        self._timer = loop.call_later(self.window_seconds, self._window_closed)
+    return await future
+
+  def _window_closed(self) -> None:
+    self._timer = None
+    if len(self._tasks) < self.executor.workers:
+      self._flush()
+
+  def _flush(self) -> None:
+    if self._timer is not None:
+      self._timer.cancel()
+      self._timer = None
+    batch, self._pending = self._pending[: self.max_size], self._pending[self.max_size :]
+    if not batch:
+      return
+
+    task = asyncio.get_running_loop().create_task(self._run(batch))
+    self._tasks.add(task)
+    task.add_done_callback(self._finished)
+
+  def _finished(self, task: "asyncio.Task[None]") -> None:
+    self._tasks.discard(task)
+    # Whatever queued up meanwhile has already waited on a busy worker.
+    if self._pending:
+      self._flush()
+
+  async def _run(self, batch: List[PendingItem]) -> None:
+    messages = [message for message, _, _ in batch]
+    contexts = [context for _, context, _ in batch]
+    try:
+      # Submitters have already tried the fast path inline.
+      results = await self.executor.classify_batch(messages, contexts, try_fast_path=False)
+    except Exception as exc:
+      for _, _, future in batch:
+        if not future.done():
+          future.set_exception(exc)
+      return
+
+    for (_, _, future), result in zip(batch, results):
+      if not future.done():
+        future.set_result(result)
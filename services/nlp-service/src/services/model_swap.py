@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from .intent_classifier import WARMUP_MESSAGES, ClassifierState, IntentClassifier
+
+
+logger = logging.getLogger("aio-nlp-service.model-swap")
+
+
+class ModelSwapInProgressError(Exception):
+  pass
+
+
+class ModelSwapper:
+  # Blue/green replacement of the classifier's spaCy model: the new pipeline
+  # and its matchers are built and warmed on a worker thread next to the live
+  # one, then published in a single assignment. Requests that already read the
+  # old state finish on it; later ones only ever see the warmed model.
+  def __init__(
+    self,
+    classifier: IntentClassifier,
+    warmup_messages: Sequence[str] = WARMUP_MESSAGES,
+    on_swapped: Optional[Callable[[ClassifierState], None]] = None,
+  ) -> None:
+    self.classifier = classifier
+    self.warmup_messages = list(warmup_messages)
+    self.on_swapped = on_swapped
+    self.status = "idle"
+    self.model: Optional[str] = None
+    self.previous_model: Optional[str] = None
+    self.started_at: Optional[float] = None
+    self.finished_at: Optional[float] = None
+    self.load_ms: Optional[float] = None
+    self.warmup_ms: Optional[float] = None
+    self.error: Optional[str] = None
+    self.swaps = 0
+    self._task: Optional["asyncio.Task[None]"] = None
+
+  @property
+  def busy(self) -> bool:
+    return self._task is not None and not self._task.done()
+
+  def start(self, model: str) -> None:
+    if self.busy:
+      raise ModelSwapInProgressError(f"a swap to '{self.model}' is already running")
+    self.status = "loading"
+    self.model = model
+    self.started_at = time.time()
+    self.finished_at = None
+    self.load_ms = None
+    self.warmup_ms = None
+    self.error = None
+    self._task = asyncio.get_running_loop().create_task(self._swap(model))
+
+  def _prepare(self, model: str) -> ClassifierState:
+    started = time.perf_counter()
+    state = self.classifier.prepare_model(model)
+    self.load_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    self.status = "warming"
+    started = time.perf_counter()
+    self.classifier.warm_up(state, self.warmup_messages)
+    self.warmup_ms = round((time.perf_counter() - started) * 1000, 3)
+    return state
+
+  async def _swap(self, model: str) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+      state = await loop.run_in_executor(None, self._prepare, model)
+    except Exception as exc:
+      self.status = "failed"
+      self.error = f"{type(exc).__name__}: {exc}"
+      self.finished_at = time.time()
+      logger.error("Model swap to %s failed, keeping %s: %s", model, self.classifier.model_name, exc)
+      return
+
+    previous = self.classifier.use_state(state)
+    self.previous_model = previous.model_name
+    self.swaps += 1
+    self.status = "swapped"
+    self.finished_at = time.time()
+    if self.on_swapped is not None:
+      self.on_swapped(state)
+    logger.info(
+      "Swapped model %s -> %s (load %.0fms, warmup %.0fms)",
+      previous.model_name,
+      model,
+      self.load_ms or 0.0,
+      self.warmup_ms or 0.0,
+    )
+
+  async def wait(self) -> None:
+    if self._task is not None:
+      await asyncio.shield(self._task)
+
+  async def stop(self) -> None:
+    if self._task is not None and not self._task.done():
+      self._task.cancel()
+      try:
+        await self._task
+      except asyncio.CancelledError:
+        pass
+
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "status": self.status,
+      "activeModel": self.classifier.model_name,
+      "model": self.model,
+      "previousModel": self.previous_model,
+      "startedAt": self.started_at,
+      "finishedAt": self.finished_at,
+      "loadMs": self.load_ms,
+      "warmupMs": self.warmup_ms,
+      "error": self.error,
+      "swaps": self.swaps,
+    }
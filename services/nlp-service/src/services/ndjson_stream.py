@@ -0,0 +1,142 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+import orjson
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette.types import Receive, Scope, Send
+
+from ..models import IntentRequest
+from .context_manager import ContextManager
+from .fast_response import intent_payload
+from .inference_executor import InferenceOverloadedError
+from .intent_service import IntentService
+
+
+async def iter_lines(
+  chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+  # Yields (line number, line) for non-blank lines. A line longer than
+  # max_line_bytes is dropped as it arrives rather than buffered, and yielded
+  # as (line number, None). Each chunk is scanned for newlines once.
+  buffer = bytearray()
+  oversized = False
+  line_number = 0
+  async for chunk in chunks:
+    start = 0
+    while True:
+      end = chunk.find(b"\n", start)
+      if end == -1:
+        break
+      line_number += 1
+      if oversized or len(buffer) + end - start > max_line_bytes:
+        yield line_number, None
+      else:
+        buffer += chunk[start:end]
+        if buffer.strip():
+          yield line_number, bytes(buffer)
+      buffer.clear()
+      oversized = False
+      start = end + 1
+    if not oversized:
+      buffer += chunk[start:]
+      if len(buffer) > max_line_bytes:
+        oversized = True
+        buffer.clear()
+  if oversized:
+    yield line_number + 1, None
+  elif buffer.strip():
+    yield line_number + 1, bytes(buffer)
+
+
+def _record(payload: Dict[str, Any]) -> bytes:
+  return orjson.dumps(payload) + b"\n"
+
+
+class NdjsonStreamingResponse(StreamingResponse):
+  media_type = "application/x-ndjson"
+
+  # StreamingResponse watches receive() for a disconnect while streaming, which
+  # would swallow the request body this response is still reading. The body
+  # iterator consumes receive() itself and sees a disconnect as ClientDisconnect.
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    await self.stream_response(send)
+    if self.background is not None:
+      await self.background()
+
+
+# A request parsed from a line, or the error to report for that line.
+Entry = Tuple[int, Union[IntentRequest, str]]
+
+
+class NdjsonClassifier:
+  def __init__(
+    self,
+    context_manager: ContextManager,
+    intent_service: IntentService,
+    chunk_size: int,
+    max_line_bytes: int,
+  ) -> None:
+    self.context_manager = context_manager
+    self.intent_service = intent_service
+    self.chunk_size = max(1, chunk_size)
+    self.max_line_bytes = max(1, max_line_bytes)
+
+  async def stream(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    # Records are written in input order: a bad line waits behind requests
+    # from earlier lines that are still being batched.
+    pending: List[Entry] = []
+    requests = 0
+    async for line_number, line in iter_lines(chunks, self.max_line_bytes):
+      entry = self._parse(line)
+      if not requests and isinstance(entry, str):
+        yield _record({"line": line_number, "success": False, "error": entry})
+        continue
+
+      pending.append((line_number, entry))
+      if isinstance(entry, IntentRequest):
+        requests += 1
+      if requests >= self.chunk_size:
+        async for record in self._classify_chunk(pending):
+          yield record
+        pending = []
+        requests = 0
+
+    if pending:
+      async for record in self._classify_chunk(pending):
+        yield record
+
+  def _parse(self, line: Optional[bytes]) -> Union[IntentRequest, str]:
+    if line is None:
+      return f"line exceeds {self.max_line_bytes} bytes"
+    try:
+      request = IntentRequest.parse_raw(line)
+    except (ValidationError, ValueError) as exc:
+      return str(exc)
+    if not request.message.strip():
+      return "message is required"
+    return request
+
+  async def _classify_chunk(self, chunk: List[Entry]) -> AsyncIterator[bytes]:
+    requests = [request for _, request in chunk if isinstance(request, IntentRequest)]
+    messages = [request.message for request in requests]
+    contexts = [self.context_manager.summarize(request) for request in requests]
+    while True:
+      try:
+        # Bulk re-scoring would flush the hot entries out of the result cache.
+        results = iter(
+          await self.intent_service.classify_many(messages, contexts, use_cache=False)
+        )
+        break
+      except InferenceOverloadedError as exc:
+        # The response has already started, so wait for capacity instead of
+        # failing the stream.
+        await asyncio.sleep(exc.retry_after_seconds)
+
+    for line_number, entry in chunk:
+      if isinstance(entry, str):
+        yield _record({"line": line_number, "success": False, "error": entry})
+      else:
+        yield _record(
+          {"line": line_number, "success": True, "data": intent_payload(next(results))}
+        )
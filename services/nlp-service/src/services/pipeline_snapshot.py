@@ -0,0 +1,94 @@
+import json
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import spacy
+from spacy.language import Language
+
+from .keyword_automaton import KeywordAutomaton
+from .vocabulary import Vocabulary, dump_vocabulary, parse_vocabulary
+
+
+# Layout of a snapshot directory:
+#   pipeline/        the configured pipeline written with nlp.to_disk; profile
+#                    exclusions are already applied, so loading it resolves
+#                    nothing it will not run
+#   vocabulary.json  the vocabulary the matchers were compiled from
+#   automaton.json   the compiled keyword automaton used by the fast path
+#   manifest.json    model name, profile and versions the snapshot was built with
+PIPELINE_DIR = "pipeline"
+VOCABULARY_FILE = "vocabulary.json"
+AUTOMATON_FILE = "automaton.json"
+MANIFEST_FILE = "manifest.json"
+# Bumped when the automaton's contents change for the same vocabulary; an
+# automaton written in another format is rebuilt from the vocabulary.
+AUTOMATON_FORMAT = 2
+
+
+@dataclass(frozen=True)
+class PipelineSnapshot:
+  manifest: Dict[str, Any]
+  nlp: Language
+  vocabulary: Vocabulary
+  automaton: Optional[KeywordAutomaton]
+
+
+def write_snapshot(
+  path: Union[str, Path],
+  model_name: str,
+  pipeline_profile: str,
+  nlp: Language,
+  vocabulary: Vocabulary,
+  automaton: KeywordAutomaton,
+) -> Dict[str, Any]:
+  target = Path(path)
+  # Written next to the target and renamed into place, so a running service
+  # never sees a half-written snapshot.
+  staging = target.with_name(f".{target.name}.tmp")
+  if staging.exists():
+    shutil.rmtree(staging)
+  staging.mkdir(parents=True)
+
+  nlp.to_disk(staging / PIPELINE_DIR)
+  with (staging / VOCABULARY_FILE).open("w", encoding="utf-8") as handle:
+    json.dump(dump_vocabulary(vocabulary), handle)
+  with (staging / AUTOMATON_FILE).open("w", encoding="utf-8") as handle:
+    json.dump(automaton.to_dict(), handle)
+
+  manifest = {
+    "model": model_name,
+    "pipelineProfile": pipeline_profile,
+    "pipeline": nlp.pipe_names,
+    "vocabularyVersion": vocabulary.version,
+    "automatonFormat": AUTOMATON_FORMAT,
+    "spacyVersion": spacy.__version__,
+    "createdAt": time.time(),
+  }
+  with (staging / MANIFEST_FILE).open("w", encoding="utf-8") as handle:
+    json.dump(manifest, handle, indent=2)
+
+  if target.exists():
+    shutil.rmtree(target)
+  staging.rename(target)
+  return manifest
+
+
+def read_snapshot(path: Union[str, Path], defaults: Vocabulary) -> PipelineSnapshot:
+  source = Path(path)
+  with (source / MANIFEST_FILE).open(encoding="utf-8") as handle:
+    manifest = json.load(handle)
+  with (source / VOCABULARY_FILE).open(encoding="utf-8") as handle:
+    vocabulary = parse_vocabulary(json.load(handle), defaults)
+  automaton = None
+  if manifest.get("automatonFormat") == AUTOMATON_FORMAT:
+    with (source / AUTOMATON_FILE).open(encoding="utf-8") as handle:
+      automaton = KeywordAutomaton.from_dict(json.load(handle))
+  return PipelineSnapshot(
+    manifest=manifest,
+    nlp=spacy.load(source / PIPELINE_DIR),
+    vocabulary=vocabulary,
+    automaton=automaton,
+  )
@@ -0,0 +1,111 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Mapping, Sequence, Union
+
+import numpy as np
+from spacy.language import Language
+from spacy.tokens import Doc
+
+
+INTENT_EXAMPLES: Dict[str, List[str]] = {
+  "graphics": [
+    "draw a logo for my brand",
+    "make an illustration with bright colors",
+    "sketch an icon for the app",
+    "create a poster with shapes and text",
+    "paint a picture of a sunset",
+  ],
+  "web_designer": [
+    "build a landing page for my startup",
+    "make a homepage for my bakery",
+    "design a portfolio site with a contact form",
+    "create a responsive navigation menu",
+    "lay out a pricing section for the site",
+  ],
+  "ide": [
+    "write a python function that sorts a list",
+    "fix the error in my javascript",
+    "run this program and show the output",
+    "refactor the class to be cleaner",
+    "debug why the test fails",
+  ],
+  "cad": [
+    "model a chair in three dimensions",
+    "create a cube and extrude one face",
+    "design a mechanical gear",
+    "build a 3d printable bracket",
+    "make a mesh of a coffee mug",
+  ],
+  "video": [
+    "edit my holiday footage",
+    "cut the clip and add a fade",
+    "make a short movie from these clips",
+    "add music to the film",
+    "trim the recording and export it",
+  ],
+  "chat": [
+    "hello how are you",
+    "what can you help me with",
+    "thanks that was great",
+    "tell me something interesting",
+    "who are you",
+  ],
+}
+
+
+def load_examples(path: Union[str, Path]) -> Dict[str, List[str]]:
+  with Path(path).open(encoding="utf-8") as handle:
+    data = json.load(handle)
+  return {str(intent): [str(example) for example in examples] for intent, examples in data.items()}
+
+
+class SemanticRouter:
+  def __init__(
+    self,
+    nlp: Language,
+    examples: Mapping[str, Sequence[str]],
+    similarity_floor: float = 0.35,
+  ) -> None:
+    self.vectors = nlp.vocab.vectors
+    if self.vectors.shape[0] == 0:
+      raise ValueError(
+        "semantic routing needs a pipeline with static word vectors (e.g. en_core_web_md)"
+      )
+    self.nlp = nlp
+    self.similarity_floor = similarity_floor
+    self.intents: List[str] = [intent for intent, utterances in examples.items() if utterances]
+
+    centroids = []
+    for intent in self.intents:
+      encoded = self.encode([nlp.make_doc(text) for text in examples[intent]])
+      centroid = encoded.mean(axis=0)
+      norm = np.linalg.norm(centroid)
+      centroids.append(centroid / norm if norm else centroid)
+    # (intents x dimensions), row-normalised so a dot product is a cosine.
+    self.centroids = np.ascontiguousarray(np.vstack(centroids), dtype=np.float32)
+
+  def encode(self, docs: Sequence[Doc]) -> np.ndarray:
+    data = self.vectors.data
+    encoded = np.zeros((len(docs), self.vectors.shape[1]), dtype=np.float32)
+    for position, doc in enumerate(docs):
+      if not len(doc):
+        continue
+      rows = self.vectors.find(keys=[token.orth for token in doc])
+      missing = rows < 0
+      if missing.any():
+        lowered = self.vectors.find(keys=[token.lower for token in doc])
+        rows = np.where(missing, lowered, rows)
+      rows = rows[rows >= 0]
+      if rows.size:
+        encoded[position] = np.asarray(data[rows]).mean(axis=0)
+
+    norms = np.linalg.norm(encoded, axis=1, keepdims=True)
+    np.divide(encoded, norms, out=encoded, where=norms > 0)
+    return encoded
+
+  def score_docs(self, docs: Sequence[Doc]) -> np.ndarray:
+    similarity = self.encode(docs) @ self.centroids.T
+    # Unrelated sentences still share some similarity through function words;
+    # rescale so only similarity above the floor counts as evidence.
+    scores = (similarity - self.similarity_floor) / (1.0 - self.similarity_floor)
+    return np.clip(scores, 0.0, 1.0)
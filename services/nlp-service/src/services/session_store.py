@@ -0,0 +1,145 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+Turn = Tuple[str, Optional[str]]
+
+
+def merge_artifacts(
+  existing: List[Dict[str, str]], incoming: List[Dict[str, str]], limit: int
+) -> List[Dict[str, str]]:
+  incoming_ids = {artifact["id"] for artifact in incoming}
+  kept = [artifact for artifact in existing if artifact["id"] not in incoming_ids]
+  return (kept + incoming)[-limit:]
+
+
+@dataclass
+class SessionState:
+  turns: Deque[Turn] = field(default_factory=deque)
+  intent_counts: Dict[str, int] = field(default_factory=dict)
+  active_tool: Optional[str] = None
+  artifacts: List[Dict[str, str]] = field(default_factory=list)
+
+  def append_turn(self, message: str, intent: Optional[str], max_history: int) -> None:
+    self.turns.append((message, intent))
+    if intent:
+      self.intent_counts[intent] = self.intent_counts.get(intent, 0) + 1
+    while len(self.turns) > max_history:
+      _, evicted = self.turns.popleft()
+      if evicted:
+        remaining = self.intent_counts.get(evicted, 0) - 1
+        if remaining > 0:
+          self.intent_counts[evicted] = remaining
+        else:
+          self.intent_counts.pop(evicted, None)
+
+  def to_json(self) -> str:
+    return json.dumps(
+      {
+        "turns": list(self.turns),
+        "intentCounts": self.intent_counts,
+        "activeTool": self.active_tool,
+        "artifacts": self.artifacts,
+      }
+    )
+
+  @classmethod
+  def from_json(cls, raw: str) -> "SessionState":
+    data = json.loads(raw)
+    return cls(
+      turns=deque((message, intent) for message, intent in data.get("turns", [])),
+      intent_counts=dict(data.get("intentCounts", {})),
+      active_tool=data.get("activeTool"),
+      artifacts=list(data.get("artifacts", [])),
+    )
+
+
+class SessionStore(ABC):
+  @abstractmethod
+  async def get(self, session_id: str) -> Optional[SessionState]:
+    ...
+
+  @abstractmethod
+  async def put(self, session_id: str, state: SessionState) -> None:
+    ...
+
+  async def close(self) -> None:
+    return None
+
+  def stats(self) -> Dict[str, Any]:
+    return {}
+
+
+class InMemorySessionStore(SessionStore):
+  def __init__(self, max_sessions: int, ttl_seconds: float) -> None:
+    self.max_sessions = max(1, max_sessions)
+    self.ttl_seconds = ttl_seconds
+    self._sessions: "OrderedDict[str, Tuple[float, SessionState]]" = OrderedDict()
+
+  async def get(self, session_id: str) -> Optional[SessionState]:
+    entry = self._sessions.get(session_id)
+    if entry is None:
+      return None
+    expires_at, state = entry
+    if expires_at <= time.monotonic():
+      del self._sessions[session_id]
+      return None
+    return state
+
+  async def put(self, session_id: str, state: SessionState) -> None:
+    self._sessions[session_id] = (time.monotonic() + self.ttl_seconds, state)
+    self._sessions.move_to_end(session_id)
+    while len(self._sessions) > self.max_sessions:
+      self._sessions.popitem(last=False)
+
+  def stats(self) -> Dict[str, Any]:
+    return {"backend": "memory", "sessions": len(self._sessions), "maxSessions": self.max_sessions}
+
+
+class RedisSessionStore(SessionStore):
+  key_prefix = "nlp:session:"
+
+  def __init__(self, url: str, ttl_seconds: float) -> None:
+    try:
+      import redis.asyncio as redis
+    except ImportError as exc:
+      raise RuntimeError("NLP_SESSION_STORE=redis requires the 'redis' package") from exc
+
+    self.client = redis.Redis.from_url(url, decode_responses=True)
+    self.ttl_seconds = int(ttl_seconds)
+
+  async def get(self, session_id: str) -> Optional[SessionState]:
+    raw = await self.client.get(f"{self.key_prefix}{session_id}")
+    return SessionState.from_json(raw) if raw else None
+
+  async def put(self, session_id: str, state: SessionState) -> None:
+    await self.client.set(f"{self.key_prefix}{session_id}", state.to_json(), ex=self.ttl_seconds)
+
+  async def close(self) -> None:
+    await self.client.close()
+
+  def stats(self) -> Dict[str, Any]:
+    return {"backend": "redis"}
+
+
+def create_session_store(
+  backend: str, redis_url: str, max_sessions: int, ttl_seconds: float, workers: int = 1
+) -> Optional[SessionStore]:
+  if backend == "none":
+    return None
+  if backend == "memory":
+    # Each server worker would keep its own sessions and a conversation would
+    # lose its history whenever a request landed on a different worker.
+    if workers > 1:
+      raise ValueError(
+        f"NLP_SESSION_STORE=memory cannot be shared by NLP_WORKERS={workers} processes; "
+        "use NLP_SESSION_STORE=redis"
+      )
+    return InMemorySessionStore(max_sessions=max_sessions, ttl_seconds=ttl_seconds)
+  if backend == "redis":
+    return RedisSessionStore(redis_url, ttl_seconds=ttl_seconds)
+  raise ValueError(f"unknown session store '{backend}', expected none, memory or redis")
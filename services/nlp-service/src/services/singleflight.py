@@ -0,0 +1,35 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+  def __init__(self) -> None:
+    self._calls: Dict[Hashable, "asyncio.Future[T]"] = {}
+    self.leaders = 0
+    self.shared = 0
+
+  async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+    call = self._calls.get(key)
+    if call is not None:
+      self.shared += 1
+      return await asyncio.shield(call), True
+
+    # The call runs as its own task so a cancelled caller (e.g. a dropped
+    # connection) does not cancel the work other callers are waiting on.
+    call = asyncio.ensure_future(fn())
+    self._calls[key] = call
+    self.leaders += 1
+    call.add_done_callback(lambda done: self._forget(key, done))
+    return await asyncio.shield(call), False
+
+  def _forget(self, key: Hashable, call: "asyncio.Future[T]") -> None:
+    if self._calls.get(key) is call:
+      del self._calls[key]
+    if not call.cancelled():
+      call.exception()
+
+  def stats(self) -> Dict[str, Any]:
+    return {"inFlight": len(self._calls), "leaders": self.leaders, "shared": self.shared}
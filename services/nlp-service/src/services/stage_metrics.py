@@ -0,0 +1,123 @@
+import os
+import time
+from typing import Iterable, Tuple
+
+from prometheus_client import (
+  CONTENT_TYPE_LATEST,
+  REGISTRY,
+  CollectorRegistry,
+  Counter,
+  Histogram,
+  generate_latest,
+)
+from prometheus_client import multiprocess
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..models import IntentData
+
+
+# "serialize" is observed by the HTTP layer when it encodes the response; the
+# rest come from the classifier's metadata.stagesMs.
+STAGES = ("fast_path", "pipeline", "score", "entities", "rank", "context", "build", "serialize")
+
+# Most stages finish in tens of microseconds; the default buckets start at 5ms
+# and would put nearly every observation in the first bucket.
+STAGE_BUCKETS = (
+  0.00005,
+  0.0001,
+  0.00025,
+  0.0005,
+  0.001,
+  0.0025,
+  0.005,
+  0.01,
+  0.025,
+  0.05,
+  0.1,
+  0.25,
+)
+TOTAL_BUCKETS = STAGE_BUCKETS + (0.5, 1.0, 2.5)
+
+STAGE_SECONDS = Histogram(
+  "nlp_classify_stage_seconds",
+  "Time spent in each intent classification stage",
+  ["stage"],
+  buckets=STAGE_BUCKETS,
+)
+CLASSIFY_SECONDS = Histogram(
+  "nlp_classify_seconds",
+  "End-to-end intent classification time inside the classifier",
+  ["path", "profile"],
+  buckets=TOTAL_BUCKETS,
+)
+HTTP_REQUEST_SECONDS = Histogram(
+  "nlp_http_request_seconds",
+  "Time from receiving a request to sending the last response byte",
+  ["path"],
+  buckets=TOTAL_BUCKETS,
+)
+CLASSIFICATIONS = Counter(
+  "nlp_classifications",
+  "Intent classifications by resolved intent",
+  ["intent", "path", "fallback"],
+)
+SKIPPED_STAGES = Counter(
+  "nlp_classify_skipped_stages",
+  "Optional classification stages dropped to meet a request deadline",
+  ["stage"],
+)
+
+# Binding label children up front keeps .labels() lookups off the hot path.
+_stage_children = {stage: STAGE_SECONDS.labels(stage=stage) for stage in STAGES}
+
+
+def observe(results: Iterable[IntentData]) -> None:
+  for result in results:
+    metadata = result.metadata
+    path = metadata.get("path", "full")
+    for stage, duration_ms in metadata.get("stagesMs", {}).items():
+      child = _stage_children.get(stage)
+      if child is not None:
+        child.observe(duration_ms / 1000)
+    CLASSIFY_SECONDS.labels(path=path, profile=metadata.get("pipelineProfile", "")).observe(
+      metadata.get("processingTimeMs", 0.0) / 1000
+    )
+    CLASSIFICATIONS.labels(
+      intent=result.intent, path=path, fallback=str(result.fallback).lower()
+    ).inc()
+    for stage in metadata.get("skippedStages", ()):
+      SKIPPED_STAGES.labels(stage=stage).inc()
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+  _stage_children[stage].observe(seconds)
+
+
+class RequestTimer:
+  # Pure ASGI middleware: comparing nlp_http_request_seconds with
+  # nlp_classify_seconds shows how much of an endpoint's time is spent outside
+  # the classifier (parsing, validation, routing, serialization).
+  def __init__(self, app: ASGIApp, paths: Iterable[str]) -> None:
+    self.app = app
+    self._children = {path: HTTP_REQUEST_SECONDS.labels(path=path) for path in paths}
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    child = self._children.get(scope["path"]) if scope["type"] == "http" else None
+    if child is None:
+      await self.app(scope, receive, send)
+      return
+    started = time.perf_counter()
+    try:
+      await self.app(scope, receive, send)
+    finally:
+      child.observe(time.perf_counter() - started)
+
+
+def render() -> Tuple[bytes, str]:
+  # Under the prefork server every worker keeps its own samples; with
+  # PROMETHEUS_MULTIPROC_DIR set they are written to shared files and merged here.
+  if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+  return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,98 @@
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from wordfreq import zipf_frequency
+
+
+# Zipf frequency of about one occurrence per 300k words. Everyday words sit
+# well above it ("write" 5.0, "modal" 3.1) and typos well below ("desgin" 1.1,
+# "webiste" 0).
+ENGLISH_ZIPF_FLOOR = 2.5
+
+
+def _deletes(word: str) -> Set[str]:
+  return {word[:index] + word[index + 1 :] for index in range(len(word))}
+
+
+@lru_cache(maxsize=65536)
+def is_english_word(word: str) -> bool:
+  return zipf_frequency(word, "en") >= ENGLISH_ZIPF_FLOOR
+
+
+def within_one_edit(left: str, right: str) -> bool:
+  # Optimal string alignment distance <= 1, checked in one pass: a single
+  # insertion or deletion, substitution, or adjacent transposition, so
+  # "webiste" is one edit from "website" rather than two.
+  if left == right:
+    return True
+  if len(left) < len(right):
+    left, right = right, left
+  if len(left) - len(right) > 1:
+    return False
+  index = 0
+  while index < len(right) and left[index] == right[index]:
+    index += 1
+  if len(left) != len(right):
+    return left[index + 1 :] == right[index:]
+  if left[index + 1 :] == right[index + 1 :]:
+    return True
+  return (
+    index + 1 < len(left)
+    and left[index] == right[index + 1]
+    and left[index + 1] == right[index]
+    and left[index + 2 :] == right[index + 2 :]
+  )
+
+
+# SymSpell-style lookup for single-edit typos. Every known word is stored under
+# itself and each of its one-character deletions; a typo shares at least one of
+# those keys with the word it came from (a deleted, inserted, substituted or
+# transposed character), so finding candidates is a handful of dict lookups
+# however many words are indexed. Candidates are then verified as within one
+# OSA edit, and a typo is only corrected when exactly one word matches and the
+# token is not itself a real English word ("write" is not a typo of "white").
+class TypoIndex:
+  def __init__(
+    self,
+    words: Iterable[str],
+    min_length: int = 5,
+    is_known_word: Callable[[str], bool] = is_english_word,
+  ) -> None:
+    self.min_length = min_length
+    self.is_known_word = is_known_word
+    self.words: Set[str] = {word for word in words if word}
+    self._candidates: Dict[str, List[str]] = {}
+    for word in sorted(self.words):
+      for key in {word, *_deletes(word)}:
+        self._candidates.setdefault(key, []).append(word)
+
+  def __len__(self) -> int:
+    return len(self.words)
+
+  def correct(self, word: str) -> Optional[str]:
+    # Short words are too close to unrelated vocabulary ("mode" -> "model") to
+    # correct safely, and tokens with digits are sizes or dimensions.
+    if len(word) < self.min_length or word in self.words or not word.isalpha():
+      return None
+    # Typos almost never hit the first letter, while real words that are one
+    # edit from a keyword usually differ there ("player" vs "layer").
+    matches: Set[str] = set()
+    for key in (word, *_deletes(word)):
+      for candidate in self._candidates.get(key, ()):
+        if candidate in matches or candidate[0] != word[0]:
+          continue
+        if within_one_edit(word, candidate):
+          matches.add(candidate)
+    # Checked last: most tokens have no candidate at all and never pay for
+    # the frequency lookup.
+    if len(matches) != 1 or self.is_known_word(word):
+      return None
+    return next(iter(matches))
+
+  def correct_words(self, words: Sequence[str]) -> Dict[int, str]:
+    corrections: Dict[int, str] = {}
+    for position, word in enumerate(words):
+      corrected = self.correct(word)
+      if corrected is not None:
+        corrections[position] = corrected
+    return corrections
@@ -0,0 +1,225 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from ..models import RouteInfo
+
+
+logger = logging.getLogger("aio-nlp-service.vocabulary")
+
+
+@dataclass(frozen=True)
+class Vocabulary:
+  version: str
+  intent_keywords: Dict[str, List[str]]
+  service_routes: Dict[str, RouteInfo]
+  entity_lexicons: Dict[str, List[str]]
+
+
+def _terms(section: str, raw: Any) -> Dict[str, List[str]]:
+  if not isinstance(raw, dict):
+    raise ValueError(f"'{section}' must be an object of term lists")
+  terms: Dict[str, List[str]] = {}
+  for name, values in raw.items():
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+      raise ValueError(f"'{section}.{name}' must be a list of strings")
+    terms[str(name)] = [value.strip().lower() for value in values if value.strip()]
+  return terms
+
+
+def parse_vocabulary(data: Dict[str, Any], defaults: Vocabulary) -> Vocabulary:
+  # Only version and intents are required; omitted routes or lexicons keep
+  # the defaults.
+  version = data.get("version")
+  if not isinstance(version, (str, int)) or not str(version).strip():
+    raise ValueError("vocabulary config needs a non-empty 'version'")
+  if "intents" not in data:
+    raise ValueError("vocabulary config needs an 'intents' section")
+
+  vocabulary = replace(
+    defaults, version=str(version), intent_keywords=_terms("intents", data["intents"])
+  )
+  if "routes" in data:
+    routes = data["routes"]
+    if not isinstance(routes, dict):
+      raise ValueError("'routes' must be an object")
+    vocabulary = replace(
+      vocabulary,
+      service_routes={str(intent): RouteInfo.parse_obj(route) for intent, route in routes.items()},
+    )
+  if "lexicons" in data:
+    vocabulary = replace(vocabulary, entity_lexicons=_terms("lexicons", data["lexicons"]))
+
+  if "chat" not in vocabulary.service_routes:
+    raise ValueError("'routes' must include the 'chat' fallback route")
+  return vocabulary
+
+
+def dump_vocabulary(vocabulary: Vocabulary) -> Dict[str, Any]:
+  return {
+    "version": vocabulary.version,
+    "intents": vocabulary.intent_keywords,
+    "routes": {intent: route.dict() for intent, route in vocabulary.service_routes.items()},
+    "lexicons": vocabulary.entity_lexicons,
+  }
+
+
+VOWELS = "aeiou"
+
+
+def _plural(word: str) -> str:
+  if word.endswith(("s", "x", "z", "ch", "sh")):
+    return f"{word}es"
+  if word.endswith("y") and word[-2] not in VOWELS:
+    return f"{word[:-1]}ies"
+  return f"{word}s"
+
+
+def _progressive(word: str) -> str:
+  if word.endswith("ie"):
+    return f"{word[:-2]}ying"
+  if word.endswith("e") and not word.endswith("ee"):
+    return f"{word[:-1]}ing"
+  # One-syllable words ending consonant-vowel-consonant double the last
+  # letter: clip -> clipping, but draw -> drawing and render -> rendering.
+  syllables = sum(
+    1
+    for index, char in enumerate(word)
+    if char in VOWELS and (index == 0 or word[index - 1] not in VOWELS)
+  )
+  if (
+    syllables == 1
+    and word[-1] not in f"{VOWELS}wxy"
+    and word[-2] in VOWELS
+    and word[-3] not in VOWELS
+  ):
+    return f"{word}{word[-1]}ing"
+  return f"{word}ing"
+
+
+def keyword_forms(keyword: str) -> List[str]:
+  # Keywords are matched word for word, so "logos", "renders" and "drawing"
+  # need forms of their own. Multi-word keywords only get the plural of their
+  # last word ("landing pages"). Guessed by spelling rules; the odd non-word
+  # this produces for nouns ("logoing") never matches anything.
+  words = keyword.split()
+  last = words[-1] if words else ""
+  if len(last) < 3 or not last.isalpha():
+    return [keyword]
+  stem = " ".join(words[:-1] + [""])
+  forms = [keyword, f"{stem}{_plural(last)}"]
+  if len(words) == 1:
+    forms.append(_progressive(last))
+  return forms
+
+
+def load_vocabulary(path: Union[str, Path], defaults: Vocabulary) -> Vocabulary:
+  with Path(path).open(encoding="utf-8") as handle:
+    data = json.load(handle)
+  if not isinstance(data, dict):
+    raise ValueError("vocabulary config must be a JSON object")
+  return parse_vocabulary(data, defaults)
+
+
+class VocabularyReloader:
+  # `apply` compiles a new vocabulary on a worker thread and must publish it
+  # with a single assignment, so in-flight requests finish on the tables they
+  # started with. It returns whether anything was swapped; only then does
+  # `on_applied` run on the event loop. A file that fails to parse or compile
+  # is logged and the active vocabulary stays in place.
+  def __init__(
+    self,
+    path: str,
+    defaults: Vocabulary,
+    apply: Callable[[Vocabulary], bool],
+    on_applied: Optional[Callable[[Vocabulary], None]] = None,
+    poll_seconds: float = 5.0,
+  ) -> None:
+    self.path = path
+    self.defaults = defaults
+    self.apply = apply
+    self.on_applied = on_applied
+    self.poll_seconds = max(0.1, poll_seconds)
+    self.version: Optional[str] = None
+    self.loaded_at: Optional[float] = None
+    self.reloads = 0
+    self.failures = 0
+    self.last_error: Optional[str] = None
+    self._signature: Optional[Tuple[int, int]] = None
+    self._task: Optional["asyncio.Task[None]"] = None
+
+  def _stat(self) -> Optional[Tuple[int, int]]:
+    try:
+      stat = os.stat(self.path)
+    except OSError:
+      return None
+    return stat.st_mtime_ns, stat.st_size
+
+  def _load_and_apply(self) -> Tuple[Vocabulary, bool]:
+    vocabulary = load_vocabulary(self.path, self.defaults)
+    return vocabulary, self.apply(vocabulary)
+
+  def load(self) -> None:
+    self._signature = self._stat()
+    self._applied(*self._load_and_apply())
+
+  async def check(self) -> bool:
+    signature = self._stat()
+    if signature is None or signature == self._signature:
+      return False
+    self._signature = signature
+
+    loop = asyncio.get_running_loop()
+    try:
+      vocabulary, changed = await loop.run_in_executor(None, self._load_and_apply)
+    except Exception as exc:
+      self.failures += 1
+      self.last_error = f"{type(exc).__name__}: {exc}"
+      logger.error("Keeping vocabulary %s, failed to load %s: %s", self.version, self.path, exc)
+      return False
+    self._applied(vocabulary, changed)
+    if not changed:
+      return False
+    self.reloads += 1
+    logger.info("Swapped in vocabulary %s from %s", vocabulary.version, self.path)
+    return True
+
+  def _applied(self, vocabulary: Vocabulary, changed: bool) -> None:
+    self.version = vocabulary.version
+    self.loaded_at = time.time()
+    self.last_error = None
+    if changed and self.on_applied is not None:
+      self.on_applied(vocabulary)
+
+  async def _run(self) -> None:
+    while True:
+      await asyncio.sleep(self.poll_seconds)
+      await self.check()
+
+  def start(self) -> None:
+    if self._task is None:
+      self._task = asyncio.get_running_loop().create_task(self._run())
+
+  async def stop(self) -> None:
+    if self._task is not None:
+      self._task.cancel()
+      try:
+        await self._task
+      except asyncio.CancelledError:
+        pass
+      self._task = None
+
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "path": self.path,
+      "version": self.version,
+      "loadedAt": self.loaded_at,
+      "reloads": self.reloads,
+      "failures": self.failures,
+      "lastError": self.last_error,
+    }
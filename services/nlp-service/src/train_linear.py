@@ -0,0 +1,94 @@
+import argparse
+import json
+import logging
+import random
+from collections import Counter
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from .services.linear_scorer import LinearIntentScorer, build_vectorizer
+
+
+logger = logging.getLogger("aio-nlp-service.train")
+
+
+def read_examples(path: Path) -> List[Tuple[str, str]]:
+  examples: List[Tuple[str, str]] = []
+  with path.open(encoding="utf-8") as handle:
+    for line_number, line in enumerate(handle, start=1):
+      if not line.strip():
+        continue
+      record = json.loads(line)
+      message, intent = record.get("message"), record.get("intent")
+      if not message or not intent:
+        raise ValueError(f"{path}:{line_number}: expected 'message' and 'intent' fields")
+      examples.append((message, intent))
+  return examples
+
+
+def train(
+  examples: List[Tuple[str, str]], n_features: int, ngram_range: Tuple[int, int], c: float
+) -> LinearIntentScorer:
+  messages = [message for message, _ in examples]
+  labels = [intent for _, intent in examples]
+  vectorizer = build_vectorizer(n_features, ngram_range)
+  model = LogisticRegression(C=c, max_iter=1000)
+  model.fit(vectorizer.transform(messages), labels)
+
+  intents = [str(intent) for intent in model.classes_]
+  coef = model.coef_
+  intercept = model.intercept_
+  if len(intents) == 2:
+    # Binary models expose a single decision row; expand it to one column per
+    # intent so scoring is the same softmax as the multi-class case.
+    coef = np.vstack([-coef[0] / 2, coef[0] / 2])
+    intercept = np.array([-intercept[0] / 2, intercept[0] / 2])
+
+  return LinearIntentScorer(
+    intents=intents,
+    weights=coef.T.astype(np.float32),
+    bias=intercept.astype(np.float32),
+    n_features=n_features,
+    ngram_range=ngram_range,
+  )
+
+
+def accuracy(scorer: LinearIntentScorer, examples: List[Tuple[str, str]]) -> float:
+  if not examples:
+    return 0.0
+  scores = scorer.score_texts([message for message, _ in examples])
+  predicted = [scorer.intents[index] for index in scores.argmax(axis=1)]
+  correct = sum(1 for guess, (_, intent) in zip(predicted, examples) if guess == intent)
+  return correct / len(examples)
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Train the linear intent scorer from labelled JSONL")
+  parser.add_argument("--input", required=True, type=Path, help="JSONL with message and intent fields")
+  parser.add_argument("--output", required=True, type=Path, help="path of the .npz model to write")
+  parser.add_argument("--n-features", type=int, default=2**16)
+  parser.add_argument("--max-ngram", type=int, default=2)
+  parser.add_argument("--c", type=float, default=4.0, help="inverse regularisation strength")
+  parser.add_argument("--holdout", type=float, default=0.1, help="fraction kept back for evaluation")
+  parser.add_argument("--seed", type=int, default=13)
+  args = parser.parse_args()
+
+  logging.basicConfig(level=logging.INFO)
+  examples = read_examples(args.input)
+  random.Random(args.seed).shuffle(examples)
+  holdout_size = int(len(examples) * args.holdout)
+  evaluation, training = examples[:holdout_size], examples[holdout_size:]
+
+  logger.info("Training on %s examples: %s", len(training), dict(Counter(i for _, i in training)))
+  scorer = train(training, args.n_features, (1, args.max_ngram), args.c)
+  scorer.save(args.output)
+  logger.info("Wrote %s intents to %s", len(scorer.intents), args.output)
+  if evaluation:
+    logger.info("Holdout accuracy: %.3f on %s examples", accuracy(scorer, evaluation), len(evaluation))
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,8 @@
+import pytest
+
+from src.services.intent_classifier import IntentClassifier
+
+
+@pytest.fixture(scope="session")
+def classifier() -> IntentClassifier:
+  return IntentClassifier()
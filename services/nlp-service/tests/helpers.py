@@ -0,0 +1,12 @@
+from typing import Any, Dict, Optional
+
+from src.models import IntentData, RouteInfo
+
+
+def intent_data(intent: str = "graphics", metadata: Optional[Dict[str, Any]] = None) -> IntentData:
+  return IntentData(
+    intent=intent,
+    confidence=0.9,
+    route=RouteInfo(service=f"{intent}-service", endpoint="/canvas"),
+    metadata=dict(metadata or {"processingTimeMs": 1.0}),
+  )
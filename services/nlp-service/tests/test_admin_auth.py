@@ -0,0 +1,30 @@
+import dataclasses
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import main
+
+
+@pytest.fixture
+def client(monkeypatch):
+  monkeypatch.setattr(main, "settings", dataclasses.replace(main.settings, admin_token="s3cret"))
+  return TestClient(main.app)
+
+
+@pytest.mark.parametrize(
+  "token",
+  ["wrong", "s3crét".encode("latin-1"), "ключ".encode("utf-8")],
+)
+def test_bad_admin_token_is_rejected(client, token):
+  response = client.get("/api/v1/nlp/admin/model", headers={"X-Admin-Token": token})
+  assert response.status_code == 401
+
+
+def test_missing_admin_token_is_rejected(client):
+  assert client.get("/api/v1/nlp/admin/model").status_code == 401
+
+
+def test_valid_admin_token_is_accepted(client):
+  response = client.get("/api/v1/nlp/admin/model", headers={"X-Admin-Token": "s3cret"})
+  assert response.status_code == 200
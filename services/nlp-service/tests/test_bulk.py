@@ -0,0 +1,80 @@
+import json
+import logging
+
+import pytest
+
+from src import bulk
+
+
+def _write_lines(path, lines):
+  path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_non_object_lines_are_skipped_with_a_warning(tmp_path, caplog):
+  source = tmp_path / "chat.jsonl"
+  _write_lines(
+    source,
+    [
+      json.dumps({"id": "a", "message": "draw a logo"}),
+      "[1, 2]",
+      '"just a string"',
+      "not json",
+      json.dumps({"id": "b", "message": "   "}),
+      json.dumps({"message": "build a website"}),
+    ],
+  )
+  with caplog.at_level(logging.WARNING, logger="aio-nlp-service.bulk"):
+    records = list(bulk.read_records(source, "jsonl"))
+
+  assert [(line, record_id, request.message) for line, record_id, request in records] == [
+    (1, "a", "draw a logo"),
+    (6, None, "build a website"),
+  ]
+  assert sum("expected a JSON object" in message for message in caplog.messages) == 2
+
+
+def test_parquet_output_is_written_chunk_by_chunk(tmp_path):
+  pq = pytest.importorskip("pyarrow.parquet")
+  source = tmp_path / "chat.jsonl"
+  messages = ["draw a logo", "[1]", "build a website", "fix the bug in my script", "hello there"]
+  _write_lines(
+    source,
+    [
+      message if message.startswith("[") else json.dumps({"id": str(index), "message": message})
+      for index, message in enumerate(messages)
+    ],
+  )
+  output = tmp_path / "out.parquet"
+  report = bulk.run(source, output, "jsonl", "parquet", workers=1, chunk_size=2, threshold=None)
+
+  parquet = pq.ParquetFile(output)
+  assert report["messages"] == 4
+  assert parquet.metadata.num_row_groups == 2
+  table = parquet.read()
+  assert table.column("line").to_pylist() == [1, 3, 4, 5]
+  assert table.column("id").to_pylist() == ["0", "2", "3", "4"]
+
+
+def test_vocabulary_file_is_applied(tmp_path):
+  vocabulary = tmp_path / "vocabulary.json"
+  vocabulary.write_text(
+    json.dumps({"version": "bulk-test", "intents": {"video": ["storyboard"]}}), encoding="utf-8"
+  )
+  source = tmp_path / "chat.jsonl"
+  _write_lines(source, [json.dumps({"message": "storyboard storyboard"})])
+  output = tmp_path / "out.jsonl"
+  report = bulk.run(
+    source,
+    output,
+    "jsonl",
+    "jsonl",
+    workers=1,
+    chunk_size=8,
+    threshold=0.0,
+    vocabulary_path=str(vocabulary),
+  )
+
+  assert report["vocabularyVersion"] == "bulk-test"
+  row = json.loads(output.read_text(encoding="utf-8"))
+  assert row["data"]["intent"] == "video"
+  assert row["data"]["keywords"] == ["storyboard"]
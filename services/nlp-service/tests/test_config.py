@@ -0,0 +1,16 @@
+import dataclasses
+
+import pytest
+
+from src.config import settings
+
+
+@pytest.mark.parametrize("field", ["max_batch_items", "stream_chunk_size"])
+def test_limits_larger_than_max_in_flight_are_refused(field):
+  with pytest.raises(ValueError, match="NLP_MAX_IN_FLIGHT=8"):
+    dataclasses.replace(settings, max_in_flight=8, **{field: 9})
+
+
+def test_limits_up_to_max_in_flight_are_accepted():
+  limited = dataclasses.replace(settings, max_in_flight=8, max_batch_items=8, stream_chunk_size=8)
+  assert limited.max_in_flight == 8
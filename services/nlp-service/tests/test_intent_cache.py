@@ -0,0 +1,46 @@
+import time
+
+from src.services.context_manager import ContextSnapshot
+from src.services.intent_cache import IntentCache, reuse_result
+
+from .helpers import intent_data
+
+
+def test_key_ignores_case_whitespace_and_unread_context():
+  first = IntentCache.key("Draw  a Logo", ContextSnapshot(recent_messages=["hi"]))
+  second = IntentCache.key("draw a logo", ContextSnapshot())
+  assert first == second
+  assert IntentCache.key("draw a logo", ContextSnapshot(active_tool="ide")) != second
+
+
+def test_hit_marks_result_and_drops_stage_timings():
+  cache = IntentCache(max_entries=10, ttl_seconds=60)
+  key = IntentCache.key("draw a logo", ContextSnapshot())
+  cache.put(key, intent_data(metadata={"processingTimeMs": 5.0, "stagesMs": {"build": 1.0}}))
+
+  hit = cache.get(key, ContextSnapshot(artifacts=[{"id": "a", "tool": "graphics"}]), time.perf_counter())
+  assert hit is not None
+  assert hit.metadata["cacheHit"] is True
+  assert hit.metadata["appliedArtifacts"] == 1
+  assert "stagesMs" not in hit.metadata
+  assert cache.stats()["hits"] == 1
+
+
+def test_expired_entries_miss():
+  cache = IntentCache(max_entries=10, ttl_seconds=0)
+  key = IntentCache.key("draw", ContextSnapshot())
+  cache.put(key, intent_data())
+  assert cache.get(key, ContextSnapshot(), time.perf_counter()) is None
+  assert cache.stats()["expirations"] == 1
+
+
+def test_evicts_least_recently_used():
+  cache = IntentCache(max_entries=2, ttl_seconds=60)
+  keys = [IntentCache.key(message, ContextSnapshot()) for message in ("a", "b", "c")]
+  cache.put(keys[0], intent_data())
+  cache.put(keys[1], intent_data())
+  cache.get(keys[0], ContextSnapshot(), time.perf_counter())
+  cache.put(keys[2], intent_data())
+  assert cache.get(keys[1], ContextSnapshot(), time.perf_counter()) is None
+  assert cache.get(keys[0], ContextSnapshot(), time.perf_counter()) is not None
+
@@ -0,0 +1,86 @@
+import pytest
+
+from src.services.context_manager import ContextSnapshot
+
+
+@pytest.mark.parametrize("fast_path", [True, False])
+@pytest.mark.parametrize(
+  "message, keyword, entity",
+  [
+    ("start a new blank canvas", None, ("color", "black")),
+    ("share the design with my team", "shape", None),
+    ("write code for a parser", None, ("color", "white")),
+    ("greet the reader", "render", ("color", "green")),
+  ],
+)
+def test_english_words_are_not_rewritten_into_vocabulary(classifier, fast_path, message, keyword, entity):
+  classifier.fast_path_enabled = fast_path
+  try:
+    result = classifier.classify(message, ContextSnapshot())
+  finally:
+    classifier.fast_path_enabled = True
+  assert "corrections" not in result.metadata
+  if keyword is not None:
+    assert keyword not in result.keywords
+  if entity is not None:
+    assert result.entities.get(entity[0]) != entity[1]
+
+
+@pytest.mark.parametrize("fast_path", [True, False])
+def test_corrected_terms_still_match_but_entities_keep_the_users_text(classifier, fast_path):
+  classifier.fast_path_enabled = fast_path
+  try:
+    result = classifier.classify("make the websiet background blakc", ContextSnapshot())
+  finally:
+    classifier.fast_path_enabled = True
+  assert result.metadata["corrections"] == {"websiet": "website", "blakc": "black"}
+  assert "website" in result.keywords
+  assert result.entities["color"] == "blakc"
+
+
+@pytest.mark.parametrize(
+  "message",
+  [
+    "landing-page for my e-shop",
+    "draw_logo canvas",
+    "export logo.png for the website",
+    "draw a logo, please",
+    "build a landing page for my bakery",
+    "it's a bug in my script",
+  ],
+)
+def test_fast_path_agrees_with_the_spacy_path(classifier, message):
+  fast = classifier.classify(message, ContextSnapshot())
+  classifier.fast_path_enabled = False
+  try:
+    full = classifier.classify(message, ContextSnapshot())
+  finally:
+    classifier.fast_path_enabled = True
+  assert (fast.intent, fast.confidence, fast.keywords, fast.entities) == (
+    full.intent,
+    full.confidence,
+    full.keywords,
+    full.entities,
+  )
+
+
+@pytest.mark.parametrize("fast_path", [True, False])
+@pytest.mark.parametrize(
+  "message, keyword",
+  [
+    ("make some logos", "logo"),
+    ("edit my videos", "video"),
+    ("compare two websites", "website"),
+    ("i am drawing a cat", "draw"),
+    ("rendering the scene", "render"),
+    ("split it into functions", "function"),
+    ("add two landing pages", "landing page"),
+  ],
+)
+def test_inflected_forms_match_their_keyword(classifier, fast_path, message, keyword):
+  classifier.fast_path_enabled = fast_path
+  try:
+    result = classifier.classify(message, ContextSnapshot())
+  finally:
+    classifier.fast_path_enabled = True
+  assert keyword in result.keywords
@@ -0,0 +1,45 @@
+from src.services.keyword_automaton import KeywordAutomaton, split_words
+
+
+def _automaton() -> KeywordAutomaton:
+  automaton = KeywordAutomaton()
+  automaton.add("video", "video")
+  automaton.add("render video", "video")
+  automaton.add("render", "cad")
+  automaton.add("landing page", "web_designer")
+  return automaton.build()
+
+
+def test_reports_every_phrase_including_overlaps():
+  found = _automaton().search("Please RENDER video for the landing page")
+  assert sorted(found) == [
+    ("cad", "render"),
+    ("video", "render video"),
+    ("video", "video"),
+    ("web_designer", "landing page"),
+  ]
+
+
+def test_matches_whole_words_only():
+  assert _automaton().search("videos of landing pages") == []
+
+
+def test_round_trips_through_dict():
+  automaton = _automaton()
+  restored = KeywordAutomaton.from_dict(automaton.to_dict())
+  message = "render video on the landing page"
+  assert restored.search(message) == automaton.search(message)
+
+
+def test_split_words_lowercases():
+  assert split_words("Draw a LOGO, now!") == ["draw", "a", "logo", "now"]
+
+
+def test_alternate_forms_report_their_keyword():
+  automaton = KeywordAutomaton()
+  for form in ["logo", "logos"]:
+    automaton.add(form, "graphics", "logo")
+  assert automaton.build().search("two logos and a logo") == [
+    ("graphics", "logo"),
+    ("graphics", "logo"),
+  ]
@@ -0,0 +1,156 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import main
+from src.models import IntentData
+from src.services.context_manager import ContextSnapshot
+from src.services.intent_cache import IntentCache, reuse_result
+from src.services.intent_service import IntentService
+from src.services.latency_budget import StageCosts, parse_budget_ms, request_deadline
+from src.services.singleflight import SingleFlight
+
+from .helpers import intent_data
+
+
+def test_header_budget_wins_over_metadata():
+  before = time.monotonic()
+  deadline = request_deadline("50", {"deadlineMs": 5000})
+  assert deadline is not None and before + 0.04 < deadline < time.monotonic() + 0.05
+
+
+def test_metadata_budget_is_used_without_a_header():
+  before = time.monotonic()
+  deadline = request_deadline(None, {"deadlineMs": 200}, reserve_ms=100)
+  assert deadline is not None and before + 0.09 < deadline < time.monotonic() + 0.1
+
+
+def test_no_budget_means_no_deadline():
+  assert request_deadline(None, None) is None
+  assert request_deadline("", {"other": 1}) is None
+
+
+@pytest.mark.parametrize("value", ["soon", True, "nan", "inf", [5]])
+def test_invalid_budgets_are_rejected(value):
+  with pytest.raises(ValueError):
+    parse_budget_ms(value)
+
+
+def test_stage_costs_predict_whether_a_stage_fits():
+  costs = StageCosts(alpha=0.5)
+  costs.observe({"score": 0.010, "build": 0.002})
+  costs.observe({"score": 0.020})
+  assert costs.estimate("score") == pytest.approx(0.015)
+  assert costs.fits("score", None)
+  assert costs.fits("score", time.monotonic() + 1)
+  assert not costs.fits("score", time.monotonic() + 0.01)
+  assert costs.summary() == {"build": 2.0, "score": 15.0}
+
+
+def test_expired_deadline_skips_optional_stages(classifier):
+  message = "make the logo 512x512 in blue"
+  full = classifier.classify(message, ContextSnapshot())
+  degraded = classifier.classify(message, ContextSnapshot(deadline=time.monotonic() - 1))
+
+  assert "skippedStages" not in full.metadata
+  assert degraded.metadata["skippedStages"] == ["entities", "context"]
+  assert degraded.entities == {}
+  assert degraded.keywords == full.keywords == ["logo"]
+
+
+def test_reuse_reports_skipped_stages_only_to_deadline_callers():
+  result = intent_data(metadata={"skippedStages": []})
+  assert "skippedStages" not in reuse_result(result, ContextSnapshot(), 0.0, "sharedResult").metadata
+  deadline = ContextSnapshot(deadline=time.monotonic() + 1)
+  assert reuse_result(result, deadline, 0.0, "sharedResult").metadata["skippedStages"] == []
+
+
+class DegradingExecutor:
+  # Skips every optional stage for callers with a deadline.
+  def __init__(self) -> None:
+    self.calls: List[Optional[float]] = []
+
+  def fast_path(self, message: str, context: ContextSnapshot) -> Optional[IntentData]:
+    return None
+
+  @asynccontextmanager
+  async def slot(self, count: int = 1):
+    yield
+
+  async def classify(
+    self, message: str, context: ContextSnapshot, try_fast_path: bool = True
+  ) -> IntentData:
+    self.calls.append(context.deadline)
+    await asyncio.sleep(0.01)
+    skipped = ["entities", "context"] if context.deadline is not None else []
+    return intent_data(metadata={"skippedStages": skipped} if skipped else None)
+
+
+def test_degraded_results_are_not_cached():
+  executor = DegradingExecutor()
+  service = IntentService(
+    executor,  # type: ignore[arg-type]
+    cache=IntentCache(max_entries=10, ttl_seconds=60),
+  )
+
+  async def main():
+    await service.classify("draw", ContextSnapshot(deadline=time.monotonic() + 1))
+    await service.classify("draw", ContextSnapshot())
+    return await service.classify("draw", ContextSnapshot())
+
+  third = asyncio.run(main())
+  assert len(executor.calls) == 2
+  assert third.metadata["cacheHit"] is True
+
+
+def test_deadline_callers_never_share_with_full_budget_callers():
+  executor = DegradingExecutor()
+  service = IntentService(executor, singleflight=SingleFlight())  # type: ignore[arg-type]
+
+  async def main():
+    return await asyncio.gather(
+      service.classify("draw", ContextSnapshot(deadline=time.monotonic() + 1)),
+      service.classify("draw", ContextSnapshot()),
+      service.classify("draw", ContextSnapshot()),
+    )
+
+  degraded, full, shared = asyncio.run(main())
+  assert len(executor.calls) == 2
+  assert degraded.metadata["skippedStages"] == ["entities", "context"]
+  assert "skippedStages" not in full.metadata
+  assert "skippedStages" not in shared.metadata and shared.metadata["sharedResult"] is True
+
+
+@pytest.fixture
+def client():
+  return TestClient(main.app)
+
+
+def test_invalid_deadline_header_is_a_400(client):
+  response = client.post(
+    "/api/v1/nlp/intent",
+    json={"message": "draw a logo"},
+    headers={"X-Request-Deadline-Ms": "soon"},
+  )
+  assert response.status_code == 400
+
+
+def test_invalid_metadata_deadline_is_a_400(client):
+  response = client.post(
+    "/api/v1/nlp/intent", json={"message": "draw a logo", "metadata": {"deadlineMs": "soon"}}
+  )
+  assert response.status_code == 400
+
+
+def test_negative_budget_skips_optional_stages(client):
+  response = client.post(
+    "/api/v1/nlp/intent",
+    json={"message": "resize the poster to 640x480 now", "metadata": {"deadlineMs": 5000}},
+    headers={"X-Request-Deadline-Ms": "-1"},
+  )
+  assert response.status_code == 200
+  assert response.json()["data"]["metadata"]["skippedStages"] == ["entities", "context"]
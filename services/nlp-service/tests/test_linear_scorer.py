@@ -0,0 +1,66 @@
+import json
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.services.linear_scorer import LinearIntentScorer, build_vectorizer
+from src.train_linear import accuracy, read_examples, train
+
+
+EXAMPLES = [
+  ("draw a logo for my bakery", "graphics"),
+  ("design a poster in blue", "graphics"),
+  ("sketch a fox on the canvas", "graphics"),
+  ("fix the bug in my script", "ide"),
+  ("write a function that parses csv", "ide"),
+  ("compile and run the code", "ide"),
+  ("cut the clip at two minutes", "video"),
+  ("add a fade between clips", "video"),
+  ("export the video at 30 fps", "video"),
+]
+
+
+def test_train_save_load_score(tmp_path):
+  scorer = train(EXAMPLES, n_features=2**12, ngram_range=(1, 2), c=4.0)
+  path = tmp_path / "intent_linear.npz"
+  scorer.save(path)
+  loaded = LinearIntentScorer.load(path)
+
+  assert loaded.intents == ["graphics", "ide", "video"]
+  assert loaded.ngram_range == (1, 2)
+  texts = ["draw a fox logo", "the script has a bug", "trim the clip"]
+  scores = loaded.score_texts(texts)
+  np.testing.assert_allclose(scores, scorer.score_texts(texts), rtol=1e-6)
+  np.testing.assert_allclose(scores.sum(axis=1), 1.0, rtol=1e-5)
+  assert [loaded.intents[index] for index in scores.argmax(axis=1)] == ["graphics", "ide", "video"]
+  assert accuracy(loaded, EXAMPLES) == 1.0
+
+
+def test_binary_models_expand_to_one_column_per_intent():
+  examples = [example for example in EXAMPLES if example[1] != "video"]
+  scorer = train(examples, n_features=2**12, ngram_range=(1, 2), c=4.0)
+  assert scorer.weights.shape == (2**12, 2)
+  assert scorer.bias.shape == (2,)
+
+  messages = [message for message, _ in examples]
+  model = LogisticRegression(C=4.0, max_iter=1000)
+  model.fit(build_vectorizer(2**12, (1, 2)).transform(messages), [intent for _, intent in examples])
+  texts = ["draw a logo", "fix my code", "hello"]
+  expected = model.predict_proba(build_vectorizer(2**12, (1, 2)).transform(texts))
+  np.testing.assert_allclose(scorer.score_texts(texts), expected, rtol=1e-4)
+
+
+def test_weight_shape_must_match_intents():
+  with pytest.raises(ValueError, match="does not match"):
+    LinearIntentScorer(["a", "b"], np.zeros((8, 3)), np.zeros(2), n_features=8)
+
+
+def test_read_examples_requires_message_and_intent(tmp_path):
+  path = tmp_path / "examples.jsonl"
+  path.write_text(
+    json.dumps({"message": "draw", "intent": "graphics"}) + "\n\n" + json.dumps({"message": "x"}),
+    encoding="utf-8",
+  )
+  with pytest.raises(ValueError, match=":3:"):
+    read_examples(path)
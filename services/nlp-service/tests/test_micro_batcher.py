@@ -0,0 +1,133 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional, Sequence
+
+from src.models import IntentData
+from src.services.context_manager import ContextSnapshot
+from src.services.intent_service import IntentService
+from src.services.micro_batcher import MicroBatcher
+
+from .helpers import intent_data
+
+
+class FakeExecutor:
+  def __init__(self, workers: int = 1, delay: float = 0.01) -> None:
+    self.workers = workers
+    self.delay = delay
+    self.batches: List[List[str]] = []
+
+  def fast_path(self, message: str, context: ContextSnapshot) -> Optional[IntentData]:
+    return intent_data(metadata={"path": "fast"}) if message.startswith("fast") else None
+
+  @asynccontextmanager
+  async def slot(self, count: int = 1):
+    yield
+
+  async def classify_batch(
+    self,
+    messages: Sequence[str],
+    contexts: Sequence[ContextSnapshot],
+    try_fast_path: bool = True,
+  ) -> List[IntentData]:
+    self.batches.append(list(messages))
+    await asyncio.sleep(self.delay)
+    return [intent_data(metadata={"message": message}) for message in messages]
+
+
+def test_idle_executor_sends_a_request_without_waiting():
+  async def main():
+    executor = FakeExecutor(delay=0)
+    batcher = MicroBatcher(executor, max_size=32)  # type: ignore[arg-type]
+    started = time.perf_counter()
+    result = await batcher.submit("draw", ContextSnapshot())
+    return executor, result, time.perf_counter() - started
+
+  executor, result, elapsed = asyncio.run(main())
+  assert executor.batches == [["draw"]]
+  assert result.metadata["message"] == "draw"
+  assert elapsed < 0.005
+
+
+def test_requests_arriving_while_busy_go_out_together():
+  async def main():
+    executor = FakeExecutor(workers=1)
+    batcher = MicroBatcher(executor, max_size=32)  # type: ignore[arg-type]
+    first = asyncio.ensure_future(batcher.submit("a", ContextSnapshot()))
+    await asyncio.sleep(0)
+    rest = [batcher.submit(message, ContextSnapshot()) for message in "bcd"]
+    results = await asyncio.gather(first, *rest)
+    return executor, results
+
+  executor, results = asyncio.run(main())
+  assert executor.batches == [["a"], ["b", "c", "d"]]
+  assert [result.metadata["message"] for result in results] == ["a", "b", "c", "d"]
+
+
+def test_each_idle_worker_gets_its_own_batch():
+  async def main():
+    executor = FakeExecutor(workers=2)
+    batcher = MicroBatcher(executor, max_size=32)  # type: ignore[arg-type]
+    await asyncio.gather(*(batcher.submit(message, ContextSnapshot()) for message in "abcd"))
+    return executor
+
+  assert asyncio.run(main()).batches == [["a"], ["b"], ["c", "d"]]
+
+
+def test_batches_are_capped_at_max_size():
+  async def main():
+    executor = FakeExecutor(workers=1)
+    batcher = MicroBatcher(executor, max_size=2)  # type: ignore[arg-type]
+    await asyncio.gather(*(batcher.submit(message, ContextSnapshot()) for message in "abcde"))
+    return executor
+
+  batches = asyncio.run(main()).batches
+  assert batches[0] == ["a"]
+  assert all(len(batch) <= 2 for batch in batches)
+  assert sorted(message for batch in batches for message in batch) == list("abcde")
+
+
+def test_fast_path_answers_skip_the_batcher():
+  async def main():
+    executor = FakeExecutor(workers=1)
+    service = IntentService(
+      executor,  # type: ignore[arg-type]
+      micro_batcher=MicroBatcher(executor, max_size=32),  # type: ignore[arg-type]
+    )
+    slow = asyncio.ensure_future(service.classify("slow", ContextSnapshot()))
+    await asyncio.sleep(0)
+    fast = await service.classify("fast one", ContextSnapshot())
+    return executor, fast, slow.done(), await slow
+
+  executor, fast, slow_done_before_fast, _ = asyncio.run(main())
+  assert fast.metadata["path"] == "fast"
+  assert not slow_done_before_fast
+  assert executor.batches == [["slow"]]
+
+
+def test_window_holds_an_idle_request_for_companions():
+  async def main():
+    executor = FakeExecutor(workers=1, delay=0)
+    batcher = MicroBatcher(executor, max_size=32, window_ms=20)  # type: ignore[arg-type]
+    started = time.perf_counter()
+    first = asyncio.ensure_future(batcher.submit("a", ContextSnapshot()))
+    await asyncio.sleep(0.005)
+    await asyncio.gather(first, *(batcher.submit(message, ContextSnapshot()) for message in "bc"))
+    return executor, time.perf_counter() - started
+
+  executor, elapsed = asyncio.run(main())
+  assert executor.batches == [["a", "b", "c"]]
+  assert 0.015 <= elapsed < 0.2
+
+
+def test_window_is_cut_short_by_a_full_batch():
+  async def main():
+    executor = FakeExecutor(workers=1, delay=0)
+    batcher = MicroBatcher(executor, max_size=2, window_ms=1000)  # type: ignore[arg-type]
+    started = time.perf_counter()
+    await asyncio.gather(*(batcher.submit(message, ContextSnapshot()) for message in "ab"))
+    return executor, time.perf_counter() - started
+
+  executor, elapsed = asyncio.run(main())
+  assert executor.batches == [["a", "b"]]
+  assert elapsed < 0.5
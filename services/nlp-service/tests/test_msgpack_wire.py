@@ -0,0 +1,89 @@
+import msgpack
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from src import main
+from src.services.msgpack_wire import MSGPACK_MEDIA_TYPE, wants_msgpack
+
+
+def _request(accept):
+  headers = [] if accept is None else [(b"accept", accept.encode())]
+  return Request({"type": "http", "method": "POST", "path": "/", "headers": headers})
+
+
+@pytest.mark.parametrize(
+  "accept, expected",
+  [
+    (None, False),
+    ("*/*", False),
+    ("application/json", False),
+    ("application/msgpack", True),
+    ("application/x-msgpack", True),
+    ("application/json, application/msgpack", True),
+    ("application/json;q=0.9, application/msgpack", True),
+    ("application/json, application/msgpack;q=0.5", False),
+    ("application/msgpack;q=0, */*", False),
+    ("application/msgpack;q=oops", False),
+    ("*/*;q=0.1, Application/MsgPack; charset=binary", True),
+  ],
+)
+def test_accept_negotiation(accept, expected):
+  assert wants_msgpack(_request(accept)) is expected
+
+
+@pytest.fixture
+def client():
+  return TestClient(main.app)
+
+
+def test_msgpack_request_and_response(client):
+  response = client.post(
+    "/api/v1/nlp/intent",
+    content=msgpack.packb({"message": "draw a logo", "activeTool": "graphics"}),
+    headers={"Content-Type": MSGPACK_MEDIA_TYPE, "Accept": MSGPACK_MEDIA_TYPE},
+  )
+  assert response.status_code == 200
+  assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+  body = msgpack.unpackb(response.content, raw=False)
+  assert body["success"] is True
+  assert body["data"]["keywords"] == ["draw", "logo"]
+
+
+def test_msgpack_batch_request(client):
+  response = client.post(
+    "/api/v1/nlp/intent:batch",
+    content=msgpack.packb({"items": [{"message": "draw a logo"}, {"message": "fix the bug"}]}),
+    headers={"Content-Type": "application/x-msgpack", "Accept": MSGPACK_MEDIA_TYPE},
+  )
+  assert response.status_code == 200
+  assert len(msgpack.unpackb(response.content, raw=False)["data"]) == 2
+
+
+def test_msgpack_request_falls_back_to_json_response(client):
+  response = client.post(
+    "/api/v1/nlp/intent",
+    content=msgpack.packb({"message": "draw a logo"}),
+    headers={"Content-Type": MSGPACK_MEDIA_TYPE, "Accept": "application/json, */*"},
+  )
+  assert response.status_code == 200
+  assert response.headers["content-type"].startswith("application/json")
+  assert response.json()["data"]["keywords"] == ["draw", "logo"]
+
+
+def test_malformed_msgpack_body_is_a_400(client):
+  response = client.post(
+    "/api/v1/nlp/intent",
+    content=b"\xc1\xff\x00",
+    headers={"Content-Type": MSGPACK_MEDIA_TYPE},
+  )
+  assert response.status_code == 400
+
+
+def test_msgpack_body_is_validated_like_json(client):
+  response = client.post(
+    "/api/v1/nlp/intent",
+    content=msgpack.packb({"activeTool": "graphics"}),
+    headers={"Content-Type": MSGPACK_MEDIA_TYPE},
+  )
+  assert response.status_code == 422
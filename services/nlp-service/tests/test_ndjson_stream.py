@@ -0,0 +1,110 @@
+import asyncio
+import json
+from typing import AsyncIterator, List, Sequence
+
+from fastapi.testclient import TestClient
+
+from src import main
+from src.models import IntentData
+from src.services.context_manager import ContextManager, ContextSnapshot
+from src.services.ndjson_stream import NdjsonClassifier, iter_lines
+
+from .helpers import intent_data
+
+
+async def _chunks(*parts: bytes) -> AsyncIterator[bytes]:
+  for part in parts:
+    yield part
+
+
+def _lines(*parts: bytes, max_line_bytes: int = 100):
+  async def collect():
+    return [item async for item in iter_lines(_chunks(*parts), max_line_bytes)]
+
+  return asyncio.run(collect())
+
+
+def test_lines_are_split_across_chunk_boundaries():
+  assert _lines(b'{"a"', b":1}\n\n{", b'"b":2}\n{"c":3}') == [
+    (1, b'{"a":1}'),
+    (3, b'{"b":2}'),
+    (4, b'{"c":3}'),
+  ]
+
+
+def test_oversized_lines_are_reported_without_being_buffered():
+  assert _lines(b"ok\n" + b"x" * 8, b"x" * 8, b"x" * 8 + b"\nfine\n", max_line_bytes=10) == [
+    (1, b"ok"),
+    (2, None),
+    (3, b"fine"),
+  ]
+  assert _lines(b"ok\n", b"y" * 11, max_line_bytes=10) == [(1, b"ok"), (2, None)]
+  assert _lines(b"y" * 10 + b"\n", max_line_bytes=10) == [(1, b"y" * 10)]
+
+
+class RecordingService:
+  def __init__(self) -> None:
+    self.batches: List[List[str]] = []
+
+  async def classify_many(
+    self, messages: Sequence[str], contexts: Sequence[ContextSnapshot], use_cache: bool = True
+  ) -> List[IntentData]:
+    self.batches.append(list(messages))
+    return [intent_data(metadata={"message": message}) for message in messages]
+
+
+def _stream(body: bytes, chunk_size: int) -> List[dict]:
+  service = RecordingService()
+  classifier = NdjsonClassifier(
+    ContextManager(max_history=10),
+    service,  # type: ignore[arg-type]
+    chunk_size=chunk_size,
+    max_line_bytes=200,
+  )
+
+  async def collect():
+    return [record async for record in classifier.stream(_chunks(body))]
+
+  return [json.loads(record) for record in asyncio.run(collect())]
+
+
+def test_records_keep_input_order_around_bad_lines():
+  body = b"\n".join(
+    [
+      b"not json",
+      json.dumps({"message": "draw a logo"}).encode(),
+      json.dumps({"message": "  "}).encode(),
+      json.dumps({"message": "build a website"}).encode(),
+      json.dumps({"message": "x" * 300}).encode(),
+      json.dumps({"message": "fix the bug"}).encode(),
+    ]
+  )
+  records = _stream(body, chunk_size=2)
+  assert [record["line"] for record in records] == [1, 2, 3, 4, 5, 6]
+  assert [record["success"] for record in records] == [False, True, False, True, False, True]
+  assert records[4]["error"] == "line exceeds 200 bytes"
+  assert [records[index]["data"]["metadata"]["message"] for index in (1, 3, 5)] == [
+    "draw a logo",
+    "build a website",
+    "fix the bug",
+  ]
+
+
+def test_stream_endpoint_classifies_each_line():
+  body = "\n".join(
+    [json.dumps({"message": "draw a logo"}), "{", json.dumps({"message": "build a website"})]
+  )
+  response = TestClient(main.app).post(
+    "/api/v1/nlp/intent:stream",
+    content=body,
+    headers={"Content-Type": "application/x-ndjson"},
+  )
+  assert response.status_code == 200
+  assert response.headers["content-type"].startswith("application/x-ndjson")
+  records = [json.loads(line) for line in response.text.splitlines()]
+  assert [(record["line"], record["success"]) for record in records] == [
+    (1, True),
+    (2, False),
+    (3, True),
+  ]
+  assert records[0]["data"]["keywords"] == ["draw", "logo"]
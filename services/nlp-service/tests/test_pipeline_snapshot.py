@@ -0,0 +1,50 @@
+import dataclasses
+import json
+
+import pytest
+import spacy
+
+from src.config import settings
+from src.services import intent_classifier
+from src.services.intent_classifier import DEFAULT_VOCABULARY
+from src.services.keyword_automaton import KeywordAutomaton
+from src.services.pipeline_snapshot import MANIFEST_FILE, read_snapshot, write_snapshot
+
+
+def _write(path):
+  automaton = KeywordAutomaton()
+  automaton.add("logos", "graphics", "logo")
+  write_snapshot(
+    path,
+    model_name="blank",
+    pipeline_profile="minimal",
+    nlp=spacy.blank("en"),
+    vocabulary=DEFAULT_VOCABULARY,
+    automaton=automaton.build(),
+  )
+
+
+def test_snapshot_round_trips_its_automaton(tmp_path):
+  _write(tmp_path / "snapshot")
+  snapshot = read_snapshot(tmp_path / "snapshot", DEFAULT_VOCABULARY)
+  assert snapshot.automaton is not None
+  assert snapshot.automaton.search("logos") == [("graphics", "logo")]
+
+
+def test_automaton_from_an_older_format_is_dropped(tmp_path):
+  _write(tmp_path / "snapshot")
+  manifest_path = tmp_path / "snapshot" / MANIFEST_FILE
+  manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+  del manifest["automatonFormat"]
+  manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+  assert read_snapshot(tmp_path / "snapshot", DEFAULT_VOCABULARY).automaton is None
+
+
+def test_strict_classifier_refuses_a_missing_model(monkeypatch):
+  monkeypatch.setattr(
+    intent_classifier, "settings", dataclasses.replace(settings, model_name="no_such_model")
+  )
+  with pytest.raises(OSError):
+    intent_classifier.IntentClassifier(strict=True)
+  assert intent_classifier.IntentClassifier().state.nlp.pipe_names == []
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+import spacy
+
+from src.services.semantic_router import SemanticRouter
+
+
+EXAMPLES = {
+  "graphics": ["draw logo", "paint icon"],
+  "video": ["cut clip", "trim footage"],
+  "chat": [],
+}
+
+VECTORS = {
+  "draw": [1.0, 0.1, 0.0],
+  "logo": [0.9, 0.0, 0.1],
+  "paint": [1.0, 0.0, 0.0],
+  "icon": [0.8, 0.2, 0.0],
+  "cut": [0.0, 1.0, 0.1],
+  "clip": [0.1, 0.9, 0.0],
+  "trim": [0.0, 1.0, 0.0],
+  "footage": [0.0, 0.8, 0.2],
+  "the": [0.0, 0.0, 0.0],
+}
+
+
+@pytest.fixture()
+def router():
+  nlp = spacy.blank("en")
+  for word, vector in VECTORS.items():
+    nlp.vocab.set_vector(word, np.asarray(vector, dtype=np.float32))
+  return SemanticRouter(nlp, EXAMPLES, similarity_floor=0.35)
+
+
+def scores_for(router, *texts):
+  return router.score_docs([router.nlp.make_doc(text) for text in texts])
+
+
+def test_intents_without_examples_are_skipped(router):
+  assert router.intents == ["graphics", "video"]
+  np.testing.assert_allclose(np.linalg.norm(router.centroids, axis=1), 1.0, rtol=1e-6)
+
+
+def test_routes_to_nearest_centroid(router):
+  scores = scores_for(router, "draw an icon", "Trim the clip")
+  assert [router.intents[index] for index in scores.argmax(axis=1)] == ["graphics", "video"]
+  assert scores[0, 0] > 0.9
+  assert scores[0, 1] == 0.0
+
+
+def test_unknown_words_score_zero(router):
+  scores = scores_for(router, "hello there friend", "")
+  np.testing.assert_array_equal(scores, np.zeros((2, 2), dtype=np.float32))
+
+
+def test_zero_vectors_do_not_produce_nan(router):
+  encoded = router.encode([router.nlp.make_doc("the")])
+  np.testing.assert_array_equal(encoded, np.zeros((1, 3), dtype=np.float32))
+  scores = scores_for(router, "the", "the logo")
+  assert not np.isnan(scores).any()
+  np.testing.assert_array_equal(scores[0], [0.0, 0.0])
+  assert scores[1].argmax() == 0
+
+
+def test_requires_static_vectors():
+  with pytest.raises(ValueError, match="static word vectors"):
+    SemanticRouter(spacy.blank("en"), EXAMPLES)
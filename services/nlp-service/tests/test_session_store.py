@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from src.services.session_store import (
+  InMemorySessionStore,
+  SessionState,
+  SessionStore,
+  create_session_store,
+  merge_artifacts,
+)
+
+
+def test_append_turn_keeps_intent_counts_in_step_with_history():
+  state = SessionState()
+  for message, intent in [("a", "graphics"), ("b", "ide"), ("c", "graphics"), ("d", None)]:
+    state.append_turn(message, intent, max_history=2)
+  assert list(state.turns) == [("c", "graphics"), ("d", None)]
+  assert state.intent_counts == {"graphics": 1}
+
+
+def test_state_round_trips_through_json():
+  state = SessionState(active_tool="ide", artifacts=[{"id": "1", "tool": "ide", "name": "x"}])
+  state.append_turn("fix the bug", "ide", max_history=5)
+  restored = SessionState.from_json(state.to_json())
+  assert restored == state
+
+
+def test_merge_artifacts_replaces_by_id_and_keeps_the_latest():
+  existing = [{"id": "1", "tool": "a"}, {"id": "2", "tool": "b"}]
+  merged = merge_artifacts(existing, [{"id": "1", "tool": "c"}, {"id": "3", "tool": "d"}], limit=2)
+  assert merged == [{"id": "1", "tool": "c"}, {"id": "3", "tool": "d"}]
+
+
+def test_memory_store_expires_and_evicts():
+  async def main():
+    store = InMemorySessionStore(max_sessions=2, ttl_seconds=60)
+    for session_id in ("a", "b", "c"):
+      await store.put(session_id, SessionState())
+    evicted = await store.get("a")
+    kept = await store.get("c")
+    expiring = InMemorySessionStore(max_sessions=2, ttl_seconds=0)
+    await expiring.put("a", SessionState())
+    return evicted, kept, await expiring.get("a")
+
+  evicted, kept, expired = asyncio.run(main())
+  assert evicted is None
+  assert kept is not None
+  assert expired is None
+
+
+def test_memory_store_is_refused_for_multiple_workers():
+  with pytest.raises(ValueError, match="redis"):
+    create_session_store("memory", redis_url="", max_sessions=10, ttl_seconds=60, workers=4)
+  assert create_session_store("none", redis_url="", max_sessions=10, ttl_seconds=60, workers=4) is None
+
+
+def test_session_store_requires_get_and_put():
+  class Incomplete(SessionStore):
+    async def get(self, session_id):
+      return None
+
+  with pytest.raises(TypeError):
+    Incomplete()  # type: ignore[abstract]
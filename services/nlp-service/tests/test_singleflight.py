@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from src.services.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_the_leaders_result():
+  calls = 0
+
+  async def work() -> str:
+    nonlocal calls
+    calls += 1
+    await asyncio.sleep(0.01)
+    return "answer"
+
+  async def main():
+    flight: SingleFlight[str] = SingleFlight()
+    results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+    return flight, results
+
+  flight, results = asyncio.run(main())
+  assert calls == 1
+  assert [value for value, _ in results] == ["answer"] * 5
+  assert [shared for _, shared in results] == [False, True, True, True, True]
+  assert flight.stats() == {"inFlight": 0, "leaders": 1, "shared": 4}
+
+
+def test_different_keys_do_not_share():
+  async def main():
+    flight: SingleFlight[str] = SingleFlight()
+
+    async def work(value: str) -> str:
+      await asyncio.sleep(0.01)
+      return value
+
+    return await asyncio.gather(flight.do("a", lambda: work("a")), flight.do("b", lambda: work("b")))
+
+  assert asyncio.run(main()) == [("a", False), ("b", False)]
+
+
+def test_leader_error_reaches_every_caller_and_key_is_released():
+  async def fail() -> str:
+    await asyncio.sleep(0.01)
+    raise RuntimeError("boom")
+
+  async def main():
+    flight: SingleFlight[str] = SingleFlight()
+    results = await asyncio.gather(
+      flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+    )
+    retried = await flight.do("key", lambda: asyncio.sleep(0, result="ok"))
+    return results, retried
+
+  results, retried = asyncio.run(main())
+  assert all(isinstance(result, RuntimeError) for result in results)
+  assert retried == ("ok", False)
+
+
+def test_cancelled_leader_does_not_cancel_shared_callers():
+  async def main():
+    flight: SingleFlight[str] = SingleFlight()
+    leader = asyncio.ensure_future(flight.do("key", lambda: asyncio.sleep(0.02, result="done")))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do("key", lambda: asyncio.sleep(0, result="other")))
+    await asyncio.sleep(0)
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+      await leader
+    return await follower
+
+  assert asyncio.run(main()) == ("done", True)
@@ -0,0 +1,67 @@
+import random
+
+from src.services.typo_index import TypoIndex, within_one_edit
+
+
+def _osa_distance(left: str, right: str) -> int:
+  rows = [[0] * (len(right) + 1) for _ in range(len(left) + 1)]
+  for i in range(len(left) + 1):
+    rows[i][0] = i
+  for j in range(len(right) + 1):
+    rows[0][j] = j
+  for i in range(1, len(left) + 1):
+    for j in range(1, len(right) + 1):
+      cost = 0 if left[i - 1] == right[j - 1] else 1
+      rows[i][j] = min(rows[i - 1][j] + 1, rows[i][j - 1] + 1, rows[i - 1][j - 1] + cost)
+      if i > 1 and j > 1 and left[i - 1] == right[j - 2] and left[i - 2] == right[j - 1]:
+        rows[i][j] = min(rows[i][j], rows[i - 2][j - 2] + 1)
+  return rows[-1][-1]
+
+
+def test_within_one_edit_matches_osa_distance():
+  rng = random.Random(3)
+  for _ in range(5000):
+    left = "".join(rng.choice("abc") for _ in range(rng.randint(0, 5)))
+    right = "".join(rng.choice("abc") for _ in range(rng.randint(0, 5)))
+    assert within_one_edit(left, right) == (_osa_distance(left, right) <= 1), (left, right)
+
+
+def test_corrects_single_edit_typos():
+  index = TypoIndex(["website", "transition", "extrude", "timeline"])
+  assert index.correct_words(["my", "webiste", "trasnition", "extrdue", "timelin"]) == {
+    1: "website",
+    2: "transition",
+    3: "extrude",
+    4: "timeline",
+  }
+
+
+def test_leaves_short_known_and_ambiguous_words_alone():
+  index = TypoIndex(["model", "layer", "shape", "shade"])
+  assert index.correct("modl") is None  # shorter than min_length
+  assert index.correct("layer") is None  # already a keyword
+  assert index.correct("player") is None  # differs in the first letter
+  assert index.correct("shake") is None  # one edit from two keywords
+  assert index.correct("l4yer") is None  # not alphabetic
+
+
+# Everyday words one edit from a keyword or lexicon term, reported from
+# production traffic: none of them is a typo.
+ENGLISH_NEAR_MISSES = {
+  "write": "white",
+  "block": "black",
+  "blank": "black",
+  "share": "shape",
+  "shade": "shape",
+  "shame": "shape",
+  "modal": "model",
+  "modem": "model",
+  "reader": "render",
+  "greet": "green",
+}
+
+
+def test_real_english_words_are_never_corrected():
+  index = TypoIndex(set(ENGLISH_NEAR_MISSES.values()))
+  for word, keyword in ENGLISH_NEAR_MISSES.items():
+    assert index.correct(word) is None, f"{word} was corrected to {keyword}"
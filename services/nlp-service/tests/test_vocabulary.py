@@ -0,0 +1,77 @@
+import asyncio
+import json
+import os
+from dataclasses import replace
+
+import pytest
+
+from src.services.intent_classifier import DEFAULT_VOCABULARY, IntentClassifier
+from src.services.vocabulary import VocabularyReloader, dump_vocabulary, keyword_forms
+
+
+@pytest.mark.parametrize(
+  "keyword, forms",
+  [
+    ("logo", ["logo", "logos", "logoing"]),
+    ("mesh", ["mesh", "meshes", "meshing"]),
+    ("draw", ["draw", "draws", "drawing"]),
+    ("render", ["render", "renders", "rendering"]),
+    ("compile", ["compile", "compiles", "compiling"]),
+    ("clip", ["clip", "clips", "clipping"]),
+    ("landing page", ["landing page", "landing pages"]),
+    ("3d", ["3d"]),
+  ],
+)
+def test_keyword_forms(keyword, forms):
+  assert keyword_forms(keyword) == forms
+
+
+
+def write_vocabulary(path, version, mtime_ns):
+  data = dump_vocabulary(DEFAULT_VOCABULARY)
+  data["version"] = version
+  path.write_text(json.dumps(data), encoding="utf-8")
+  os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_use_vocabulary_reports_whether_state_was_swapped():
+  classifier = IntentClassifier()
+  before = classifier.state
+  assert classifier.use_vocabulary(before.vocabulary) is False
+  assert classifier.state is before
+
+  assert classifier.use_vocabulary(replace(before.vocabulary, version="2")) is True
+  assert classifier.state is not before
+  assert classifier.state.vocabulary.version == "2"
+
+
+def test_reloader_fires_on_applied_only_when_state_changes(tmp_path):
+  path = tmp_path / "vocabulary.json"
+  classifier = IntentClassifier()
+  applied = []
+  reloader = VocabularyReloader(
+    str(path), DEFAULT_VOCABULARY, apply=classifier.use_vocabulary, on_applied=applied.append
+  )
+
+  # Same content as the built-in vocabulary: nothing to swap.
+  write_vocabulary(path, DEFAULT_VOCABULARY.version, 1_000_000_000)
+  reloader.load()
+  assert applied == []
+  assert reloader.version == DEFAULT_VOCABULARY.version
+
+  async def scenario():
+    # Touched but unchanged.
+    write_vocabulary(path, DEFAULT_VOCABULARY.version, 2_000_000_000)
+    assert await reloader.check() is False
+    assert applied == []
+
+    write_vocabulary(path, "2", 3_000_000_000)
+    assert await reloader.check() is True
+    assert [vocabulary.version for vocabulary in applied] == ["2"]
+
+    # Unchanged mtime is not even re-read.
+    assert await reloader.check() is False
+
+  asyncio.run(scenario())
+  assert reloader.reloads == 1
+  assert reloader.version == "2"
@@ -0,0 +1,432 @@
+"""
+NLP Service Client
+Async client for nlp-service intent classification with pooled connections,
+automatic batching, retries and a local response cache
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+INTENT_PATH = "/api/v1/nlp/intent"
+BATCH_PATH = "/api/v1/nlp/intent:batch"
+
+# Shed (503), throttled (429) and gateway failures are worth another attempt
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+# nlp-service rejects batches above NLP_MAX_BATCH_ITEMS (256 by default)
+MAX_SERVER_BATCH_ITEMS = 256
+
+
+class NLPServiceError(Exception):
+    """Raised when nlp-service returns an error or cannot be reached"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class NLPServiceClient:
+    """
+    Client for nlp-service intent classification
+
+    One instance should be shared per process: it keeps a pool of keep-alive
+    connections, merges concurrent classify() calls into /intent:batch
+    requests, retries transient failures with jittered backoff and caches
+    stateless results locally.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: float = 5.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        batch_window_ms: float = 5.0,
+        max_batch_size: int = 32,
+        max_retries: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 2.0,
+        cache_ttl: float = 60.0,
+        cache_max_items: int = 1000,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url or os.getenv(
+            "NLP_SERVICE_URL", "http://nlp-service:3006"
+        )
+        self.batch_window = max(0.0, batch_window_ms) / 1000
+        self.max_batch_size = max(1, min(max_batch_size, MAX_SERVER_BATCH_ITEMS))
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache_ttl = cache_ttl
+        self.cache_max_items = cache_max_items
+
+        self.http = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=30.0,
+            ),
+            transport=transport,
+        )
+
+        # Local LRU cache: key -> (expires_at, intent data)
+        self.cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+        # Calls waiting for the next batch, deduplicated by cache key
+        self._pending: "OrderedDict[str, Tuple[Dict[str, Any], asyncio.Future]]" = (
+            OrderedDict()
+        )
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+        # Statistics
+        self.stats = {
+            "requests": 0,
+            "batches": 0,
+            "batched_items": 0,
+            "coalesced": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "retries": 0,
+            "errors": 0,
+        }
+
+    async def __aenter__(self) -> "NLPServiceClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Send any pending batch and close the connection pool"""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.http.aclose()
+
+    async def classify(
+        self,
+        message: str,
+        session_id: Optional[str] = None,
+        history: Optional[List[Dict[str, Any]]] = None,
+        active_tool: Optional[str] = None,
+        artifacts: Optional[List[Dict[str, Any]]] = None,
+        deadline_ms: Optional[float] = None,
+        use_cache: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Classify a message into an intent
+
+        Args:
+            message: User message
+            session_id: Conversation id; nlp-service keeps the history itself
+            history: Previous turns, for callers that track history themselves
+            active_tool: Tool the user currently has open
+            artifacts: Artifacts referenced by the conversation
+            deadline_ms: Time budget; nlp-service skips optional stages to meet it
+            use_cache: Serve repeated stateless requests from the local cache
+
+        Returns:
+            Intent data (intent, confidence, entities, route, ...)
+
+        Raises:
+            NLPServiceError: message is empty, or nlp-service failed
+        """
+        # Rejected here rather than by nlp-service, where it would fail the
+        # whole batch this call is merged into
+        if not isinstance(message, str) or not message.strip():
+            raise NLPServiceError("message is required", status_code=400)
+
+        payload: Dict[str, Any] = {"message": message}
+        if session_id:
+            payload["sessionId"] = session_id
+        if history is not None:
+            payload["history"] = history
+        if active_tool:
+            payload["activeTool"] = active_tool
+        if artifacts:
+            payload["artifacts"] = artifacts
+
+        # The batch endpoint does not read or record sessions, and a session's
+        # answer depends on server-side state, so those calls go one by one
+        # and are never cached.
+        if session_id:
+            return await self._classify_one(
+                self._with_deadline(payload, deadline_ms), idempotent=False
+            )
+
+        key = self._make_key(payload)
+        if use_cache:
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+
+        result = await self._submit(key, self._with_deadline(payload, deadline_ms))
+        if use_cache and not result.get("metadata", {}).get("skippedStages"):
+            self._cache_set(key, result)
+        return result
+
+    async def classify_many(
+        self, items: List[Dict[str, Any]], deadline_ms: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Classify a list of stateless requests through the batch endpoint
+
+        Args:
+            items: IntentRequest payloads ({"message": ..., "activeTool": ...})
+            deadline_ms: Time budget applied to every item
+
+        Returns:
+            Intent data in the same order as items
+        """
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(items), MAX_SERVER_BATCH_ITEMS):
+            chunk = [
+                self._with_deadline(item, deadline_ms)
+                for item in items[start : start + MAX_SERVER_BATCH_ITEMS]
+            ]
+            results.extend(await self._classify_batch(chunk))
+        return results
+
+    # =========================================================================
+    # Batching
+    # =========================================================================
+
+    async def _submit(self, key: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a stateless call for the next batch"""
+        pending = self._pending.get(key)
+        if pending is not None and pending[0] == payload:
+            # Identical call already waiting; share its answer
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(pending[1])
+
+        future = asyncio.get_running_loop().create_future()
+        if pending is not None:
+            # Same message with a different deadline; keep both in the batch
+            key = f"{key}:{id(future)}"
+        self._pending[key] = (payload, future)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.batch_window, self._flush
+            )
+
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        """Send everything queued so far as one request"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = list(self._pending.values()), OrderedDict()
+        if not batch:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        try:
+            if len(batch) == 1:
+                results = [await self._classify_one(batch[0][0], idempotent=True)]
+            else:
+                results = await self._classify_batch([payload for payload, _ in batch])
+        except Exception as e:
+            if len(batch) > 1 and self._rejected_request(e):
+                # nlp-service rejects the whole batch for one invalid item;
+                # resend each call alone so only its own caller sees the error
+                logger.warning(
+                    f"nlp-service rejected a batch of {len(batch)} ({e}), "
+                    f"sending items individually"
+                )
+                await asyncio.gather(*(self._send([item]) for item in batch))
+                return
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _classify_one(
+        self, payload: Dict[str, Any], idempotent: bool
+    ) -> Dict[str, Any]:
+        response = await self._post(INTENT_PATH, payload, idempotent=idempotent)
+        return response["data"]
+
+    async def _classify_batch(
+        self, payloads: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        self.stats["batches"] += 1
+        self.stats["batched_items"] += len(payloads)
+        response = await self._post(BATCH_PATH, {"items": payloads}, idempotent=True)
+        return response["data"]
+
+    # =========================================================================
+    # HTTP & Retries
+    # =========================================================================
+
+    async def _post(
+        self, path: str, payload: Dict[str, Any], idempotent: bool
+    ) -> Dict[str, Any]:
+        """
+        POST with retries
+
+        Calls that record session turns are only retried when the request
+        never reached the classifier: connection failures and 503 load
+        shedding. Everything else is retried on timeouts and 429/502/504 too.
+        """
+        attempt = 0
+        while True:
+            self.stats["requests"] += 1
+            try:
+                response = await self.http.post(path, json=payload)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                error: Exception = e
+                retry_after = None
+            except httpx.TransportError as e:
+                if not idempotent:
+                    self.stats["errors"] += 1
+                    raise NLPServiceError(f"nlp-service request failed: {e}") from e
+                error = e
+                retry_after = None
+            else:
+                if response.status_code < 400:
+                    return response.json()
+                retryable = response.status_code == 503 or (
+                    idempotent and response.status_code in RETRYABLE_STATUS_CODES
+                )
+                error = NLPServiceError(
+                    f"nlp-service returned {response.status_code}: {response.text}",
+                    status_code=response.status_code,
+                )
+                if not retryable:
+                    self.stats["errors"] += 1
+                    raise error
+                retry_after = self._retry_after(response)
+
+            if attempt >= self.max_retries:
+                self.stats["errors"] += 1
+                if isinstance(error, NLPServiceError):
+                    raise error
+                raise NLPServiceError(f"nlp-service request failed: {error}") from error
+
+            delay = self._backoff(attempt, retry_after)
+            attempt += 1
+            self.stats["retries"] += 1
+            logger.warning(
+                f"nlp-service {path} failed ({error}), retry {attempt}/{self.max_retries} in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+    def _rejected_request(self, error: Exception) -> bool:
+        """Whether nlp-service refused the request itself (4xx other than 429)"""
+        status_code = getattr(error, "status_code", None)
+        return (
+            status_code is not None and 400 <= status_code < 500 and status_code != 429
+        )
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential backoff, never sooner than Retry-After"""
+        delay = random.uniform(
+            0, min(self.backoff_max, self.backoff_base * 2**attempt)
+        )
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _retry_after(self, response: httpx.Response) -> Optional[float]:
+        value = response.headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
+
+    # =========================================================================
+    # Local Cache
+    # =========================================================================
+
+    def _make_key(self, payload: Dict[str, Any]) -> str:
+        """Create cache key from the request payload"""
+        payload_str = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.md5(payload_str.encode()).hexdigest()
+
+    def _with_deadline(
+        self, payload: Dict[str, Any], deadline_ms: Optional[float]
+    ) -> Dict[str, Any]:
+        if deadline_ms is None:
+            return payload
+        metadata = dict(payload.get("metadata") or {})
+        metadata["deadlineMs"] = deadline_ms
+        return {**payload, "metadata": metadata}
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.cache.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self.cache[key]
+            self.stats["cache_misses"] += 1
+            return None
+
+        self.cache.move_to_end(key)
+        self.stats["cache_hits"] += 1
+        # Deep copies both ways, so callers can't edit nested entities or
+        # metadata of a cached entry
+        return copy.deepcopy(entry[1])
+
+    def _cache_set(self, key: str, value: Dict[str, Any]) -> None:
+        if self.cache_ttl <= 0 or self.cache_max_items <= 0:
+            return
+        self.cache[key] = (time.monotonic() + self.cache_ttl, copy.deepcopy(value))
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_max_items:
+            self.cache.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get client statistics"""
+        lookups = self.stats["cache_hits"] + self.stats["cache_misses"]
+        return {
+            **self.stats,
+            "cache_size": len(self.cache),
+            "cache_hit_rate": self.stats["cache_hits"] / lookups if lookups else 0.0,
+            "pending": len(self._pending),
+            "avg_batch_size": (
+                self.stats["batched_items"] / self.stats["batches"]
+                if self.stats["batches"]
+                else 0.0
+            ),
+        }
+
+
+_default_client: Optional[NLPServiceClient] = None
+
+
+def get_nlp_service_client() -> NLPServiceClient:
+    """Get the process-wide client, created on first use"""
+    global _default_client
+    if _default_client is None:
+        _default_client = NLPServiceClient()
+    return _default_client
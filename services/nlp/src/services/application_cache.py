@@ -4,14 +4,15 @@ Caches computed results and API responses
 """
 
 from typing import Any, Optional, Dict, Callable, Awaitable
+from collections import OrderedDict
 import json
 import logging
 import asyncio
 import hashlib
+import sys
 import time
 from datetime import datetime, timedelta
 from functools import wraps
-import weakref
 
 from .redis_cache import RedisCacheService
 
@@ -23,16 +24,21 @@ class ApplicationCache:
     Application-level cache with Redis and in-memory fallback
     """
 
-    def __init__(self, redis_service: Optional[RedisCacheService] = None):
+    def __init__(
+        self,
+        redis_service: Optional[RedisCacheService] = None,
+        max_memory_items: int = 100000,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+    ):
         self.redis = redis_service
-        self.memory_cache: Dict[str, Dict[str, Any]] = {}
-        self.max_memory_items = 1000
+        # Kept in LRU order (least recently used first), so hits and
+        # evictions are O(1) however many items the memory tier holds
+        self.memory_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.max_memory_items = max_memory_items
+        self.max_memory_bytes = max_memory_bytes
+        self.memory_bytes = 0
         self.default_ttl = 3600  # 1 hour
 
-        # LRU tracking
-        self.access_order = []
-        self.access_order_refs = weakref.WeakValueDictionary()
-
         # Statistics
         self.stats = {
             "redis_hits": 0,
@@ -40,6 +46,7 @@ class ApplicationCache:
             "misses": 0,
             "sets": 0,
             "evictions": 0,
+            "oversized": 0,
         }
 
     def _make_key(self, namespace: str, key: str) -> str:
@@ -82,12 +89,12 @@ class ApplicationCache:
 
             # Check if expired
             if entry["expires_at"] > time.time():
-                self._update_access_order(cache_key)
+                self.memory_cache.move_to_end(cache_key)
                 self.stats["memory_hits"] += 1
                 return entry["value"]
             else:
                 # Remove expired entry
-                del self.memory_cache[cache_key]
+                self._remove_from_memory_cache(cache_key)
 
         self.stats["misses"] += 1
         return None
@@ -139,9 +146,7 @@ class ApplicationCache:
             await self.redis.delete("app", cache_key, use_hash=True)
 
         # Delete from memory
-        if cache_key in self.memory_cache:
-            del self.memory_cache[cache_key]
-            self._remove_from_access_order(cache_key)
+        self._remove_from_memory_cache(cache_key)
 
         return True
 
@@ -166,65 +171,79 @@ class ApplicationCache:
             k for k in self.memory_cache.keys() if k.startswith(f"{namespace}:")
         ]
         for key in keys_to_delete:
-            del self.memory_cache[key]
-            self._remove_from_access_order(key)
+            self._remove_from_memory_cache(key)
 
         count += len(keys_to_delete)
         return count
 
     def _add_to_memory_cache(self, key: str, value: Any, expires_at: float):
-        """Add item to memory cache with LRU management"""
-        # Check if we need to evict items
-        if (
-            len(self.memory_cache) >= self.max_memory_items
-            and key not in self.memory_cache
-        ):
-            self._evict_lru()
+        """Add item to memory cache with LRU and byte budget management"""
+        size = self._estimate_size(value)
+        self._remove_from_memory_cache(key)
+
+        # A value larger than the whole budget would evict everything else
+        if size > self.max_memory_bytes:
+            self.stats["oversized"] += 1
+            logger.debug(f"Not caching {key} in memory: {size} bytes exceeds budget")
+            return
 
         self.memory_cache[key] = {
             "value": value,
             "expires_at": expires_at,
             "created_at": time.time(),
+            "size": size,
         }
+        self.memory_bytes += size
 
-        self._update_access_order(key)
+        # Evict least recently used items until both limits hold
+        while (
+            len(self.memory_cache) > self.max_memory_items
+            or self.memory_bytes > self.max_memory_bytes
+        ):
+            self._evict_lru()
 
     def _evict_lru(self):
         """Evict least recently used item"""
-        if not self.access_order:
-            # Remove random item if no access order
-            key = next(iter(self.memory_cache))
-            del self.memory_cache[key]
-            self.stats["evictions"] += 1
-            return
+        _, entry = self.memory_cache.popitem(last=False)
+        self.memory_bytes -= entry["size"]
+        self.stats["evictions"] += 1
+
+    def _remove_from_memory_cache(self, key: str):
+        """Remove item from memory cache and release its bytes"""
+        entry = self.memory_cache.pop(key, None)
+        if entry is not None:
+            self.memory_bytes -= entry["size"]
+
+    def _estimate_size(self, value: Any) -> int:
+        """
+        Approximate memory footprint of a value in bytes
 
-        # Remove from end (least recently used)
-        lru_key = self.access_order.pop(0)
-        if lru_key in self.memory_cache:
-            del self.memory_cache[lru_key]
-            self.stats["evictions"] += 1
-
-    def _update_access_order(self, key: str):
-        """Update access order for LRU"""
-        # Remove if already exists
-        self._remove_from_access_order(key)
-
-        # Add to end (most recently used)
-        self.access_order.append(key)
-
-        # Keep only last 1000 items
-        if len(self.access_order) > 1000:
-            old_key = self.access_order.pop(0)
-            if old_key in self.memory_cache:
-                # Keep it in cache but remove from order
-                pass
-
-    def _remove_from_access_order(self, key: str):
-        """Remove key from access order"""
-        try:
-            self.access_order.remove(key)
-        except ValueError:
-            pass
+        Walks containers and object attributes once, counting shared objects
+        a single time. Only used for the byte budget, so sizes are shallow
+        sys.getsizeof values rather than exact allocations.
+        """
+        seen = set()
+        pending = [value]
+        size = 0
+
+        while pending:
+            obj = pending.pop()
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            size += sys.getsizeof(obj)
+
+            if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+                continue
+            if isinstance(obj, dict):
+                pending.extend(obj.keys())
+                pending.extend(obj.values())
+            elif isinstance(obj, (list, tuple, set, frozenset)):
+                pending.extend(obj)
+            elif hasattr(obj, "__dict__"):
+                pending.append(vars(obj))
+
+        return size
 
     def cached(
         self,
@@ -316,7 +335,15 @@ class ApplicationCache:
 
         # Memory cache stats
         memory_items = len(self.memory_cache)
-        memory_usage_percent = (memory_items / self.max_memory_items) * 100
+        # A limit of 0 disables the memory tier rather than being a budget
+        memory_usage_percent = (
+            memory_items / self.max_memory_items * 100 if self.max_memory_items > 0 else 0
+        )
+        memory_bytes_percent = (
+            self.memory_bytes / self.max_memory_bytes * 100
+            if self.max_memory_bytes > 0
+            else 0
+        )
 
         # Expired items count
         now = time.time()
@@ -335,8 +362,12 @@ class ApplicationCache:
                 "items": memory_items,
                 "max_items": self.max_memory_items,
                 "usage_percent": round(memory_usage_percent, 2),
+                "bytes": self.memory_bytes,
+                "max_bytes": self.max_memory_bytes,
+                "bytes_usage_percent": round(memory_bytes_percent, 2),
                 "expired_items": expired_items,
                 "evictions": self.stats["evictions"],
+                "oversized": self.stats["oversized"],
             },
             "overall": {
                 "total_hits": total_hits,
@@ -378,8 +409,7 @@ class ApplicationCache:
         ]
 
         for key in expired_keys:
-            del self.memory_cache[key]
-            self._remove_from_access_order(key)
+            self._remove_from_memory_cache(key)
 
         return len(expired_keys)
 
@@ -396,8 +426,8 @@ def get_cache() -> ApplicationCache:
     return app_cache
 
 
-def init_cache(redis_service: Optional[RedisCacheService] = None):
-    """Initialize global cache"""
+def init_cache(redis_service: Optional[RedisCacheService] = None, **limits: int):
+    """Initialize global cache (limits: max_memory_items, max_memory_bytes)"""
     global app_cache
-    app_cache = ApplicationCache(redis_service)
+    app_cache = ApplicationCache(redis_service, **limits)
     logger.info("Application cache initialized")
@@ -0,0 +1,106 @@
+import asyncio
+
+from src.services.application_cache import ApplicationCache
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def _memory_keys(cache: ApplicationCache, namespace: str, keys):
+    return [cache._make_key(namespace, key) for key in keys]
+
+
+def test_get_and_set_keep_lru_order():
+    cache = ApplicationCache(max_memory_items=3)
+
+    async def main():
+        for key in ("a", "b", "c"):
+            await cache.set("ns", key, key)
+        await cache.get("ns", "a")
+        await cache.set("ns", "b", "b2")
+        await cache.set("ns", "d", "d")
+
+    _run(main())
+    assert list(cache.memory_cache) == _memory_keys(cache, "ns", ["a", "b", "d"])
+    assert cache.stats["evictions"] == 1
+
+
+def test_eviction_by_item_count_releases_bytes():
+    cache = ApplicationCache(max_memory_items=2)
+
+    async def main():
+        for key in ("a", "b", "c"):
+            await cache.set("ns", key, "x" * 100)
+        return await cache.get("ns", "a")
+
+    assert _run(main()) is None
+    assert len(cache.memory_cache) == 2
+    assert cache.memory_bytes == sum(entry["size"] for entry in cache.memory_cache.values())
+
+
+def test_eviction_by_bytes():
+    value = "x" * 1000
+    size = ApplicationCache()._estimate_size(value)
+    cache = ApplicationCache(max_memory_bytes=size * 2 + size // 2)
+
+    async def main():
+        for key in ("a", "b", "c"):
+            await cache.set("ns", key, value)
+
+    _run(main())
+    assert list(cache.memory_cache) == _memory_keys(cache, "ns", ["b", "c"])
+    assert cache.memory_bytes == size * 2
+    assert cache.stats["evictions"] == 1
+
+
+def test_oversized_values_are_not_cached_in_memory():
+    cache = ApplicationCache(max_memory_bytes=500)
+
+    async def main():
+        await cache.set("ns", "small", "x")
+        await cache.set("ns", "big", "x" * 1000)
+        return await cache.get("ns", "big"), await cache.get("ns", "small")
+
+    assert _run(main()) == (None, "x")
+    assert cache.stats["oversized"] == 1
+    assert cache.stats["evictions"] == 0
+
+
+def test_replacing_a_key_with_an_oversized_value_drops_the_old_one():
+    cache = ApplicationCache(max_memory_bytes=500)
+
+    async def main():
+        await cache.set("ns", "key", "x")
+        await cache.set("ns", "key", "x" * 1000)
+        return await cache.get("ns", "key")
+
+    assert _run(main()) is None
+    assert cache.memory_bytes == 0
+
+
+def test_clear_namespace_releases_its_bytes():
+    cache = ApplicationCache()
+
+    async def main():
+        await cache.set("one", "a", "x" * 100)
+        await cache.set("one", "b", "x" * 100)
+        await cache.set("two", "a", "y")
+        return await cache.clear_namespace("one")
+
+    assert _run(main()) == 2
+    assert list(cache.memory_cache) == _memory_keys(cache, "two", ["a"])
+    assert cache.memory_bytes == cache._estimate_size("y")
+
+
+def test_stats_with_zero_limits():
+    cache = ApplicationCache(max_memory_items=0, max_memory_bytes=0)
+
+    async def main():
+        await cache.set("ns", "a", "x")
+        return await cache.get_stats()
+
+    memory = _run(main())["memory"]
+    assert memory["items"] == 0
+    assert memory["usage_percent"] == 0
+    assert memory["bytes_usage_percent"] == 0
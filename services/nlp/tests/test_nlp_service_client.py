@@ -0,0 +1,156 @@
+import asyncio
+import json
+
+import httpx
+
+from src.clients.nlp_service_client import (
+    BATCH_PATH,
+    INTENT_PATH,
+    NLPServiceClient,
+    NLPServiceError,
+)
+
+
+def _server(requests):
+    """Mock nlp-service that, like the real one, rejects a whole batch for one bad item"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append((request.url.path, body))
+        items = body["items"] if request.url.path == BATCH_PATH else [body]
+        for index, item in enumerate(items):
+            if not item["message"].strip():
+                return httpx.Response(
+                    400, json={"detail": f"items[{index}].message is required"}
+                )
+            if any("id" not in artifact for artifact in item.get("artifacts", [])):
+                return httpx.Response(
+                    422, json={"detail": f"items[{index}].artifacts[0].id missing"}
+                )
+        data = [
+            {
+                "intent": "graphics",
+                "message": item["message"],
+                "entities": {"tools": []},
+            }
+            for item in items
+        ]
+        return httpx.Response(
+            200,
+            json={
+                "success": True,
+                "data": data if request.url.path == BATCH_PATH else data[0],
+            },
+        )
+
+    return httpx.MockTransport(handler)
+
+
+def _client(requests, **kwargs) -> NLPServiceClient:
+    return NLPServiceClient(
+        base_url="http://nlp-service", transport=_server(requests), **kwargs
+    )
+
+
+def test_concurrent_calls_are_merged_into_one_batch():
+    requests = []
+
+    async def main():
+        async with _client(requests) as client:
+            return await asyncio.gather(
+                client.classify("draw a logo"), client.classify("build a website")
+            )
+
+    results = asyncio.run(main())
+    assert [result["message"] for result in results] == [
+        "draw a logo",
+        "build a website",
+    ]
+    assert [path for path, _ in requests] == [BATCH_PATH]
+
+
+def test_blank_message_is_rejected_before_it_reaches_a_batch():
+    requests = []
+
+    async def main():
+        async with _client(requests) as client:
+            return await asyncio.gather(
+                client.classify("draw a logo"),
+                client.classify("build a website"),
+                client.classify("   "),
+                return_exceptions=True,
+            )
+
+    first, second, blank = asyncio.run(main())
+    assert first["message"] == "draw a logo"
+    assert second["message"] == "build a website"
+    assert isinstance(blank, NLPServiceError) and blank.status_code == 400
+    assert [path for path, _ in requests] == [BATCH_PATH]
+    assert len(requests[0][1]["items"]) == 2
+
+
+def test_rejected_batch_is_retried_item_by_item():
+    requests = []
+
+    async def main():
+        async with _client(requests) as client:
+            return await asyncio.gather(
+                client.classify("draw a logo"),
+                client.classify("edit this", artifacts=[{"name": "logo.svg"}]),
+                client.classify("build a website"),
+                return_exceptions=True,
+            )
+
+    results = asyncio.run(main())
+    assert results[0]["message"] == "draw a logo"
+    assert isinstance(results[1], NLPServiceError) and results[1].status_code == 422
+    assert results[2]["message"] == "build a website"
+    assert [path for path, _ in requests] == [
+        BATCH_PATH,
+        INTENT_PATH,
+        INTENT_PATH,
+        INTENT_PATH,
+    ]
+
+
+def test_server_errors_are_not_split_into_single_requests():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        return httpx.Response(500, text="boom")
+
+    async def main():
+        client = NLPServiceClient(
+            base_url="http://nlp-service",
+            transport=httpx.MockTransport(handler),
+            max_retries=0,
+        )
+        async with client:
+            return await asyncio.gather(
+                client.classify("draw a logo"),
+                client.classify("build a website"),
+                return_exceptions=True,
+            )
+
+    results = asyncio.run(main())
+    assert all(
+        isinstance(result, NLPServiceError) and result.status_code == 500
+        for result in results
+    )
+    assert requests == [BATCH_PATH]
+
+
+def test_mutating_a_result_does_not_change_the_cache():
+    requests = []
+
+    async def main():
+        async with _client(requests) as client:
+            first = await client.classify("draw a logo")
+            first["entities"]["tools"].append("brush")
+            second = await client.classify("draw a logo")
+            second["entities"]["tools"].append("pen")
+            return await client.classify("draw a logo")
+
+    assert asyncio.run(main())["entities"] == {"tools": []}
+    assert len(requests) == 1